@@ -0,0 +1,25 @@
+"""Build mypyc extensions for hot pure-Python modules (``make compile``).
+
+Run from the repository root:
+
+    python scripts/build_mypyc.py build_ext --inplace
+
+The extensions are written next to their sources (e.g.
+src/utils/validators.cpython-311-*.so) and take precedence over the .py
+files on import. ``make clean`` removes them.
+"""
+from mypyc.build import mypycify
+from setuptools import setup
+
+# Modules compiled to C extensions, relative to the repository root
+COMPILED_MODULES = [
+    "src/utils/validators.py",
+]
+
+setup(
+    name="cashflow-story-pipeline-mypyc",
+    packages=[],
+    # Imported modules are type-checked for compilation but their own
+    # (non-compiled) strict-mode findings are not build errors
+    ext_modules=mypycify(["--follow-imports=silent", *COMPILED_MODULES]),
+)
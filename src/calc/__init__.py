@@ -4,10 +4,12 @@ from src.calc.balance_sheet import estimate_balance_sheet
 from src.calc.brazilian_tax import calculate_brazilian_tax
 from src.calc.cash_flow import calculate_cash_flow
 from src.calc.cash_quality import classify_cash_quality
+from src.calc.chain import calculate_period
 from src.calc.income_statement import calculate_income_statement
 from src.calc.marginal_cashflow import calculate_marginal_cash_flow
 from src.calc.power_of_one import calculate_power_of_one
 from src.calc.ratios import calculate_ratios
+from src.calc.vectorized import MappedDataSoA, calculate_income_statement_batch
 from src.calc.working_capital import calculate_working_capital
 
 __all__ = [
@@ -20,4 +22,7 @@ __all__ = [
     "classify_cash_quality",
     "calculate_marginal_cash_flow",
     "calculate_brazilian_tax",
+    "calculate_period",
+    "MappedDataSoA",
+    "calculate_income_statement_batch",
 ]
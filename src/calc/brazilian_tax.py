@@ -2,6 +2,14 @@
 
 from decimal import Decimal
 
+from src.models.financial_data import ZERO
+
+IRPJ_BASE_RATE = Decimal("0.15")
+IRPJ_SURTAX_RATE = Decimal("0.10")
+MONTHLY_THRESHOLD = Decimal("20000")
+CSLL_RATE = Decimal("0.09")
+_ONE_MONTH = Decimal("1")
+
 
 def calculate_brazilian_tax(
     ebt: Decimal,
@@ -33,12 +41,6 @@ def calculate_brazilian_tax(
     Returns:
         Tuple[Decimal, Decimal]: (irpj_tax, csll_tax)
     """
-    ZERO = Decimal("0")
-    IRPJ_BASE_RATE = Decimal("0.15")
-    IRPJ_SURTAX_RATE = Decimal("0.10")
-    MONTHLY_THRESHOLD = Decimal("20000")
-    CSLL_RATE = Decimal("0.09")
-
     if not isinstance(ebt, Decimal):
         ebt = Decimal(str(ebt))
 
@@ -46,7 +48,7 @@ def calculate_brazilian_tax(
     if ebt <= ZERO:
         return ZERO, ZERO
 
-    months = Decimal(str(period_months)) if period_months >= 1 else Decimal("1")
+    months = Decimal(str(period_months)) if period_months >= 1 else _ONE_MONTH
     monthly_profit = ebt / months
 
     # IRPJ base (15% on full EBT)
@@ -1,8 +1,7 @@
 """Cash flow statement calculations."""
 
-from decimal import Decimal
-
 from src.models import PeriodResult
+from src.models.financial_data import ZERO
 
 
 def calculate_cash_flow(period_result: PeriodResult) -> PeriodResult:
@@ -36,8 +35,6 @@ def calculate_cash_flow(period_result: PeriodResult) -> PeriodResult:
     Returns:
         PeriodResult: Updated copy with cash flow metrics populated
     """
-    ZERO = Decimal("0")
-
     # 1. Operating Cash Flow (indirect method)
     # OCF = Net Income + D&A - Working Capital Investment
     ocf = (
@@ -4,6 +4,44 @@ from decimal import Decimal
 from typing import Literal
 
 from src.models import CashQualityMetric, PeriodResult
+from src.models.financial_data import ZERO
+
+_HUNDRED = Decimal("100")
+
+# (good, average) grade thresholds per metric
+_THRESHOLDS: dict[str, tuple[Decimal, Decimal]] = {
+    "ocf_margin": (Decimal("25"), Decimal("10")),
+    "free_cash_flow": (ZERO, Decimal("-5")),
+    "wc_revenue": (Decimal("10"), Decimal("20")),
+    "ccc_days": (Decimal("30"), Decimal("60")),
+    "net_debt_ebitda": (Decimal("2"), Decimal("4")),
+    "interest_coverage": (Decimal("5"), Decimal("3")),
+}
+
+
+def _safe_div(numerator: Decimal, denominator: Decimal) -> Decimal:
+    """Return numerator / denominator, or ZERO when denominator is zero."""
+    if denominator == ZERO:
+        return ZERO
+    return numerator / denominator
+
+
+def _grade_higher(value: Decimal, good: Decimal, avg: Decimal) -> Literal["G", "A", "B"]:
+    """Higher is better: G if >= good, A if >= avg, else B."""
+    if value >= good:
+        return "G"
+    if value >= avg:
+        return "A"
+    return "B"
+
+
+def _grade_lower(value: Decimal, good: Decimal, avg: Decimal) -> Literal["G", "A", "B"]:
+    """Lower is better: G if <= good, A if <= avg, else B."""
+    if value <= good:
+        return "G"
+    if value <= avg:
+        return "A"
+    return "B"
 
 
 def classify_cash_quality(period_result: PeriodResult) -> list[CashQualityMetric]:
@@ -48,103 +86,86 @@ def classify_cash_quality(period_result: PeriodResult) -> list[CashQualityMetric
     Returns:
         List[CashQualityMetric]: All 6 metrics with grades and thresholds
     """
-    ZERO = Decimal("0")
     pr = period_result
 
-    def _safe_div(numerator: Decimal, denominator: Decimal) -> Decimal:
-        """Return numerator / denominator, or ZERO when denominator is zero."""
-        if denominator == ZERO:
-            return ZERO
-        return numerator / denominator
-
-    def _grade_higher(value: Decimal, good: Decimal, avg: Decimal) -> Literal["G", "A", "B"]:
-        """Higher is better: G if >= good, A if >= avg, else B."""
-        if value >= good:
-            return "G"
-        if value >= avg:
-            return "A"
-        return "B"
-
-    def _grade_lower(value: Decimal, good: Decimal, avg: Decimal) -> Literal["G", "A", "B"]:
-        """Lower is better: G if <= good, A if <= avg, else B."""
-        if value <= good:
-            return "G"
-        if value <= avg:
-            return "A"
-        return "B"
-
     metrics: list[CashQualityMetric] = []
 
     # 1. OCF MARGIN: operating_cash_flow / net_revenue * 100
-    ocf_margin = _safe_div(pr.operating_cash_flow, pr.net_revenue) * Decimal("100")
+    ocf_margin = _safe_div(pr.operating_cash_flow, pr.net_revenue) * _HUNDRED
+    good, avg = _THRESHOLDS["ocf_margin"]
     metrics.append(CashQualityMetric(
         metric="ocf_margin",
         label_pt="Margem Fluxo de Caixa Operacional %",
         value=ocf_margin,
-        threshold_good=Decimal("25"),
-        threshold_average=Decimal("10"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="higher",
-        grade=_grade_higher(ocf_margin, Decimal("25"), Decimal("10")),
+        grade=_grade_higher(ocf_margin, good, avg),
     ))
 
     # 2. FREE CASH FLOW %: free_cash_flow / net_revenue * 100
-    fcf_pct = _safe_div(pr.free_cash_flow, pr.net_revenue) * Decimal("100")
+    fcf_pct = _safe_div(pr.free_cash_flow, pr.net_revenue) * _HUNDRED
+    good, avg = _THRESHOLDS["free_cash_flow"]
     metrics.append(CashQualityMetric(
         metric="free_cash_flow",
         label_pt="Fluxo de Caixa Livre %",
         value=fcf_pct,
-        threshold_good=ZERO,
-        threshold_average=Decimal("-5"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="higher",
-        grade=_grade_higher(fcf_pct, ZERO, Decimal("-5")),
+        grade=_grade_higher(fcf_pct, good, avg),
     ))
 
     # 3. WC / REVENUE %: working_capital / net_revenue * 100
-    wc_pct = _safe_div(pr.working_capital, pr.net_revenue) * Decimal("100")
+    wc_pct = _safe_div(pr.working_capital, pr.net_revenue) * _HUNDRED
+    good, avg = _THRESHOLDS["wc_revenue"]
     metrics.append(CashQualityMetric(
         metric="wc_revenue",
         label_pt="Capital de Giro / Receita %",
         value=wc_pct,
-        threshold_good=Decimal("10"),
-        threshold_average=Decimal("20"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="lower",
-        grade=_grade_lower(wc_pct, Decimal("10"), Decimal("20")),
+        grade=_grade_lower(wc_pct, good, avg),
     ))
 
     # 4. CCC DAYS: cash_conversion_cycle
     ccc = pr.cash_conversion_cycle
+    good, avg = _THRESHOLDS["ccc_days"]
     metrics.append(CashQualityMetric(
         metric="ccc_days",
         label_pt="Ciclo de Conversão de Caixa (dias)",
         value=ccc,
-        threshold_good=Decimal("30"),
-        threshold_average=Decimal("60"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="lower",
-        grade=_grade_lower(ccc, Decimal("30"), Decimal("60")),
+        grade=_grade_lower(ccc, good, avg),
     ))
 
     # 5. NET DEBT / EBITDA
     nd_ebitda = _safe_div(pr.net_debt, pr.ebitda)
+    good, avg = _THRESHOLDS["net_debt_ebitda"]
     metrics.append(CashQualityMetric(
         metric="net_debt_ebitda",
         label_pt="Dívida Líquida / EBITDA",
         value=nd_ebitda,
-        threshold_good=Decimal("2"),
-        threshold_average=Decimal("4"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="lower",
-        grade=_grade_lower(nd_ebitda, Decimal("2"), Decimal("4")),
+        grade=_grade_lower(nd_ebitda, good, avg),
     ))
 
     # 6. INTEREST COVERAGE: EBIT / financial_expenses
     int_cov = _safe_div(pr.ebit, pr.financial_expenses)
+    good, avg = _THRESHOLDS["interest_coverage"]
     metrics.append(CashQualityMetric(
         metric="interest_coverage",
         label_pt="Cobertura de Juros",
         value=int_cov,
-        threshold_good=Decimal("5"),
-        threshold_average=Decimal("3"),
+        threshold_good=good,
+        threshold_average=avg,
         direction="higher",
-        grade=_grade_higher(int_cov, Decimal("5"), Decimal("3")),
+        grade=_grade_higher(int_cov, good, avg),
     ))
 
     return metrics
@@ -0,0 +1,45 @@
+"""Full per-period calculation chain (Chapters 1-4)."""
+
+from src.calc.balance_sheet import estimate_balance_sheet
+from src.calc.cash_flow import calculate_cash_flow
+from src.calc.income_statement import calculate_income_statement
+from src.calc.ratios import calculate_ratios
+from src.calc.working_capital import calculate_working_capital
+from src.models import MappedData, PeriodResult
+
+# Working-capital fields merged into the income statement result
+_WC_FIELDS = (
+    "days_sales_outstanding",
+    "days_inventory_outstanding",
+    "days_payable_outstanding",
+    "cash_conversion_cycle",
+    "working_capital",
+    "working_capital_investment",
+)
+
+
+def calculate_period(mapped: MappedData) -> PeriodResult:
+    """
+    Run the full calculation chain on a single MappedData.
+
+    The income statement result is merged with the working-capital fields,
+    then fed through the balance sheet, cash flow and ratio calculators.
+    Only the first two stages build a validated PeriodResult; the merge and
+    later stages use ``model_copy`` on already-validated data.
+
+    Args:
+        mapped: Mapped financial data for one period.
+
+    Returns:
+        PeriodResult: Fully-calculated period result.
+    """
+    is_result = calculate_income_statement(mapped)
+    wc_result = calculate_working_capital(mapped, days_in_period=mapped.days_in_period)
+
+    merged = is_result.model_copy(
+        update={name: getattr(wc_result, name) for name in _WC_FIELDS}
+    )
+
+    bs_result = estimate_balance_sheet(merged)
+    cf_result = calculate_cash_flow(bs_result)
+    return calculate_ratios(cf_result)
@@ -1,9 +1,10 @@
 """Income statement calculations (Chapter 1: Profitability)."""
 
-from decimal import Decimal
-
 from src.calc.brazilian_tax import calculate_brazilian_tax
 from src.models import MappedData, PeriodResult
+from src.models.financial_data import ZERO
+
+PERIOD_MONTHS = {"month": 1, "quarter": 3, "year": 12}
 
 
 def calculate_income_statement(mapped: MappedData) -> PeriodResult:
@@ -35,9 +36,6 @@ def calculate_income_statement(mapped: MappedData) -> PeriodResult:
     Returns:
         PeriodResult: Complete income statement with all metrics and margins
     """
-    ZERO = Decimal("0")
-    PERIOD_MONTHS = {"month": 1, "quarter": 3, "year": 12}
-
     # DRE Waterfall
     net_revenue = mapped.gross_revenue - mapped.returns_deductions
     if net_revenue < ZERO:
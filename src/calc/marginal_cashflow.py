@@ -3,6 +3,7 @@
 from decimal import Decimal
 
 from src.models import PeriodResult
+from src.models.financial_data import ZERO
 
 
 def calculate_marginal_cash_flow(period_result: PeriodResult) -> dict[str, Decimal]:
@@ -40,7 +41,6 @@ def calculate_marginal_cash_flow(period_result: PeriodResult) -> dict[str, Decim
     TODO: Project cash impact per 1% growth
     TODO: Return dictionary with all metrics
     """
-    ZERO = Decimal("0")
     pr = period_result
 
     def safe_div(num: Decimal, den: Decimal) -> Decimal:
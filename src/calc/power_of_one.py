@@ -3,6 +3,14 @@
 from decimal import Decimal
 
 from src.models import PeriodResult, PowerOfOneLever
+from src.models.financial_data import ZERO
+
+ONE_PCT = Decimal("0.01")
+VALUATION_MULTIPLE = Decimal("6.0")
+DAYS_IN_YEAR = Decimal("365")
+DEPRECIATION_FACTOR = Decimal("0.10")
+_HUNDRED = Decimal("100")
+_ONE_DAY = Decimal("1")
 
 
 def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]:
@@ -20,12 +28,6 @@ def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]
     Returns:
         List of 7 PowerOfOneLever objects sorted by abs(cash_impact) descending.
     """
-    ZERO = Decimal("0")
-    ONE_PCT = Decimal("0.01")
-    VALUATION_MULTIPLE = Decimal("6.0")
-    DAYS_IN_YEAR = Decimal("365")
-    DEPRECIATION_FACTOR = Decimal("0.10")
-
     pr = period_result
     levers: list[PowerOfOneLever] = []
 
@@ -34,7 +36,7 @@ def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]
     # 1. REVENUE: 1% increase
     revenue_change = pr.net_revenue * ONE_PCT
     ebit_margin = (
-        pr.ebit_margin_pct / Decimal("100")
+        pr.ebit_margin_pct / _HUNDRED
         if pr.ebit_margin_pct != ZERO
         else ZERO
     )
@@ -99,7 +101,7 @@ def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]
             lever="ar_days",
             label_pt="Prazo de Recebimento",
             current_value=pr.days_sales_outstanding,
-            change_amount=Decimal("1"),
+            change_amount=_ONE_DAY,
             change_unit="dias",
             profit_impact=ZERO,
             cash_impact=ar_cash_freed,
@@ -115,7 +117,7 @@ def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]
             lever="inventory_days",
             label_pt="Prazo de Estoque",
             current_value=pr.days_inventory_outstanding,
-            change_amount=Decimal("1"),
+            change_amount=_ONE_DAY,
             change_unit="dias",
             profit_impact=ZERO,
             cash_impact=inv_cash_freed,
@@ -131,7 +133,7 @@ def calculate_power_of_one(period_result: PeriodResult) -> list[PowerOfOneLever]
             lever="ap_days",
             label_pt="Prazo de Pagamento",
             current_value=pr.days_payable_outstanding,
-            change_amount=Decimal("1"),
+            change_amount=_ONE_DAY,
             change_unit="dias",
             profit_impact=ZERO,
             cash_impact=ap_cash_freed,
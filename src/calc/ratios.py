@@ -3,6 +3,7 @@
 from decimal import Decimal
 
 from src.models import PeriodResult
+from src.models.financial_data import ZERO
 
 
 def calculate_ratios(period_result: PeriodResult) -> PeriodResult:
@@ -26,8 +27,6 @@ def calculate_ratios(period_result: PeriodResult) -> PeriodResult:
     Returns:
         A new PeriodResult with the six ratio fields updated.
     """
-    ZERO = Decimal("0")
-
     def safe_div(numerator: Decimal, denominator: Decimal) -> Decimal:
         """Return numerator / denominator, or ZERO when denominator is zero."""
         if denominator == ZERO:
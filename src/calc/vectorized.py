@@ -0,0 +1,128 @@
+"""Vectorized income statement across many periods (struct-of-arrays)."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, fields
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import numpy as np
+
+from src.calc.income_statement import PERIOD_MONTHS
+from src.models import MappedData
+
+# Amounts are int64 counts of 1/10_000 BRL. Inputs are whole cents, and every
+# tax rate below has two decimal places, so each waterfall line (including
+# IRPJ/CSLL) is exact at this scale.
+_SCALE_DIGITS = 4
+_SCALE = 10 ** _SCALE_DIGITS
+
+# Tax rates in percent (see calc.brazilian_tax)
+_IRPJ_BASE_PCT = 15
+_IRPJ_SURTAX_PCT = 10
+_CSLL_PCT = 9
+_MONTHLY_THRESHOLD = 20_000 * _SCALE
+
+# (margin field, numerator field), each as a percentage of net revenue
+_MARGINS = (
+    ("gross_margin_pct", "gross_profit"),
+    ("ebitda_margin_pct", "ebitda"),
+    ("ebit_margin_pct", "ebit"),
+    ("net_margin_pct", "net_income"),
+)
+
+
+def _to_units(value: Decimal) -> int:
+    """Convert a monetary Decimal to integer units, rounded to the cent."""
+    return int(value.quantize(Decimal("0.01"), ROUND_HALF_EVEN).scaleb(_SCALE_DIGITS))
+
+
+def units_to_decimal(units: int) -> Decimal:
+    """Convert integer units back to a Decimal in BRL."""
+    return Decimal(int(units)).scaleb(-_SCALE_DIGITS)
+
+
+@dataclass(frozen=True)
+class MappedDataSoA:
+    """
+    Income statement inputs for many periods, one int64 array per field.
+
+    Row ``i`` of every array belongs to the same period. Build it with
+    ``MappedDataSoA.from_mapped``.
+    """
+
+    gross_revenue: np.ndarray
+    returns_deductions: np.ndarray
+    cogs: np.ndarray
+    operating_expenses: np.ndarray
+    depreciation_amortization: np.ndarray
+    financial_expenses: np.ndarray
+    financial_income: np.ndarray
+    other_income_expenses: np.ndarray
+    period_months: np.ndarray
+
+    @classmethod
+    def from_mapped(cls, mapped: Iterable[MappedData]) -> "MappedDataSoA":
+        """Stack ``MappedData`` periods into columns, reading each field once."""
+        periods = list(mapped)
+        columns = {}
+        for f in fields(cls):
+            if f.name == "period_months":
+                values = [PERIOD_MONTHS.get(m.period_type, 1) for m in periods]
+            else:
+                values = [_to_units(getattr(m, f.name)) for m in periods]
+            columns[f.name] = np.array(values, dtype=np.int64)
+        return cls(**columns)
+
+    def __len__(self) -> int:
+        return len(self.gross_revenue)
+
+
+def calculate_income_statement_batch(mapped_array: MappedDataSoA) -> dict[str, np.ndarray]:
+    """
+    Calculate the income statement waterfall for all periods at once.
+
+    Same formulas as ``calculate_income_statement``, applied column-wise.
+    Amount results are int64 arrays in 1/10_000 BRL (convert with
+    ``units_to_decimal``); margins are float64 percentages, 0 where net
+    revenue is zero.
+
+    Args:
+        mapped_array: Periods stacked by ``MappedDataSoA.from_mapped``
+
+    Returns:
+        Dict[str, np.ndarray]: net_revenue, gross_profit, ebitda, ebit, ebt,
+        irpj_tax, csll_tax, net_income and the four *_margin_pct arrays
+    """
+    m = mapped_array
+
+    net_revenue = m.gross_revenue - m.returns_deductions
+    gross_profit = net_revenue - m.cogs
+    ebitda = gross_profit - m.operating_expenses
+    ebit = ebitda - m.depreciation_amortization
+    ebt = ebit - m.financial_expenses + m.financial_income + m.other_income_expenses
+
+    # IRPJ/CSLL on positive EBT; surtax on the part above R$20,000/month
+    months = np.maximum(m.period_months, 1)
+    taxable = np.maximum(ebt, 0)
+    surtax_base = np.maximum(taxable - _MONTHLY_THRESHOLD * months, 0)
+    irpj_tax = (taxable * _IRPJ_BASE_PCT + surtax_base * _IRPJ_SURTAX_PCT) // 100
+    csll_tax = taxable * _CSLL_PCT // 100
+
+    net_income = ebt - irpj_tax - csll_tax
+
+    result = {
+        "net_revenue": net_revenue,
+        "gross_profit": gross_profit,
+        "ebitda": ebitda,
+        "ebit": ebit,
+        "ebt": ebt,
+        "irpj_tax": irpj_tax,
+        "csll_tax": csll_tax,
+        "net_income": net_income,
+    }
+
+    has_revenue = net_revenue != 0
+    denominator = np.where(has_revenue, net_revenue, 1).astype(np.float64)
+    for margin_key, name in _MARGINS:
+        result[margin_key] = np.where(has_revenue, result[name] / denominator * 100, 0.0)
+
+    return result
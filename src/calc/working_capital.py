@@ -3,6 +3,7 @@
 from decimal import Decimal
 
 from src.models import MappedData, PeriodResult
+from src.models.financial_data import ZERO
 
 
 def calculate_working_capital(
@@ -50,7 +51,6 @@ def calculate_working_capital(
     Raises:
         ValueError: If COGS or Revenue is zero (division by zero)
     """
-    ZERO = Decimal("0")
     days = Decimal(str(days_in_period))
 
     # Safe division helper
@@ -1,15 +1,27 @@
 """Account mapping from ERP codes to financial categories."""
 
-from decimal import Decimal
+import contextlib
+import copy
+import functools
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict, defaultdict
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
 
 import yaml
 
 from src.models import AccountEntry, MappedData
+from src.models.financial_data import ZERO
+
+# libyaml-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # Maps YAML config keys → MappedData field names
-_CATEGORY_FIELD_MAP: dict[str, str] = {
+_CATEGORY_FIELD_MAP: Final[dict[str, str]] = {
     "revenue": "gross_revenue",
     "deductions": "returns_deductions",
     "cogs": "cogs",
@@ -26,6 +38,130 @@ _CATEGORY_FIELD_MAP: dict[str, str] = {
     "cash": "cash",
 }
 
+# map_accounts results kept per mapper (most recently used last)
+_MAP_CACHE_SIZE = 32
+
+# Trie node key holding the (config order, category) pairs ending at that node
+_TRIE_CATEGORIES = "__cat__"
+
+
+# Unbounded context so coefficient extraction never rounds
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def _decimal_units(value: Decimal) -> tuple[int, int]:
+    """
+    Split a finite Decimal into ``(units, scale)`` with value = units * 10**-scale.
+
+    ``scale`` is the number of fractional digits (0 for integral values), so
+    sums of units rebuild exactly the Decimal that Decimal addition would
+    produce, exponent included. AccountEntry rejects NaN and Infinity, so
+    the exponent is always an int.
+    """
+    exponent: int = value.as_tuple().exponent  # type: ignore[assignment]
+    if exponent >= 0:
+        return int(value), 0
+    return int(value.scaleb(-exponent, _EXACT_CONTEXT)), -exponent
+
+
+def _dotted_prefixes(code: str) -> list[str]:
+    """All dotted ancestors of ``code`` plus the code itself, shortest first."""
+    prefixes = []
+    end = code.find(".")
+    while end != -1:
+        prefixes.append(code[:end])
+        end = code.find(".", end + 1)
+    prefixes.append(code)
+    return prefixes
+
+
+# Parsed-config sidecars live in a user cache directory, never next to the
+# YAML: $CASHFLOW_CACHE_DIR, else $XDG_CACHE_HOME/cashflow-story, else
+# ~/.cache/cashflow-story
+_CACHE_DIR_ENV = "CASHFLOW_CACHE_DIR"
+_CACHE_DIR_NAME = "cashflow-story"
+
+
+def _config_cache_path(path: str) -> Path:
+    """Sidecar location for the YAML at ``path`` (an absolute path)."""
+    override = os.environ.get(_CACHE_DIR_ENV)
+    if override:
+        cache_dir = Path(override)
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg) if xdg else Path.home() / ".cache"
+        cache_dir = base / _CACHE_DIR_NAME
+    digest = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{Path(path).name}.{digest}.json"
+
+
+def _read_config_cache(cache_path: Path, source_sha256: str) -> dict[str, Any] | None:
+    """Return the cached config if it was built from YAML with this content hash."""
+    try:
+        with open(cache_path, encoding="utf-8") as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("source_sha256") != source_sha256:
+        return None
+    config = cached.get("config")
+    return config if isinstance(config, dict) else None
+
+
+def _write_config_cache(cache_path: Path, source_sha256: str, config: dict[str, Any]) -> None:
+    """
+    Best-effort write of the JSON sidecar.
+
+    Skipped when the config does not survive a JSON round trip unchanged
+    (dates, non-string keys) or the cache directory is not writable. The
+    temporary file is removed if the write or rename fails.
+    """
+    try:
+        payload = json.dumps({"source_sha256": source_sha256, "config": config})
+        if json.loads(payload)["config"] != config:
+            return
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+    except (OSError, TypeError, ValueError):
+        return
+
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int) -> dict[str, Any]:
+    """
+    Parse a YAML config once per (path, mtime).
+
+    The mtime is part of the key so an edited file is re-read. Across
+    processes, a JSON sidecar in the user cache directory (see
+    ``_config_cache_path``) replaces the YAML parse on later runs. The
+    sidecar is stamped with a SHA-256 of the YAML bytes rather than the
+    mtime, so a file replaced with its timestamp preserved (``cp -p``,
+    ``rsync -t``, tar extraction) is never served a stale config. JSON
+    rather than pickle keeps loading free of code execution, like the safe
+    YAML loader. The cached dict is shared: callers must copy it before
+    mutating.
+    """
+    with open(path, "rb") as fh:
+        source = fh.read()
+    source_sha256 = hashlib.sha256(source).hexdigest()
+
+    cache_path = _config_cache_path(path)
+    cached = _read_config_cache(cache_path, source_sha256)
+    if cached is not None:
+        return cached
+
+    config: dict[str, Any] = yaml.load(source, Loader=_YAML_LOADER)
+    _write_config_cache(cache_path, source_sha256, config)
+    return config
+
 
 class AccountMapper:
     """Maps ERP account codes to financial categories (Chapter 1-4)."""
@@ -35,10 +171,22 @@ class AccountMapper:
         self.raw_config: dict[str, Any] = {}
         self.categories: dict[str, dict[str, Any]] = {}
         self.reclassifications: list[dict[str, str]] = []
-        self.exclusions: set = set()
+        self.exclusions: frozenset[str] = frozenset()
+        # Lookup tables derived from the config: reclassification source code
+        # -> target code, and category -> codes it excludes
+        self._reclass_map: dict[str, str] = {}
+        self._category_excludes: dict[str, frozenset[str]] = {}
+        # (MappedData field, category) for every configured mapped category
+        self._field_bindings: tuple[tuple[str, str], ...] = ()
         # Flat mapping: account_prefix -> category_key (e.g. "3.1" -> "revenue")
         self.mapping: dict[str, str] = {}
+        # Segment trie over category prefixes: "1.1.03" -> {"1": {"1": {"03": ...}}}
+        self._trie: dict[str, Any] = {}
         self.company_name: str = ""
+        # (entries, period) -> MappedData, bounded LRU; cleared on reload
+        self._map_cache: OrderedDict[tuple[tuple[AccountEntry, ...], str], MappedData] = (
+            OrderedDict()
+        )
         self.load_config()
 
     # ------------------------------------------------------------------
@@ -50,17 +198,23 @@ class AccountMapper:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config not found: {self.config_path}")
 
-        with open(self.config_path, encoding="utf-8") as fh:
-            self.raw_config = yaml.safe_load(fh)
+        mtime_ns = self.config_path.stat().st_mtime_ns
+        self.raw_config = copy.deepcopy(
+            _load_config_cached(str(self.config_path.resolve()), mtime_ns)
+        )
 
         self.company_name = self.raw_config.get("company", {}).get("name", "")
 
+        exclusions: set[str] = set()
         acct_map = self.raw_config.get("account_mapping", {})
         for category_key, cfg in acct_map.items():
             if not isinstance(cfg, dict):
                 continue
-            prefixes = cfg.get("accounts", [])
-            excludes = cfg.get("exclude", [])
+            # Codes and category names are a small closed set looked up for
+            # every entry; interning lets dict probes match by identity.
+            category_key = sys.intern(category_key)
+            prefixes = [sys.intern(p) for p in cfg.get("accounts", [])]
+            excludes = [sys.intern(ex) for ex in cfg.get("exclude", [])]
             reclasses = cfg.get("reclassifications", [])
 
             self.categories[category_key] = {
@@ -73,15 +227,77 @@ class AccountMapper:
                 self.mapping[prefix] = category_key
 
             # Populate exclusions set
-            for ex in excludes:
-                self.exclusions.add(ex)
+            exclusions.update(excludes)
+            self._category_excludes[category_key] = frozenset(excludes)
 
             for rc in reclasses:
-                self.reclassifications.append(
-                    {"from": rc["from"], "to": rc["to"]}
-                )
+                source, target = sys.intern(rc["from"]), sys.intern(rc["to"])
+                self.reclassifications.append({"from": source, "to": target})
+                self._reclass_map.setdefault(source, target)
                 # Reclassified sources also map to the target category
-                self.mapping[rc["from"]] = rc["to"]
+                self.mapping[source] = target
+
+        self.exclusions = frozenset(exclusions)
+        self._field_bindings = tuple(
+            (field_name, cat_key)
+            for cat_key, field_name in _CATEGORY_FIELD_MAP.items()
+            if cat_key in self.categories
+        )
+        self._build_trie()
+        self._map_cache.clear()
+
+    def _build_trie(self) -> None:
+        """Index every category prefix by its dotted segments."""
+        self._trie = {}
+        for order, (category_key, cfg) in enumerate(self.categories.items()):
+            for prefix in cfg["prefixes"]:
+                node = self._trie
+                for segment in prefix.split("."):
+                    node = node.setdefault(sys.intern(segment), {})
+                node.setdefault(_TRIE_CATEGORIES, []).append((order, category_key))
+
+    def _categories_for(self, code: str) -> list[str]:
+        """
+        Categories with a prefix matching ``code``, in config order.
+
+        A prefix matches when it equals the code or is a dotted ancestor of
+        it ("1.1.03" matches "1.1.03.01", not "1.1.030"). Walks one trie node
+        per code segment instead of testing every configured prefix.
+        """
+        node = self._trie
+        found: list[tuple[int, str]] = []
+        for segment in code.split("."):
+            child: dict[str, Any] | None = node.get(segment)
+            if child is None:
+                break
+            node = child
+            found.extend(node.get(_TRIE_CATEGORIES, ()))
+        found.sort()
+        return [category_key for _, category_key in found]
+
+    def _resolve_category(self, code: str) -> str | None:
+        """
+        Category an account code aggregates into, or None if unmapped.
+
+        Step 1 applies reclassifications: the most specific source code
+        matching the entry (itself or a dotted ancestor) sets the effective
+        code. Step 2 picks the first category (config order) whose prefix
+        matches the effective code and which does not exclude the original.
+        """
+        prefixes = _dotted_prefixes(code)
+
+        effective = code
+        for prefix in reversed(prefixes):
+            if prefix in self._reclass_map:
+                effective = self._reclass_map[prefix]
+                break
+
+        for cat_key in self._categories_for(effective):
+            excludes = self._category_excludes[cat_key]
+            if excludes and any(prefix in excludes for prefix in prefixes):
+                continue
+            return cat_key
+        return None
 
     # ------------------------------------------------------------------
     # Account mapping
@@ -92,63 +308,87 @@ class AccountMapper:
         accounts: list[AccountEntry],
         period: str,
     ) -> MappedData:
-        """Map raw AccountEntry list into aggregated MappedData."""
+        """
+        Map raw AccountEntry list into aggregated MappedData.
+
+        Results are memoized per (entries, period): AccountEntry is frozen, so
+        an equal entry sequence always maps to the same totals. Each caller
+        gets its own MappedData whose ``metadata`` dict is a fresh copy, so
+        editing it never leaks into the cache or into other callers.
+        """
         if not self.categories:
             self.load_config()
 
-        # Step 1: apply reclassifications — change the effective code
-        effective: dict[str, str] = {}
-        for entry in accounts:
-            new_code = entry.code
-            for rc in self.reclassifications:
-                if entry.code == rc["from"] or entry.code.startswith(rc["from"] + "."):
-                    new_code = rc["to"]
-                    break
-            effective[entry.code] = new_code
+        key = (tuple(accounts), period)
+        cached = self._map_cache.get(key)
+        if cached is None:
+            cached = self._map_accounts(accounts, period)
+            self._map_cache[key] = cached
+            if len(self._map_cache) > _MAP_CACHE_SIZE:
+                self._map_cache.popitem(last=False)
+        else:
+            self._map_cache.move_to_end(key)
+
+        # Decimal fields are immutable and shared; metadata is the one
+        # mutable field on the frozen model
+        return cached.model_copy(update={"metadata": copy.deepcopy(cached.metadata)})
+
+    def _map_accounts(
+        self,
+        accounts: list[AccountEntry],
+        period: str,
+    ) -> MappedData:
+        """Uncached mapping of AccountEntry list into MappedData."""
+
+        # Steps 1-2: resolve each distinct code to its category once
+        resolved = {
+            code: self._resolve_category(code)
+            for code in dict.fromkeys(entry.code for entry in accounts)
+        }
 
-        # Step 2: aggregate by category
-        totals: dict[str, Decimal] = {k: Decimal("0") for k in self.categories}
+        # Category sums are kept as integer units at the widest scale seen so
+        # far and converted back to Decimal once, after the loop. Only
+        # categories that receive entries get slots; the rest read as 0.
+        units: defaultdict[str, int] = defaultdict(int)
+        scales: defaultdict[str, int] = defaultdict(int)
 
         for entry in accounts:
-            ecode = effective[entry.code]
-            matched = False
-            for cat_key, cat_cfg in self.categories.items():
-                excludes = cat_cfg["excludes"]
-                if any(entry.code == ex or entry.code.startswith(ex + ".") for ex in excludes):
-                    continue
-                for prefix in cat_cfg["prefixes"]:
-                    if ecode == prefix or ecode.startswith(prefix + "."):
-                        totals[cat_key] += entry.closing_balance
-                        matched = True
-                        break
-                if matched:
-                    break
-
-        # Step 3: build MappedData kwargs
+            cat_key = resolved[entry.code]
+            if cat_key is None:
+                continue
+            value, scale = _decimal_units(entry.closing_balance)
+            current = scales[cat_key]
+            if scale > current:
+                units[cat_key] *= 10 ** (scale - current)
+                scales[cat_key] = scale
+            elif scale < current:
+                value *= 10 ** (current - scale)
+            units[cat_key] += value
+
+        # Step 3: build MappedData kwargs, converting sums back to Decimal
         kwargs: dict[str, Any] = {
             "company": self.company_name,
             "period": period,
         }
-        for cat_key, field_name in _CATEGORY_FIELD_MAP.items():
-            if cat_key in totals:
-                kwargs[field_name] = totals[cat_key]
+        for field_name, cat_key in self._field_bindings:
+            kwargs[field_name] = Decimal(units[cat_key]).scaleb(-scales[cat_key])
 
         # Derived values
-        gross_rev = kwargs.get("gross_revenue", Decimal("0"))
-        deductions = kwargs.get("returns_deductions", Decimal("0"))
+        gross_rev = kwargs.get("gross_revenue", ZERO)
+        deductions = kwargs.get("returns_deductions", ZERO)
         net_rev = gross_rev + deductions
         kwargs["net_revenue"] = net_rev
 
-        cogs = kwargs.get("cogs", Decimal("0"))
+        cogs = kwargs.get("cogs", ZERO)
         kwargs["gross_profit"] = net_rev + cogs
 
-        opex = kwargs.get("operating_expenses", Decimal("0"))
+        opex = kwargs.get("operating_expenses", ZERO)
         kwargs["ebitda"] = kwargs["gross_profit"] + opex
 
-        kwargs["ebit"] = kwargs["ebitda"] + kwargs.get("depreciation_amortization", Decimal("0"))
+        kwargs["ebit"] = kwargs["ebitda"] + kwargs.get("depreciation_amortization", ZERO)
 
-        fin_income = kwargs.get("financial_income", Decimal("0"))
-        fin_expense = kwargs.get("financial_expenses", Decimal("0"))
+        fin_income = kwargs.get("financial_income", ZERO)
+        fin_expense = kwargs.get("financial_expenses", ZERO)
         kwargs["ebt"] = kwargs["ebit"] + fin_income + fin_expense
 
         return MappedData(**kwargs)
@@ -159,21 +399,40 @@ class AccountMapper:
 
     def validate_mapping(self, mapped: MappedData) -> tuple[bool, list[str]]:
         """Validate mapped data against business rules."""
+        is_valid, messages, _ = self.validate_mapping_strict(mapped)
+        return is_valid, messages
+
+    def validate_mapping_strict(
+        self, mapped: MappedData
+    ) -> tuple[bool, list[str], set[str]]:
+        """
+        Validate mapped data, also returning the set of violation codes.
+
+        Each code is the MappedData field that failed its rule
+        ("gross_revenue", "cogs", "accounts_receivable",
+        "shareholders_equity"), so callers can test ``code in codes``
+        instead of scanning message text.
+        """
         messages: list[str] = []
+        codes: set[str] = set()
         is_valid = True
 
-        if mapped.gross_revenue <= Decimal("0"):
+        if mapped.gross_revenue <= ZERO:
             messages.append("WARN: gross_revenue <= 0")
+            codes.add("gross_revenue")
             is_valid = False
 
-        if mapped.gross_revenue != Decimal("0") and abs(mapped.cogs) > abs(mapped.gross_revenue):
+        if mapped.gross_revenue != ZERO and abs(mapped.cogs) > abs(mapped.gross_revenue):
             messages.append("WARN: |COGS| exceeds |gross_revenue|")
+            codes.add("cogs")
 
-        if mapped.accounts_receivable < Decimal("0"):
+        if mapped.accounts_receivable < ZERO:
             messages.append("WARN: accounts_receivable < 0")
+            codes.add("accounts_receivable")
 
-        if mapped.shareholders_equity == Decimal("0"):
+        if mapped.shareholders_equity == ZERO:
             messages.append("WARN: shareholders_equity is zero")
+            codes.add("shareholders_equity")
             is_valid = False
 
-        return is_valid, messages
+        return is_valid, messages, codes
@@ -4,7 +4,7 @@ from decimal import Decimal
 from pathlib import Path
 
 try:
-    from openpyxl import load_workbook  # type: ignore[import-untyped]
+    from openpyxl import load_workbook
 except ImportError:  # pragma: no cover
     load_workbook = None  # handled at runtime
 
@@ -1,13 +1,53 @@
 """Parser for ERP XML files (balancete and fluxo de caixa formats)."""
 
+import os
 import re
-import xml.etree.ElementTree as ET
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 from pathlib import Path
+from typing import BinaryIO, cast
 
-import defusedxml.ElementTree as SafeET
+from lxml import etree
 
 from src.models import AccountEntry
+from src.models.financial_data import ZERO
+
+# encoding="..." in the XML declaration
+_ENCODING_RE = re.compile(rb"encoding=[\"']([^\"']+)[\"']")
+
+# Hardening shared by every parse: entities are not resolved and no DTD is
+# loaded, so external entity references (XXE) cannot read local files or URLs.
+_PARSER_OPTIONS = {
+    "resolve_entities": False,
+    "load_dtd": False,
+    "no_network": True,
+    "huge_tree": False,
+    "remove_blank_text": True,
+    # Balancetes carry no xml:id attributes; skip building the ID table
+    "collect_ids": False,
+}
+
+
+def _safe_parse(path: Path) -> etree._ElementTree:
+    """Parse a whole XML file with libxml2, rejecting XXE and network access."""
+    return etree.parse(str(path), etree.XMLParser(**_PARSER_OPTIONS))
+
+
+def _safe_iterparse(
+    source: Path | BinaryIO,
+    *,
+    events: tuple[str, ...],
+    tag: str | tuple[str, ...] | None = None,
+) -> etree.iterparse:
+    """
+    Stream an XML file with the same hardening as ``_safe_parse``.
+
+    ``source`` may be a path or an open binary file; an open file is left
+    for the caller to close, which matters when iteration stops early.
+    """
+    target = str(source) if isinstance(source, Path) else source
+    return etree.iterparse(target, events=events, tag=tag, **_PARSER_OPTIONS)
 
 
 class ERPXMLParser:
@@ -25,6 +65,9 @@ class ERPXMLParser:
     """
 
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+    # Below this combined size, pool start-up and pickling the entries back
+    # cost more than parsing the files in-process
+    PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # 8 MB
 
     def __init__(self, file_path: str) -> None:
         self.file_path = Path(file_path)
@@ -35,6 +78,34 @@ class ERPXMLParser:
             raise ValueError(f"XML file too large ({file_size} bytes, max {self.MAX_FILE_SIZE})")
         self.encoding: str = "UTF-8"
         self.format: str | None = None
+        # (file mtime_ns, entries) from the last parse_balancete call
+        self._balancete_cache: tuple[int, list[AccountEntry]] | None = None
+
+    @classmethod
+    def parse_many(
+        cls, paths: Iterable[str | Path], max_workers: int | None = None
+    ) -> dict[str, list[AccountEntry]]:
+        """Parse several balancete files, in worker processes when worthwhile.
+
+        Every path is checked up front (existence and size limit). Batches
+        smaller than PARALLEL_MIN_BYTES, or with a single worker available,
+        are parsed sequentially in this process.
+
+        Args:
+            paths: Balancete XML files
+            max_workers: Process count (default: CPU count)
+
+        Returns:
+            Dict[str, List[AccountEntry]]: Entries per path, in input order
+        """
+        parsers = {str(p): cls(str(p)) for p in paths}
+        workers = min(max_workers or os.cpu_count() or 1, len(parsers))
+        total_bytes = sum(parser.file_path.stat().st_size for parser in parsers.values())
+        if workers < 2 or total_bytes < cls.PARALLEL_MIN_BYTES:
+            return {path: parser.parse_balancete() for path, parser in parsers.items()}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(parsers, pool.map(_parse_balancete_file, parsers), strict=True))
 
     # ------------------------------------------------------------------
     # Encoding / format detection
@@ -44,7 +115,7 @@ class ERPXMLParser:
         """Read first 200 bytes and extract encoding from XML declaration."""
         with open(self.file_path, "rb") as fh:
             raw = fh.read(200)
-        match = re.search(rb"encoding=[\"']([^\"']+)[\"']", raw)
+        match = _ENCODING_RE.search(raw)
         if match:
             self.encoding = match.group(1).decode("ascii")
         else:
@@ -54,9 +125,11 @@ class ERPXMLParser:
     def detect_format(self) -> str:
         """Auto-detect XML format by inspecting the root element tag."""
         self.detect_encoding()
-        tree = SafeET.parse(str(self.file_path))
-        root = tree.getroot()
-        tag = root.tag.lower()
+        # Only the root tag is needed: stop at its start event. The file is
+        # opened here so it is closed even though iteration stops early.
+        with open(self.file_path, "rb") as fh:
+            _, root = next(iter(_safe_iterparse(fh, events=("start",))))
+            tag = root.tag.lower()
         if "balancete" in tag:
             self.format = "balancete"
         elif "fluxo" in tag:
@@ -76,12 +149,11 @@ class ERPXMLParser:
         Handles '1.234,56' → Decimal('1234.56') and plain '1234.56'.
         """
         if not text:
-            return Decimal("0")
+            return ZERO
         text = text.strip()
-        if "," in text and "." in text:
+        if "," in text:
+            # Comma is the decimal separator; any dots are thousands separators
             text = text.replace(".", "").replace(",", ".")
-        elif "," in text:
-            text = text.replace(",", ".")
         return Decimal(text)
 
     # ------------------------------------------------------------------
@@ -93,32 +165,72 @@ class ERPXMLParser:
 
         Returns both top-level <conta> entries and nested <subconta> entries
         so downstream mappers can apply reclassifications by sub-account code.
-        """
-        self.detect_encoding()
-        tree = SafeET.parse(str(self.file_path))
-        root = tree.getroot()
-
-        period = self._extract_period(root)
-
-        entries: list[AccountEntry] = []
-        contas = root.find("contas")
-        if contas is None:
-            return entries
 
-        for conta in contas.findall("conta"):
-            subcats = conta.find("subcategorias")
+        Repeat calls return a copy of the cached entries unless the file's
+        mtime has changed since the last parse.
+        """
+        mtime_ns = self.file_path.stat().st_mtime_ns
+        if self._balancete_cache is None or self._balancete_cache[0] != mtime_ns:
+            self._balancete_cache = (mtime_ns, self._read_balancete())
+        # Entries are frozen; only the list itself needs copying
+        return list(self._balancete_cache[1])
+
+    def _read_balancete(self) -> list[AccountEntry]:
+        """Stream the balancete XML into AccountEntry objects.
+
+        Each top-level <conta> is read into a small field dict and then
+        cleared, so memory does not grow with a full DOM. The encoding is
+        taken from libxml2's reading of the XML declaration, which matches
+        detect_encoding() without a second read of the file.
+        """
+        period = ""
+        contas: etree._Element | None = None
+        # (is_subconta, child tag -> text) in document order
+        rows: list[tuple[bool, dict[str, str]]] = []
+
+        events = _safe_iterparse(self.file_path, events=("end",), tag=("periodo", "conta"))
+        for _, elem in events:
+            parent = elem.getparent()
+            grandparent = parent.getparent() if parent is not None else None
+            if grandparent is None or grandparent.getparent() is not None:
+                continue  # only <balancete>/<empresa|contas>/<periodo|conta>
+
+            if elem.tag == "periodo":
+                if parent.tag == "empresa" and not period and elem.text:
+                    period = elem.text.strip()
+                continue
+
+            if parent.tag != "contas":
+                continue
+            if contas is None:
+                contas = parent
+            elif parent is not contas:
+                continue  # only the first <contas> section, as root.find() did
+
+            subcats = elem.find("subcategorias")
             if subcats is not None:
                 # Parent is a roll-up — emit children only to avoid double-counting
-                for sub in subcats.findall("subconta"):
-                    sub_entry = self._subconta_to_entry(sub, period)
-                    if sub_entry is not None:
-                        entries.append(sub_entry)
+                rows.extend(
+                    (True, self._child_texts(sub)) for sub in subcats.iterchildren("subconta")
+                )
             else:
-                entry = self._conta_to_entry(conta, period)
-                if entry is not None:
-                    entries.append(entry)
+                rows.append((False, self._child_texts(elem)))
 
-        return entries
+            elem.clear(keep_tail=False)
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        self.encoding = cast(str, events.root.getroottree().docinfo.encoding)
+
+        # <empresa> may follow <contas>, so entries are built once the period is known
+        return [
+            (
+                self._subconta_to_entry(fields, period)
+                if is_sub
+                else self._conta_to_entry(fields, period)
+            )
+            for is_sub, fields in rows
+        ]
 
     # ------------------------------------------------------------------
     # Fluxo de caixa parser
@@ -126,8 +238,8 @@ class ERPXMLParser:
 
     def parse_fluxo_caixa(self) -> list[AccountEntry]:
         """Parse fluxo de caixa XML (<atividade> elements)."""
-        self.detect_encoding()
-        tree = SafeET.parse(str(self.file_path))
+        tree = _safe_parse(self.file_path)
+        self.encoding = cast(str, tree.docinfo.encoding)
         root = tree.getroot()
 
         period = self._extract_period(root)
@@ -143,9 +255,9 @@ class ERPXMLParser:
                 AccountEntry(
                     code=codigo,
                     description=descricao,
-                    opening_balance=Decimal("0"),
-                    total_debits=Decimal("0"),
-                    total_credits=Decimal("0"),
+                    opening_balance=ZERO,
+                    total_debits=ZERO,
+                    total_credits=ZERO,
                     closing_balance=valor,
                     period=periodo_text,
                 )
@@ -158,50 +270,64 @@ class ERPXMLParser:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _extract_period(root: ET.Element) -> str:
+    def _extract_period(root: etree._Element) -> str:
         empresa = root.find("empresa")
         if empresa is not None:
             el = empresa.find("periodo")
             if el is not None and el.text:
-                return el.text.strip()
+                return cast(str, el.text).strip()
         return ""
 
-    def _conta_to_entry(self, conta: ET.Element, period: str) -> AccountEntry | None:
-        codigo = (conta.findtext("codigo") or "").strip()
-        descricao = (conta.findtext("descricao") or "").strip()
-
-        opening = self._parse_decimal(conta.findtext("saldo_inicial"))
-        closing_final = conta.findtext("saldo_final")
-        closing_saldo = conta.findtext("saldo")
+    @staticmethod
+    def _child_texts(element: etree._Element) -> dict[str, str]:
+        """Map each child tag to its text in one pass (first occurrence wins, like findtext)."""
+        return {
+            child.tag: child.text or ""
+            for child in reversed(element)
+            if isinstance(child.tag, str)
+        }
+
+    def _conta_to_entry(self, fields: dict[str, str], period: str) -> AccountEntry:
+        codigo = fields.get("codigo", "").strip()
+        descricao = fields.get("descricao", "").strip()
+
+        opening = self._parse_decimal(fields.get("saldo_inicial"))
+        closing_final = fields.get("saldo_final")
+        closing_saldo = fields.get("saldo")
 
         if closing_final is not None:
             closing = self._parse_decimal(closing_final)
         elif closing_saldo is not None:
             closing = self._parse_decimal(closing_saldo)
         else:
-            closing = Decimal("0")
+            closing = ZERO
 
         return AccountEntry(
             code=codigo,
             description=descricao,
             opening_balance=opening,
-            total_debits=Decimal("0"),
-            total_credits=Decimal("0"),
+            total_debits=ZERO,
+            total_credits=ZERO,
             closing_balance=closing,
             period=period,
         )
 
-    def _subconta_to_entry(self, sub: ET.Element, period: str) -> AccountEntry | None:
-        codigo = (sub.findtext("codigo") or "").strip()
-        descricao = (sub.findtext("descricao") or "").strip()
-        saldo = self._parse_decimal(sub.findtext("saldo"))
+    def _subconta_to_entry(self, fields: dict[str, str], period: str) -> AccountEntry:
+        codigo = fields.get("codigo", "").strip()
+        descricao = fields.get("descricao", "").strip()
+        saldo = self._parse_decimal(fields.get("saldo"))
 
         return AccountEntry(
             code=codigo,
             description=descricao,
-            opening_balance=Decimal("0"),
-            total_debits=Decimal("0"),
-            total_credits=Decimal("0"),
+            opening_balance=ZERO,
+            total_debits=ZERO,
+            total_credits=ZERO,
             closing_balance=saldo,
             period=period,
         )
+
+
+def _parse_balancete_file(path: str) -> list[AccountEntry]:
+    """Process-pool worker for ERPXMLParser.parse_many."""
+    return ERPXMLParser(path).parse_balancete()
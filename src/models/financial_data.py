@@ -1,11 +1,16 @@
 """Financial data models using Pydantic v2 with Decimal fields for precision."""
 
+import sys
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+# Shared zero for monetary defaults; Decimal is immutable, so one instance
+# serves every field and caller.
+ZERO = Decimal("0")
+
 
 class AccountEntry(BaseModel):
     """
@@ -20,14 +25,23 @@ class AccountEntry(BaseModel):
         closing_balance: Saldo final
         period: Period identifier (e.g., "202401", "Jan/25")
     """
+    # Immutable and hashable, so entry lists can key the mapper's result cache
+    model_config = ConfigDict(frozen=True)
+
     code: str = Field(..., description="Account code from ERP")
     description: str = Field(..., description="Account description")
-    opening_balance: Decimal = Field(default=Decimal("0"), description="Opening balance")
-    total_debits: Decimal = Field(default=Decimal("0"), description="Total debits")
-    total_credits: Decimal = Field(default=Decimal("0"), description="Total credits")
-    closing_balance: Decimal = Field(default=Decimal("0"), description="Closing balance")
+    opening_balance: Decimal = Field(default=ZERO, description="Opening balance")
+    total_debits: Decimal = Field(default=ZERO, description="Total debits")
+    total_credits: Decimal = Field(default=ZERO, description="Total credits")
+    closing_balance: Decimal = Field(default=ZERO, description="Closing balance")
     period: str = Field(..., description="Period identifier")
 
+    @field_validator("code")
+    @classmethod
+    def intern_code(cls, v: str) -> str:
+        """Intern account codes: the same few codes repeat across entries."""
+        return sys.intern(v)
+
 
 class MappedData(BaseModel):
     """
@@ -76,43 +90,48 @@ class MappedData(BaseModel):
         # Additional metadata
         metadata: Optional dictionary with source info, flags, etc.
     """
+    # Fields cannot be reassigned once AccountMapper builds the model. The
+    # metadata dict itself stays mutable, so the model is not hashable and
+    # AccountMapper hands each caller its own metadata copy.
+    model_config = ConfigDict(frozen=True)
+
     company: str = Field(..., description="Company CNPJ or identifier")
     period: str = Field(..., description="Period identifier (e.g., '202401')")
     period_type: str = Field(default="month", description="Period type: 'month', 'quarter', or 'year'")
     days_in_period: int = Field(default=30, description="Number of days in period")
 
     # Chapter 1: Profitability
-    gross_revenue: Decimal = Field(default=Decimal("0"), description="Receita bruta")
-    returns_deductions: Decimal = Field(default=Decimal("0"), description="Devoluções e deduções")
-    net_revenue: Decimal = Field(default=Decimal("0"), description="Receita líquida")
-    cogs: Decimal = Field(default=Decimal("0"), description="COGS - Custo de mercadoria vendida")
-    gross_profit: Decimal = Field(default=Decimal("0"), description="Lucro bruto")
-    operating_expenses: Decimal = Field(default=Decimal("0"), description="Despesas operacionais")
-    ebitda: Decimal = Field(default=Decimal("0"), description="EBITDA")
-    depreciation_amortization: Decimal = Field(default=Decimal("0"), description="D&A")
-    ebit: Decimal = Field(default=Decimal("0"), description="EBIT - Lucro operacional")
-    financial_expenses: Decimal = Field(default=Decimal("0"), description="Despesas financeiras")
-    financial_income: Decimal = Field(default=Decimal("0"), description="Receita financeira")
-    other_income_expenses: Decimal = Field(default=Decimal("0"), description="Outras receitas/despesas")
-    ebt: Decimal = Field(default=Decimal("0"), description="EBT - Lucro antes de impostos")
+    gross_revenue: Decimal = Field(default=ZERO, description="Receita bruta")
+    returns_deductions: Decimal = Field(default=ZERO, description="Devoluções e deduções")
+    net_revenue: Decimal = Field(default=ZERO, description="Receita líquida")
+    cogs: Decimal = Field(default=ZERO, description="COGS - Custo de mercadoria vendida")
+    gross_profit: Decimal = Field(default=ZERO, description="Lucro bruto")
+    operating_expenses: Decimal = Field(default=ZERO, description="Despesas operacionais")
+    ebitda: Decimal = Field(default=ZERO, description="EBITDA")
+    depreciation_amortization: Decimal = Field(default=ZERO, description="D&A")
+    ebit: Decimal = Field(default=ZERO, description="EBIT - Lucro operacional")
+    financial_expenses: Decimal = Field(default=ZERO, description="Despesas financeiras")
+    financial_income: Decimal = Field(default=ZERO, description="Receita financeira")
+    other_income_expenses: Decimal = Field(default=ZERO, description="Outras receitas/despesas")
+    ebt: Decimal = Field(default=ZERO, description="EBT - Lucro antes de impostos")
 
     # Chapter 2: Working Capital Components
-    accounts_receivable: Decimal = Field(default=Decimal("0"), description="Contas a receber")
-    inventory: Decimal = Field(default=Decimal("0"), description="Estoques")
-    accounts_payable: Decimal = Field(default=Decimal("0"), description="Contas a pagar")
+    accounts_receivable: Decimal = Field(default=ZERO, description="Contas a receber")
+    inventory: Decimal = Field(default=ZERO, description="Estoques")
+    accounts_payable: Decimal = Field(default=ZERO, description="Contas a pagar")
 
     # Chapter 3: Other Capital (OC)
-    ppe_gross: Decimal = Field(default=Decimal("0"), description="Imobilizado bruto")
-    accumulated_depreciation: Decimal = Field(default=Decimal("0"), description="Depreciação acumulada")
-    intangibles: Decimal = Field(default=Decimal("0"), description="Intangível")
-    other_assets: Decimal = Field(default=Decimal("0"), description="Outros ativos")
-    other_liabilities: Decimal = Field(default=Decimal("0"), description="Outros passivos")
+    ppe_gross: Decimal = Field(default=ZERO, description="Imobilizado bruto")
+    accumulated_depreciation: Decimal = Field(default=ZERO, description="Depreciação acumulada")
+    intangibles: Decimal = Field(default=ZERO, description="Intangível")
+    other_assets: Decimal = Field(default=ZERO, description="Outros ativos")
+    other_liabilities: Decimal = Field(default=ZERO, description="Outros passivos")
 
     # Chapter 4: Funding
-    cash: Decimal = Field(default=Decimal("0"), description="Caixa e equivalentes")
-    short_term_debt: Decimal = Field(default=Decimal("0"), description="Dívida de curto prazo")
-    long_term_debt: Decimal = Field(default=Decimal("0"), description="Dívida de longo prazo")
-    shareholders_equity: Decimal = Field(default=Decimal("0"), description="Patrimônio líquido")
+    cash: Decimal = Field(default=ZERO, description="Caixa e equivalentes")
+    short_term_debt: Decimal = Field(default=ZERO, description="Dívida de curto prazo")
+    long_term_debt: Decimal = Field(default=ZERO, description="Dívida de longo prazo")
+    shareholders_equity: Decimal = Field(default=ZERO, description="Patrimônio líquido")
 
     # Metadata
     metadata: dict[str, Any] | None = Field(default_factory=dict, description="Additional metadata")
@@ -121,7 +140,7 @@ class MappedData(BaseModel):
     @classmethod
     def non_negative_balance(cls, v: Decimal, info) -> Decimal:
         """Validate that balance sheet items are non-negative."""
-        if v < Decimal("0"):
+        if v < ZERO:
             import warnings
             warnings.warn(
                 f"{info.field_name} is negative ({v}). This may indicate a data quality issue.",
@@ -167,63 +186,63 @@ class PeriodResult(BaseModel):
     period: str = Field(..., description="Period identifier")
 
     # Chapter 1: Income Statement
-    gross_revenue: Decimal = Field(default=Decimal("0"))
-    returns_deductions: Decimal = Field(default=Decimal("0"))
-    net_revenue: Decimal = Field(default=Decimal("0"))
-    cogs: Decimal = Field(default=Decimal("0"))
-    gross_profit: Decimal = Field(default=Decimal("0"))
-    gross_margin_pct: Decimal = Field(default=Decimal("0"))
-    operating_expenses: Decimal = Field(default=Decimal("0"))
-    ebitda: Decimal = Field(default=Decimal("0"))
-    ebitda_margin_pct: Decimal = Field(default=Decimal("0"))
-    depreciation_amortization: Decimal = Field(default=Decimal("0"))
-    ebit: Decimal = Field(default=Decimal("0"))
-    ebit_margin_pct: Decimal = Field(default=Decimal("0"))
-    financial_expenses: Decimal = Field(default=Decimal("0"))
-    financial_income: Decimal = Field(default=Decimal("0"))
-    other_income_expenses: Decimal = Field(default=Decimal("0"))
-    ebt: Decimal = Field(default=Decimal("0"))
-    irpj_tax: Decimal = Field(default=Decimal("0"))
-    csll_tax: Decimal = Field(default=Decimal("0"))
-    net_income: Decimal = Field(default=Decimal("0"))
-    net_margin_pct: Decimal = Field(default=Decimal("0"))
+    gross_revenue: Decimal = Field(default=ZERO)
+    returns_deductions: Decimal = Field(default=ZERO)
+    net_revenue: Decimal = Field(default=ZERO)
+    cogs: Decimal = Field(default=ZERO)
+    gross_profit: Decimal = Field(default=ZERO)
+    gross_margin_pct: Decimal = Field(default=ZERO)
+    operating_expenses: Decimal = Field(default=ZERO)
+    ebitda: Decimal = Field(default=ZERO)
+    ebitda_margin_pct: Decimal = Field(default=ZERO)
+    depreciation_amortization: Decimal = Field(default=ZERO)
+    ebit: Decimal = Field(default=ZERO)
+    ebit_margin_pct: Decimal = Field(default=ZERO)
+    financial_expenses: Decimal = Field(default=ZERO)
+    financial_income: Decimal = Field(default=ZERO)
+    other_income_expenses: Decimal = Field(default=ZERO)
+    ebt: Decimal = Field(default=ZERO)
+    irpj_tax: Decimal = Field(default=ZERO)
+    csll_tax: Decimal = Field(default=ZERO)
+    net_income: Decimal = Field(default=ZERO)
+    net_margin_pct: Decimal = Field(default=ZERO)
 
     # Chapter 2: Working Capital
-    accounts_receivable: Decimal = Field(default=Decimal("0"))
-    inventory: Decimal = Field(default=Decimal("0"))
-    accounts_payable: Decimal = Field(default=Decimal("0"))
-    days_sales_outstanding: Decimal = Field(default=Decimal("0"), alias="dso")
-    days_inventory_outstanding: Decimal = Field(default=Decimal("0"), alias="dio")
-    days_payable_outstanding: Decimal = Field(default=Decimal("0"), alias="dpo")
-    cash_conversion_cycle: Decimal = Field(default=Decimal("0"), alias="ccc")
-    working_capital: Decimal = Field(default=Decimal("0"))
-    working_capital_investment: Decimal = Field(default=Decimal("0"))
+    accounts_receivable: Decimal = Field(default=ZERO)
+    inventory: Decimal = Field(default=ZERO)
+    accounts_payable: Decimal = Field(default=ZERO)
+    days_sales_outstanding: Decimal = Field(default=ZERO, alias="dso")
+    days_inventory_outstanding: Decimal = Field(default=ZERO, alias="dio")
+    days_payable_outstanding: Decimal = Field(default=ZERO, alias="dpo")
+    cash_conversion_cycle: Decimal = Field(default=ZERO, alias="ccc")
+    working_capital: Decimal = Field(default=ZERO)
+    working_capital_investment: Decimal = Field(default=ZERO)
 
     # Chapter 3: Other Capital
-    ppe_net: Decimal = Field(default=Decimal("0"))
-    intangibles_net: Decimal = Field(default=Decimal("0"))
-    other_capital_net: Decimal = Field(default=Decimal("0"))
-    other_capital_investment: Decimal = Field(default=Decimal("0"))
+    ppe_net: Decimal = Field(default=ZERO)
+    intangibles_net: Decimal = Field(default=ZERO)
+    other_capital_net: Decimal = Field(default=ZERO)
+    other_capital_investment: Decimal = Field(default=ZERO)
 
     # Chapter 4: Funding
-    total_debt: Decimal = Field(default=Decimal("0"))
-    net_debt: Decimal = Field(default=Decimal("0"))
-    shareholders_equity: Decimal = Field(default=Decimal("0"))
+    total_debt: Decimal = Field(default=ZERO)
+    net_debt: Decimal = Field(default=ZERO)
+    shareholders_equity: Decimal = Field(default=ZERO)
 
     # Cash Flow Statement
-    operating_cash_flow: Decimal = Field(default=Decimal("0"))
-    investing_cash_flow: Decimal = Field(default=Decimal("0"))
-    financing_cash_flow: Decimal = Field(default=Decimal("0"))
-    net_cash_flow: Decimal = Field(default=Decimal("0"))
-    free_cash_flow: Decimal = Field(default=Decimal("0"))
+    operating_cash_flow: Decimal = Field(default=ZERO)
+    investing_cash_flow: Decimal = Field(default=ZERO)
+    financing_cash_flow: Decimal = Field(default=ZERO)
+    net_cash_flow: Decimal = Field(default=ZERO)
+    free_cash_flow: Decimal = Field(default=ZERO)
 
     # Financial Ratios
-    current_ratio: Decimal = Field(default=Decimal("0"))
-    quick_ratio: Decimal = Field(default=Decimal("0"))
-    debt_to_equity: Decimal = Field(default=Decimal("0"))
-    roe_pct: Decimal = Field(default=Decimal("0"))
-    roa_pct: Decimal = Field(default=Decimal("0"))
-    roce_pct: Decimal = Field(default=Decimal("0"))
+    current_ratio: Decimal = Field(default=ZERO)
+    quick_ratio: Decimal = Field(default=ZERO)
+    debt_to_equity: Decimal = Field(default=ZERO)
+    roe_pct: Decimal = Field(default=ZERO)
+    roa_pct: Decimal = Field(default=ZERO)
+    roce_pct: Decimal = Field(default=ZERO)
 
     model_config = ConfigDict(populate_by_name=True)
 
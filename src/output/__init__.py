@@ -1,9 +1,13 @@
 """Output generation module for reports and exports."""
 
-from src.output.excel_report import ExcelReportGenerator
-from src.output.html_dashboard import HTMLDashboardGenerator
-from src.output.json_export import JSONExporter
-from src.output.pdf_report import PDFReportGenerator
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.output.excel_report import ExcelReportGenerator
+    from src.output.html_dashboard import HTMLDashboardGenerator
+    from src.output.json_export import JSONExporter
+    from src.output.pdf_report import PDFReportGenerator
 
 __all__ = [
     "ExcelReportGenerator",
@@ -11,3 +15,25 @@ __all__ = [
     "PDFReportGenerator",
     "JSONExporter",
 ]
+
+# Generators are imported on first access so that using one (e.g. the JSON
+# exporter) does not pay for another's heavy dependency (openpyxl).
+_LAZY_EXPORTS = {
+    "ExcelReportGenerator": "src.output.excel_report",
+    "HTMLDashboardGenerator": "src.output.html_dashboard",
+    "PDFReportGenerator": "src.output.pdf_report",
+    "JSONExporter": "src.output.json_export",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
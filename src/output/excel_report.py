@@ -1,13 +1,17 @@
 """Excel report generation with multiple sheets."""
 
+from collections.abc import Sequence
+from decimal import Decimal
 from pathlib import Path
+from typing import Any
 
 from src.models import AnalysisResult
 
 try:
     import openpyxl
     from openpyxl import Workbook
-    from openpyxl.styles import Alignment, Font, PatternFill, numbers
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill, numbers
     from openpyxl.utils import get_column_letter
     _OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -46,6 +50,7 @@ class ExcelReportGenerator:
     _HEADER_FONT_COLOR = 'FFFFFF'
     _CURRENCY_FORMAT = '#,##0.00'
     _PERCENT_FORMAT = '0.00%'
+    _HEADER_STYLE = 'CashFlow Header'
 
     def __init__(self, output_path: str) -> None:
         """
@@ -56,7 +61,7 @@ class ExcelReportGenerator:
         """
         self.output_path = Path(output_path)
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        self._wb: object | None = None
+        self._wb: Workbook | None = None
 
     def generate(self, analysis_result: AnalysisResult) -> Path:
         """
@@ -78,18 +83,18 @@ class ExcelReportGenerator:
                 "Install it with: pip install openpyxl"
             )
 
-        self._wb = Workbook()
+        # Write-only workbooks stream each row to disk as it is appended, so
+        # sheets are built top to bottom and formatted before their first row.
+        wb = Workbook(write_only=True)
+        wb.add_named_style(self._make_header_style())
+        self._wb = wb
 
         self._add_executive_summary_sheet(analysis_result)
         self._add_chapters_sheets(analysis_result)
         self._add_power_of_one_sheet(analysis_result)
         self._add_financial_statements_sheets(analysis_result)
 
-        # Remove the default sheet created by openpyxl
-        if "Sheet" in self._wb.sheetnames:
-            del self._wb["Sheet"]
-
-        self._wb.save(self.output_path)
+        wb.save(self.output_path)
         return self.output_path
 
     # ------------------------------------------------------------------
@@ -102,51 +107,77 @@ class ExcelReportGenerator:
     def _make_header_font(self) -> "Font":
         return Font(bold=True, color=self._HEADER_FONT_COLOR)
 
-    def _write_header_row(self, sheet, row: int, values: list) -> None:
-        """Write a styled header row (blue fill, white bold font)."""
-        fill = self._make_header_fill()
-        font = self._make_header_font()
-        for col_idx, value in enumerate(values, start=1):
-            cell = sheet.cell(row=row, column=col_idx, value=value)
-            cell.fill = fill
-            cell.font = font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    def _make_header_style(self) -> "NamedStyle":
+        """
+        Table header style, registered once per workbook.
+
+        Assigning a named style copies its precomputed style ids onto the
+        cell; setting font, fill and alignment separately would hash and
+        look up each object in the workbook's style tables for every cell.
+        """
+        return NamedStyle(
+            name=self._HEADER_STYLE,
+            font=self._make_header_font(),
+            fill=self._make_header_fill(),
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+        )
+
+    def _write_header_row(self, sheet: Any, values: list[str]) -> None:
+        """Append a styled header row (blue fill, white bold font)."""
+        row = []
+        for value in values:
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.style = self._HEADER_STYLE
+            row.append(cell)
+        sheet.append(row)
+
+    def _number_cell(
+        self, sheet: Any, value: Decimal | None, number_format: str
+    ) -> "WriteOnlyCell | None":
+        """Float cell with ``number_format``, or None (an empty cell) for None."""
+        if value is None:
+            return None
+        cell = WriteOnlyCell(sheet, value=float(value))
+        cell.number_format = number_format
+        return cell
 
     def _write_label_value_row(
         self,
-        sheet,
-        row: int,
+        sheet: Any,
         label: str,
-        values: list,
+        values: Sequence[Decimal | None],
         number_format: str = _CURRENCY_FORMAT,
     ) -> None:
-        """Write a label in column A and period values in subsequent columns."""
-        sheet.cell(row=row, column=1, value=label)
-        for col_idx, value in enumerate(values, start=2):
-            cell = sheet.cell(row=row, column=col_idx, value=float(value) if value is not None else None)
-            if value is not None:
-                cell.number_format = number_format
-
-    def _format_sheet(self, sheet_name: str) -> None:
+        """Append a label in column A and period values in subsequent columns."""
+        sheet.append([label] + [self._number_cell(sheet, v, number_format) for v in values])
+
+    def _create_sheet(self, title: str, n_columns: int) -> Any:
         """
-        Apply professional formatting to sheet.
+        Create a sheet with professional formatting applied.
+
+        Write-only sheets emit column widths and panes with their first row,
+        so the layout is set up front from the known column count.
 
         Args:
-            sheet_name: Name of sheet to format
-        """
-        if self._wb is None or sheet_name not in self._wb.sheetnames:
-            return
+            title: Sheet name
+            n_columns: Number of columns the sheet will use
 
-        sheet = self._wb[sheet_name]
+        Returns:
+            The new write-only worksheet
+        """
+        if self._wb is None:
+            raise RuntimeError("Workbook not created; call generate()")
+        sheet = self._wb.create_sheet(title)
 
         # Set column A (label column) wider, other columns standard
         sheet.column_dimensions['A'].width = 35
-        for col_idx in range(2, sheet.max_column + 1):
+        for col_idx in range(2, n_columns + 1):
             col_letter = get_column_letter(col_idx)
             sheet.column_dimensions[col_letter].width = 18
 
         # Freeze top row
         sheet.freeze_panes = 'A2'
+        return sheet
 
     # ------------------------------------------------------------------
     # Sheet builders
@@ -163,29 +194,36 @@ class ExcelReportGenerator:
         - Top 5 Power of One levers
         - Key metrics summary table
         """
-        sheet = self._wb.create_sheet("Resumo Executivo")
+        # Title is merged across A1:F1
+        sheet = self._create_sheet("Resumo Executivo", n_columns=6)
 
         header_fill = self._make_header_fill()
         header_font = self._make_header_font()
 
+        def section_header(text: str) -> "WriteOnlyCell":
+            cell = WriteOnlyCell(sheet, value=text)
+            cell.font = header_font
+            cell.fill = header_fill
+            return cell
+
         # Row 1: Report title (merged A1:F1)
-        title_cell = sheet.cell(row=1, column=1, value="Relatório CashFlow Story")
+        title_cell = WriteOnlyCell(sheet, value="Relatório CashFlow Story")
         title_cell.font = Font(bold=True, size=14, color=self._HEADER_FONT_COLOR)
         title_cell.fill = header_fill
         title_cell.alignment = Alignment(horizontal='center', vertical='center')
-        sheet.merge_cells('A1:F1')
+        sheet.append([title_cell])
+        sheet.merged_cells.add('A1:F1')
 
         # Row 2: Company
-        sheet.cell(row=2, column=1, value=f"Empresa: {analysis_result.company}")
+        sheet.append([f"Empresa: {analysis_result.company}"])
 
         # Row 3: Generated at
         generated_str = analysis_result.generated_at.strftime("%d/%m/%Y %H:%M")
-        sheet.cell(row=3, column=1, value=f"Gerado em: {generated_str}")
+        sheet.append([f"Gerado em: {generated_str}"])
+        sheet.append([])
 
         # Row 5: Three Big Measures header
-        tbm_header = sheet.cell(row=5, column=1, value="3 Grandes Medidas")
-        tbm_header.font = header_font
-        tbm_header.fill = header_fill
+        sheet.append([section_header("3 Grandes Medidas")])
 
         # Rows 6-8: Three Big Measures values
         tbm = analysis_result.three_big_measures
@@ -194,31 +232,23 @@ class ExcelReportGenerator:
             ("Fluxo de Caixa Operacional", tbm.operating_cash_flow if tbm else None),
             ("Fluxo de Caixa Marginal", tbm.marginal_cash_flow if tbm else None),
         ]
-        for row_offset, (label, value) in enumerate(measures, start=6):
-            sheet.cell(row=row_offset, column=1, value=label)
-            val_cell = sheet.cell(
-                row=row_offset, column=2,
-                value=float(value) if value is not None else None
-            )
-            if value is not None:
-                val_cell.number_format = self._CURRENCY_FORMAT
+        for label, value in measures:
+            self._write_label_value_row(sheet, label, [value])
+        sheet.append([])
 
         # Row 10: Cash Quality header
-        cq_header = sheet.cell(row=10, column=1, value="Qualidade do Caixa")
-        cq_header.font = header_font
-        cq_header.fill = header_fill
+        sheet.append([section_header("Qualidade do Caixa")])
 
-        # Cash quality column headers
-        self._write_header_row(sheet, row=11, values=["Métrica", "Valor", "Nota"])
+        # Row 11: Cash quality column headers
+        self._write_header_row(sheet, values=["Métrica", "Valor", "Nota"])
 
-        # Cash quality metric rows
-        for row_idx, metric in enumerate(analysis_result.cash_quality, start=12):
-            sheet.cell(row=row_idx, column=1, value=metric.label_pt)
-            val_cell = sheet.cell(row=row_idx, column=2, value=float(metric.value))
-            val_cell.number_format = self._CURRENCY_FORMAT
-            sheet.cell(row=row_idx, column=3, value=metric.grade)
-
-        self._format_sheet("Resumo Executivo")
+        # Row 12+: Cash quality metric rows
+        for metric in analysis_result.cash_quality:
+            sheet.append([
+                metric.label_pt,
+                self._number_cell(sheet, metric.value, self._CURRENCY_FORMAT),
+                metric.grade,
+            ])
 
     def _add_chapters_sheets(self, analysis_result: AnalysisResult) -> None:
         """
@@ -232,9 +262,9 @@ class ExcelReportGenerator:
         period_labels = [p.period for p in periods]
 
         # ---------- Chapter 1: Rentabilidade (Income Statement) ----------
-        sheet1 = self._wb.create_sheet("Cap 1 Rentabilidade")
         header_values = ["Métrica"] + period_labels
-        self._write_header_row(sheet1, row=1, values=header_values)
+        sheet1 = self._create_sheet("Cap 1 Rentabilidade", len(header_values))
+        self._write_header_row(sheet1, values=header_values)
 
         is_rows = [
             ("Receita Bruta", "gross_revenue", self._CURRENCY_FORMAT),
@@ -258,14 +288,13 @@ class ExcelReportGenerator:
             ("Lucro Líquido", "net_income", self._CURRENCY_FORMAT),
             ("Margem Líquida %", "net_margin_pct", self._PERCENT_FORMAT),
         ]
-        for row_idx, (label, field, fmt) in enumerate(is_rows, start=2):
+        for label, field, fmt in is_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(sheet1, row_idx, label, values, fmt)
-        self._format_sheet("Cap 1 Rentabilidade")
+            self._write_label_value_row(sheet1, label, values, fmt)
 
         # ---------- Chapter 2: Capital de Giro (Working Capital) ----------
-        sheet2 = self._wb.create_sheet("Cap 2 Capital de Giro")
-        self._write_header_row(sheet2, row=1, values=header_values)
+        sheet2 = self._create_sheet("Cap 2 Capital de Giro", len(header_values))
+        self._write_header_row(sheet2, values=header_values)
 
         wc_rows = [
             ("Contas a Receber", "accounts_receivable", self._CURRENCY_FORMAT),
@@ -278,14 +307,13 @@ class ExcelReportGenerator:
             ("Capital de Giro", "working_capital", self._CURRENCY_FORMAT),
             ("Investimento em Capital de Giro", "working_capital_investment", self._CURRENCY_FORMAT),
         ]
-        for row_idx, (label, field, fmt) in enumerate(wc_rows, start=2):
+        for label, field, fmt in wc_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(sheet2, row_idx, label, values, fmt)
-        self._format_sheet("Cap 2 Capital de Giro")
+            self._write_label_value_row(sheet2, label, values, fmt)
 
         # ---------- Chapter 3: Outros Capitais (Other Capital) ----------
-        sheet3 = self._wb.create_sheet("Cap 3 Outros Capitais")
-        self._write_header_row(sheet3, row=1, values=header_values)
+        sheet3 = self._create_sheet("Cap 3 Outros Capitais", len(header_values))
+        self._write_header_row(sheet3, values=header_values)
 
         oc_rows = [
             ("Imobilizado Líquido (PP&E)", "ppe_net", self._CURRENCY_FORMAT),
@@ -293,14 +321,13 @@ class ExcelReportGenerator:
             ("Outros Capitais Líquido", "other_capital_net", self._CURRENCY_FORMAT),
             ("Fluxo de Caixa de Investimentos", "investing_cash_flow", self._CURRENCY_FORMAT),
         ]
-        for row_idx, (label, field, fmt) in enumerate(oc_rows, start=2):
+        for label, field, fmt in oc_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(sheet3, row_idx, label, values, fmt)
-        self._format_sheet("Cap 3 Outros Capitais")
+            self._write_label_value_row(sheet3, label, values, fmt)
 
         # ---------- Chapter 4: Financiamento (Funding + Cash Flow) ----------
-        sheet4 = self._wb.create_sheet("Cap 4 Financiamento")
-        self._write_header_row(sheet4, row=1, values=header_values)
+        sheet4 = self._create_sheet("Cap 4 Financiamento", len(header_values))
+        self._write_header_row(sheet4, values=header_values)
 
         funding_rows = [
             ("Dívida Total", "total_debt", self._CURRENCY_FORMAT),
@@ -313,10 +340,9 @@ class ExcelReportGenerator:
             ("Fluxo de Caixa Líquido", "net_cash_flow", self._CURRENCY_FORMAT),
             ("Fluxo de Caixa Livre", "free_cash_flow", self._CURRENCY_FORMAT),
         ]
-        for row_idx, (label, field, fmt) in enumerate(funding_rows, start=2):
+        for label, field, fmt in funding_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(sheet4, row_idx, label, values, fmt)
-        self._format_sheet("Cap 4 Financiamento")
+            self._write_label_value_row(sheet4, label, values, fmt)
 
     def _add_power_of_one_sheet(self, analysis_result: AnalysisResult) -> None:
         """
@@ -330,8 +356,6 @@ class ExcelReportGenerator:
         - Cash impact
         - Value impact
         """
-        sheet = self._wb.create_sheet("Power of One")
-
         headers = [
             "Alavanca",
             "Categoria",
@@ -341,28 +365,21 @@ class ExcelReportGenerator:
             "Impacto Caixa",
             "Impacto Valor",
         ]
-        self._write_header_row(sheet, row=1, values=headers)
-
-        for row_idx, lever in enumerate(analysis_result.power_of_one, start=2):
-            sheet.cell(row=row_idx, column=1, value=lever.label_pt)
-            sheet.cell(row=row_idx, column=2, value=lever.category)
-
-            current_val_cell = sheet.cell(row=row_idx, column=3, value=float(lever.current_value))
-            current_val_cell.number_format = self._CURRENCY_FORMAT
+        sheet = self._create_sheet("Power of One", len(headers))
+        self._write_header_row(sheet, values=headers)
 
+        currency = self._CURRENCY_FORMAT
+        for lever in analysis_result.power_of_one:
             change_label = f"{float(lever.change_amount)} {lever.change_unit}"
-            sheet.cell(row=row_idx, column=4, value=change_label)
-
-            profit_cell = sheet.cell(row=row_idx, column=5, value=float(lever.profit_impact))
-            profit_cell.number_format = self._CURRENCY_FORMAT
-
-            cash_cell = sheet.cell(row=row_idx, column=6, value=float(lever.cash_impact))
-            cash_cell.number_format = self._CURRENCY_FORMAT
-
-            value_cell = sheet.cell(row=row_idx, column=7, value=float(lever.value_impact))
-            value_cell.number_format = self._CURRENCY_FORMAT
-
-        self._format_sheet("Power of One")
+            sheet.append([
+                lever.label_pt,
+                lever.category,
+                self._number_cell(sheet, lever.current_value, currency),
+                change_label,
+                self._number_cell(sheet, lever.profit_impact, currency),
+                self._number_cell(sheet, lever.cash_impact, currency),
+                self._number_cell(sheet, lever.value_impact, currency),
+            ])
 
     def _add_financial_statements_sheets(self, analysis_result: AnalysisResult) -> None:
         """
@@ -373,8 +390,8 @@ class ExcelReportGenerator:
         header_values = ["Métrica"] + period_labels
 
         # ---------- DRE (Income Statement) ----------
-        dre_sheet = self._wb.create_sheet("DRE")
-        self._write_header_row(dre_sheet, row=1, values=header_values)
+        dre_sheet = self._create_sheet("DRE", len(header_values))
+        self._write_header_row(dre_sheet, values=header_values)
 
         dre_rows = [
             ("Receita Bruta", "gross_revenue", self._CURRENCY_FORMAT),
@@ -398,14 +415,13 @@ class ExcelReportGenerator:
             ("Lucro Líquido", "net_income", self._CURRENCY_FORMAT),
             ("Margem Líquida %", "net_margin_pct", self._PERCENT_FORMAT),
         ]
-        for row_idx, (label, field, fmt) in enumerate(dre_rows, start=2):
+        for label, field, fmt in dre_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(dre_sheet, row_idx, label, values, fmt)
-        self._format_sheet("DRE")
+            self._write_label_value_row(dre_sheet, label, values, fmt)
 
         # ---------- Fluxo de Caixa (Cash Flow Statement) ----------
-        cf_sheet = self._wb.create_sheet("Fluxo de Caixa")
-        self._write_header_row(cf_sheet, row=1, values=header_values)
+        cf_sheet = self._create_sheet("Fluxo de Caixa", len(header_values))
+        self._write_header_row(cf_sheet, values=header_values)
 
         cf_rows = [
             ("Fluxo de Caixa Operacional", "operating_cash_flow"),
@@ -414,14 +430,13 @@ class ExcelReportGenerator:
             ("Fluxo de Caixa Líquido", "net_cash_flow"),
             ("Fluxo de Caixa Livre", "free_cash_flow"),
         ]
-        for row_idx, (label, field) in enumerate(cf_rows, start=2):
+        for label, field in cf_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(cf_sheet, row_idx, label, values, self._CURRENCY_FORMAT)
-        self._format_sheet("Fluxo de Caixa")
+            self._write_label_value_row(cf_sheet, label, values, self._CURRENCY_FORMAT)
 
         # ---------- Indicadores (Ratios) ----------
-        ind_sheet = self._wb.create_sheet("Indicadores")
-        self._write_header_row(ind_sheet, row=1, values=header_values)
+        ind_sheet = self._create_sheet("Indicadores", len(header_values))
+        self._write_header_row(ind_sheet, values=header_values)
 
         ratio_rows = [
             ("Liquidez Corrente", "current_ratio", '#,##0.00'),
@@ -431,19 +446,18 @@ class ExcelReportGenerator:
             ("ROCE %", "roce_pct", self._PERCENT_FORMAT),
             ("Dívida / PL", "debt_to_equity", '#,##0.00'),
         ]
-        for row_idx, (label, field, fmt) in enumerate(ratio_rows, start=2):
+        for label, field, fmt in ratio_rows:
             values = [getattr(p, field) for p in periods]
-            self._write_label_value_row(ind_sheet, row_idx, label, values, fmt)
-        self._format_sheet("Indicadores")
+            self._write_label_value_row(ind_sheet, label, values, fmt)
 
         # ---------- Qualidade do Caixa (Cash Quality Metrics) ----------
-        cq_sheet = self._wb.create_sheet("Qualidade do Caixa")
-        self._write_header_row(cq_sheet, row=1, values=["Métrica", "Valor", "Nota"])
-
-        for row_idx, metric in enumerate(analysis_result.cash_quality, start=2):
-            cq_sheet.cell(row=row_idx, column=1, value=metric.label_pt)
-            val_cell = cq_sheet.cell(row=row_idx, column=2, value=float(metric.value))
-            val_cell.number_format = self._CURRENCY_FORMAT
-            cq_sheet.cell(row=row_idx, column=3, value=metric.grade)
-
-        self._format_sheet("Qualidade do Caixa")
+        cq_headers = ["Métrica", "Valor", "Nota"]
+        cq_sheet = self._create_sheet("Qualidade do Caixa", len(cq_headers))
+        self._write_header_row(cq_sheet, values=cq_headers)
+
+        for metric in analysis_result.cash_quality:
+            cq_sheet.append([
+                metric.label_pt,
+                self._number_cell(cq_sheet, metric.value, self._CURRENCY_FORMAT),
+                metric.grade,
+            ])
@@ -7,6 +7,250 @@ from typing import Any
 from src.models import AnalysisResult
 
 
+# Static parts of the dashboard document, built once at import and spliced
+# into the per-report f-string. The badge colour comes in through the
+# ``--status-color`` custom property set on the element.
+_DASHBOARD_CSS = """\
+        /* ========== Reset & Base ========== */
+        *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: #F5F5F5;
+            color: #2C3E50;
+            font-size: 14px;
+            line-height: 1.5;
+        }
+        a { color: #2980B9; text-decoration: none; }
+
+        /* ========== Header ========== */
+        .site-header {
+            background: #1F4E79;
+            color: #fff;
+            padding: 24px 32px;
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            flex-wrap: wrap;
+            gap: 12px;
+        }
+        .header-left h1 {
+            font-size: 1.8rem;
+            font-weight: 700;
+            letter-spacing: 0.5px;
+        }
+        .header-left .subtitle {
+            font-size: 0.9rem;
+            opacity: 0.8;
+            margin-top: 4px;
+        }
+        .header-right {
+            text-align: right;
+        }
+        .status-badge {
+            display: inline-block;
+            padding: 6px 18px;
+            border-radius: 20px;
+            font-weight: 700;
+            font-size: 1rem;
+            background: var(--status-color);
+            color: #fff;
+            margin-bottom: 4px;
+        }
+        .header-date {
+            font-size: 0.8rem;
+            opacity: 0.75;
+        }
+
+        /* ========== Layout ========== */
+        .main-content {
+            max-width: 1280px;
+            margin: 0 auto;
+            padding: 24px 16px 48px;
+        }
+        .section {
+            margin-bottom: 32px;
+        }
+        .section-title {
+            font-size: 1.1rem;
+            font-weight: 700;
+            color: #1F4E79;
+            border-bottom: 2px solid #1F4E79;
+            padding-bottom: 6px;
+            margin-bottom: 16px;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+
+        /* ========== KPI Grid ========== */
+        .kpi-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
+            gap: 16px;
+        }
+        .kpi-grid.three-col {
+            grid-template-columns: repeat(auto-fit, minmax(260px, 1fr));
+        }
+        .kpi-card {
+            background: #fff;
+            border-radius: 8px;
+            padding: 20px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+            text-align: center;
+            transition: transform 0.15s;
+        }
+        .kpi-card:hover { transform: translateY(-2px); box-shadow: 0 4px 16px rgba(0,0,0,0.12); }
+        .kpi-icon { font-size: 1.8rem; margin-bottom: 8px; }
+        .kpi-label { font-size: 0.78rem; color: #7F8C8D; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 6px; }
+        .kpi-value { font-size: 1.2rem; font-weight: 700; color: #1F4E79; word-break: break-word; }
+        .kpi-sub { font-size: 0.75rem; color: #95A5A6; margin-top: 4px; }
+        .kpi-interp { font-size: 0.8rem; color: #555; margin-top: 8px; font-style: italic; }
+        .kpi-positive { color: #27AE60 !important; }
+        .kpi-negative { color: #E74C3C !important; }
+
+        /* ========== Chapter Cards ========== */
+        .chapters-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+            gap: 16px;
+        }
+        .chapter-card {
+            background: #fff;
+            border-radius: 8px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+            overflow: hidden;
+        }
+        .chapter-header {
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            padding: 14px 16px;
+            cursor: pointer;
+            user-select: none;
+            background: #FAFAFA;
+            transition: background 0.15s;
+        }
+        .chapter-header:hover { background: #EAF2FB; }
+        .chapter-title-group { display: flex; align-items: center; gap: 10px; }
+        .chapter-icon { font-size: 1.4rem; }
+        .chapter-label { font-size: 0.7rem; color: #7F8C8D; text-transform: uppercase; letter-spacing: 0.5px; }
+        .chapter-title { font-size: 1rem; font-weight: 700; color: #2C3E50; }
+        .chapter-meta { display: flex; align-items: center; gap: 10px; }
+        .chapter-metric { font-size: 0.82rem; color: #555; font-weight: 600; }
+        .chapter-toggle { font-size: 0.9rem; color: #7F8C8D; transition: transform 0.2s; display: inline-block; }
+        .chapter-toggle.open { transform: rotate(180deg); }
+        .chapter-body { display: none; padding: 0 16px 16px; }
+        .chapter-body.open { display: block; }
+
+        /* ========== Detail Tables ========== */
+        .detail-table { width: 100%; border-collapse: collapse; margin-top: 8px; }
+        .detail-table td { padding: 7px 4px; border-bottom: 1px solid #ECF0F1; vertical-align: middle; }
+        .td-label { color: #555; font-size: 0.82rem; }
+        .td-value { text-align: right; font-weight: 600; font-size: 0.85rem; }
+        .value-positive { color: #27AE60; }
+        .value-negative { color: #E74C3C; }
+        .value-pct { color: #2980B9; }
+
+        /* ========== Charts ========== */
+        .chart-container { background: #fff; border-radius: 8px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.08); }
+        .chart-container canvas { max-height: 340px; }
+
+        /* ========== Cash Quality ========== */
+        .cq-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(160px, 1fr));
+            gap: 14px;
+        }
+        .cq-card {
+            background: #fff;
+            border-radius: 8px;
+            padding: 16px 12px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+            text-align: center;
+        }
+        .cq-badge {
+            display: inline-block;
+            width: 44px;
+            height: 44px;
+            border-radius: 50%;
+            color: #fff;
+            font-size: 1.3rem;
+            font-weight: 700;
+            line-height: 44px;
+            margin-bottom: 8px;
+        }
+        .cq-label { font-size: 0.78rem; color: #555; margin-bottom: 4px; font-weight: 600; }
+        .cq-value { font-size: 1rem; font-weight: 700; color: #2C3E50; }
+        .cq-grade-label { font-size: 0.75rem; font-weight: 600; margin-top: 4px; }
+
+        /* ========== AI Insights ========== */
+        .ai-insights-box {
+            background: #EAF2FB;
+            border-left: 4px solid #2980B9;
+            border-radius: 0 8px 8px 0;
+            padding: 20px 24px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.05);
+        }
+        .ai-insights-content { font-size: 0.9rem; color: #2C3E50; line-height: 1.7; white-space: pre-wrap; }
+
+        /* ========== Footer ========== */
+        .site-footer {
+            background: #1F4E79;
+            color: rgba(255,255,255,0.7);
+            text-align: center;
+            padding: 16px;
+            font-size: 0.78rem;
+        }
+
+        /* ========== Utility ========== */
+        .no-data { color: #95A5A6; font-style: italic; padding: 12px 0; }
+
+        /* ========== Print ========== */
+        @media print {
+            .site-header { background: #1F4E79 !important; -webkit-print-color-adjust: exact; print-color-adjust: exact; }
+            .chapter-body { display: block !important; }
+            .chapter-toggle { display: none; }
+            .kpi-card, .chapter-card, .cq-card, .chart-container { box-shadow: none; border: 1px solid #ddd; }
+            body { background: #fff; }
+            .main-content { padding: 8px; }
+        }
+
+        /* ========== Responsive ========== */
+        @media (max-width: 600px) {
+            .site-header { padding: 16px; }
+            .header-left h1 { font-size: 1.3rem; }
+            .kpi-grid { grid-template-columns: 1fr 1fr; }
+        }"""
+
+_DASHBOARD_SCRIPT = """\
+    // ---- Brazilian currency formatter ----
+    function formatBRL(value) {
+        if (value === null || value === undefined) return 'R$ 0,00';
+        var negative = value < 0;
+        var abs = Math.abs(value);
+        var intPart = Math.floor(abs);
+        var decPart = Math.round((abs - intPart) * 100);
+        var intStr = intPart.toString().replace(/\\B(?=(\\d{3})+(?!\\d))/g, '.');
+        var formatted = 'R$ ' + intStr + ',' + String(decPart).padStart(2, '0');
+        return negative ? '(' + formatted + ')' : formatted;
+    }
+
+    // ---- Chapter toggle ----
+    function toggleChapter(id) {
+        var body = document.getElementById('body-' + id);
+        var toggle = document.getElementById('toggle-' + id);
+        if (body && toggle) {
+            var isOpen = body.classList.contains('open');
+            body.classList.toggle('open', !isOpen);
+            toggle.classList.toggle('open', !isOpen);
+        }
+    }
+
+    // Auto-open Chapter 1 on load
+    document.addEventListener('DOMContentLoaded', function() {
+        toggleChapter('cap1');
+    });"""
+
+
 class HTMLDashboardGenerator:
     """
     Generates interactive HTML dashboard for CashFlow Story.
@@ -394,15 +638,16 @@ class HTMLDashboardGenerator:
     # Charts
     # ------------------------------------------------------------------
 
-    def _generate_charts(self, analysis_result: AnalysisResult) -> str:
+    def _generate_charts(self, ctx: dict[str, Any]) -> str:
         """
         Generate Chart.js scripts for visualizations.
 
+        Args:
+            ctx: Context from ``_prepare_context`` (shared with ``_build_html``)
+
         Returns:
             str: JavaScript code for all charts
         """
-        ctx = self._prepare_context(analysis_result)
-
         period_labels_json = _to_js_str_array(ctx["period_labels"])
         revenue_json = _to_js_num_array(ctx["revenue_data"])
         ebitda_json = _to_js_num_array(ctx["ebitda_data"])
@@ -766,7 +1011,7 @@ class HTMLDashboardGenerator:
         po1_section_content = self._generate_power_of_one_visualization(analysis_result)
 
         # Chart scripts
-        chart_scripts = self._generate_charts(analysis_result)
+        chart_scripts = self._generate_charts(ctx)
         # Power of One chart script is already embedded inside po1_section_content
         # but we strip the <script> from it and put it at bottom for clarity.
         # Actually keep it embedded for simpler structure — it is already inside a <script> tag.
@@ -797,215 +1042,7 @@ class HTMLDashboardGenerator:
     <title>CashFlow Story - {company}</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
-        /* ========== Reset & Base ========== */
-        *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: #F5F5F5;
-            color: #2C3E50;
-            font-size: 14px;
-            line-height: 1.5;
-        }}
-        a {{ color: #2980B9; text-decoration: none; }}
-
-        /* ========== Header ========== */
-        .site-header {{
-            background: #1F4E79;
-            color: #fff;
-            padding: 24px 32px;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            flex-wrap: wrap;
-            gap: 12px;
-        }}
-        .header-left h1 {{
-            font-size: 1.8rem;
-            font-weight: 700;
-            letter-spacing: 0.5px;
-        }}
-        .header-left .subtitle {{
-            font-size: 0.9rem;
-            opacity: 0.8;
-            margin-top: 4px;
-        }}
-        .header-right {{
-            text-align: right;
-        }}
-        .status-badge {{
-            display: inline-block;
-            padding: 6px 18px;
-            border-radius: 20px;
-            font-weight: 700;
-            font-size: 1rem;
-            background: {status_color};
-            color: #fff;
-            margin-bottom: 4px;
-        }}
-        .header-date {{
-            font-size: 0.8rem;
-            opacity: 0.75;
-        }}
-
-        /* ========== Layout ========== */
-        .main-content {{
-            max-width: 1280px;
-            margin: 0 auto;
-            padding: 24px 16px 48px;
-        }}
-        .section {{
-            margin-bottom: 32px;
-        }}
-        .section-title {{
-            font-size: 1.1rem;
-            font-weight: 700;
-            color: #1F4E79;
-            border-bottom: 2px solid #1F4E79;
-            padding-bottom: 6px;
-            margin-bottom: 16px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-
-        /* ========== KPI Grid ========== */
-        .kpi-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-            gap: 16px;
-        }}
-        .kpi-grid.three-col {{
-            grid-template-columns: repeat(auto-fit, minmax(260px, 1fr));
-        }}
-        .kpi-card {{
-            background: #fff;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            text-align: center;
-            transition: transform 0.15s;
-        }}
-        .kpi-card:hover {{ transform: translateY(-2px); box-shadow: 0 4px 16px rgba(0,0,0,0.12); }}
-        .kpi-icon {{ font-size: 1.8rem; margin-bottom: 8px; }}
-        .kpi-label {{ font-size: 0.78rem; color: #7F8C8D; text-transform: uppercase; letter-spacing: 0.5px; margin-bottom: 6px; }}
-        .kpi-value {{ font-size: 1.2rem; font-weight: 700; color: #1F4E79; word-break: break-word; }}
-        .kpi-sub {{ font-size: 0.75rem; color: #95A5A6; margin-top: 4px; }}
-        .kpi-interp {{ font-size: 0.8rem; color: #555; margin-top: 8px; font-style: italic; }}
-        .kpi-positive {{ color: #27AE60 !important; }}
-        .kpi-negative {{ color: #E74C3C !important; }}
-
-        /* ========== Chapter Cards ========== */
-        .chapters-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 16px;
-        }}
-        .chapter-card {{
-            background: #fff;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            overflow: hidden;
-        }}
-        .chapter-header {{
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            padding: 14px 16px;
-            cursor: pointer;
-            user-select: none;
-            background: #FAFAFA;
-            transition: background 0.15s;
-        }}
-        .chapter-header:hover {{ background: #EAF2FB; }}
-        .chapter-title-group {{ display: flex; align-items: center; gap: 10px; }}
-        .chapter-icon {{ font-size: 1.4rem; }}
-        .chapter-label {{ font-size: 0.7rem; color: #7F8C8D; text-transform: uppercase; letter-spacing: 0.5px; }}
-        .chapter-title {{ font-size: 1rem; font-weight: 700; color: #2C3E50; }}
-        .chapter-meta {{ display: flex; align-items: center; gap: 10px; }}
-        .chapter-metric {{ font-size: 0.82rem; color: #555; font-weight: 600; }}
-        .chapter-toggle {{ font-size: 0.9rem; color: #7F8C8D; transition: transform 0.2s; display: inline-block; }}
-        .chapter-toggle.open {{ transform: rotate(180deg); }}
-        .chapter-body {{ display: none; padding: 0 16px 16px; }}
-        .chapter-body.open {{ display: block; }}
-
-        /* ========== Detail Tables ========== */
-        .detail-table {{ width: 100%; border-collapse: collapse; margin-top: 8px; }}
-        .detail-table td {{ padding: 7px 4px; border-bottom: 1px solid #ECF0F1; vertical-align: middle; }}
-        .td-label {{ color: #555; font-size: 0.82rem; }}
-        .td-value {{ text-align: right; font-weight: 600; font-size: 0.85rem; }}
-        .value-positive {{ color: #27AE60; }}
-        .value-negative {{ color: #E74C3C; }}
-        .value-pct {{ color: #2980B9; }}
-
-        /* ========== Charts ========== */
-        .chart-container {{ background: #fff; border-radius: 8px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.08); }}
-        .chart-container canvas {{ max-height: 340px; }}
-
-        /* ========== Cash Quality ========== */
-        .cq-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(160px, 1fr));
-            gap: 14px;
-        }}
-        .cq-card {{
-            background: #fff;
-            border-radius: 8px;
-            padding: 16px 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            text-align: center;
-        }}
-        .cq-badge {{
-            display: inline-block;
-            width: 44px;
-            height: 44px;
-            border-radius: 50%;
-            color: #fff;
-            font-size: 1.3rem;
-            font-weight: 700;
-            line-height: 44px;
-            margin-bottom: 8px;
-        }}
-        .cq-label {{ font-size: 0.78rem; color: #555; margin-bottom: 4px; font-weight: 600; }}
-        .cq-value {{ font-size: 1rem; font-weight: 700; color: #2C3E50; }}
-        .cq-grade-label {{ font-size: 0.75rem; font-weight: 600; margin-top: 4px; }}
-
-        /* ========== AI Insights ========== */
-        .ai-insights-box {{
-            background: #EAF2FB;
-            border-left: 4px solid #2980B9;
-            border-radius: 0 8px 8px 0;
-            padding: 20px 24px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-        }}
-        .ai-insights-content {{ font-size: 0.9rem; color: #2C3E50; line-height: 1.7; white-space: pre-wrap; }}
-
-        /* ========== Footer ========== */
-        .site-footer {{
-            background: #1F4E79;
-            color: rgba(255,255,255,0.7);
-            text-align: center;
-            padding: 16px;
-            font-size: 0.78rem;
-        }}
-
-        /* ========== Utility ========== */
-        .no-data {{ color: #95A5A6; font-style: italic; padding: 12px 0; }}
-
-        /* ========== Print ========== */
-        @media print {{
-            .site-header {{ background: #1F4E79 !important; -webkit-print-color-adjust: exact; print-color-adjust: exact; }}
-            .chapter-body {{ display: block !important; }}
-            .chapter-toggle {{ display: none; }}
-            .kpi-card, .chapter-card, .cq-card, .chart-container {{ box-shadow: none; border: 1px solid #ddd; }}
-            body {{ background: #fff; }}
-            .main-content {{ padding: 8px; }}
-        }}
-
-        /* ========== Responsive ========== */
-        @media (max-width: 600px) {{
-            .site-header {{ padding: 16px; }}
-            .header-left h1 {{ font-size: 1.3rem; }}
-            .kpi-grid {{ grid-template-columns: 1fr 1fr; }}
-        }}
+{_DASHBOARD_CSS}
     </style>
 </head>
 <body>
@@ -1017,7 +1054,7 @@ class HTMLDashboardGenerator:
         <div class="subtitle">{company}</div>
     </div>
     <div class="header-right">
-        <div class="status-badge">{overall_status}</div>
+        <div class="status-badge" style="--status-color: {status_color}">{overall_status}</div>
         <div class="header-date">Gerado em: {generated_at}</div>
     </div>
 </header>
@@ -1079,33 +1116,7 @@ class HTMLDashboardGenerator:
 
 <!-- ===== SCRIPTS ===== -->
 <script>
-    // ---- Brazilian currency formatter ----
-    function formatBRL(value) {{
-        if (value === null || value === undefined) return 'R$ 0,00';
-        var negative = value < 0;
-        var abs = Math.abs(value);
-        var intPart = Math.floor(abs);
-        var decPart = Math.round((abs - intPart) * 100);
-        var intStr = intPart.toString().replace(/\\B(?=(\\d{{3}})+(?!\\d))/g, '.');
-        var formatted = 'R$ ' + intStr + ',' + String(decPart).padStart(2, '0');
-        return negative ? '(' + formatted + ')' : formatted;
-    }}
-
-    // ---- Chapter toggle ----
-    function toggleChapter(id) {{
-        var body = document.getElementById('body-' + id);
-        var toggle = document.getElementById('toggle-' + id);
-        if (body && toggle) {{
-            var isOpen = body.classList.contains('open');
-            body.classList.toggle('open', !isOpen);
-            toggle.classList.toggle('open', !isOpen);
-        }}
-    }}
-
-    // Auto-open Chapter 1 on load
-    document.addEventListener('DOMContentLoaded', function() {{
-        toggleChapter('cap1');
-    }});
+{_DASHBOARD_SCRIPT}
 </script>
 
 <script>
@@ -7,11 +7,20 @@ from pathlib import Path
 
 from src.models import AnalysisResult
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 
 class JSONExporter:
     """
     Exports AnalysisResult to JSON format.
 
+    Serializes with orjson when installed (``pip install .[fast]``),
+    otherwise with the stdlib ``json`` module; both produce the same data.
+
     Features:
     - Complete hierarchical JSON structure
     - Decimal serialization
@@ -59,6 +68,13 @@ class JSONExporter:
         TODO: Save and return file path
         """
         data = analysis_result.model_dump(mode='json')
+        if _ORJSON_AVAILABLE:
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            self.output_path.write_bytes(
+                orjson.dumps(data, default=self._decimal_encoder, option=option)
+            )
+            return self.output_path
+
         indent = 2 if pretty else None
         json_str = json.dumps(data, indent=indent, default=self._decimal_encoder)
         self.output_path.write_text(json_str, encoding='utf-8')
@@ -11,14 +11,10 @@ from dotenv import load_dotenv
 
 from src.ai.analyst import CashFlowStoryAnalyst
 from src.calc import (
-    calculate_cash_flow,
-    calculate_income_statement,
     calculate_marginal_cash_flow,
+    calculate_period,
     calculate_power_of_one,
-    calculate_ratios,
-    calculate_working_capital,
     classify_cash_quality,
-    estimate_balance_sheet,
 )
 from src.ingest.account_mapper import AccountMapper
 from src.ingest.xml_parser import ERPXMLParser
@@ -93,9 +89,9 @@ class CashFlowStoryPipeline:
     def _run_calc_chain(self, mapped: MappedData) -> PeriodResult:
         """Run the full calculation chain on a single MappedData.
 
-        The chain merges the income-statement result with working-capital
-        fields, then feeds the merged result through balance sheet,
-        cash flow, and ratio calculators.
+        Delegates to ``calculate_period``, which merges the income-statement
+        result with working-capital fields, then feeds the merged result
+        through balance sheet, cash flow, and ratio calculators.
 
         Args:
             mapped: Mapped financial data for one period.
@@ -103,22 +99,7 @@ class CashFlowStoryPipeline:
         Returns:
             PeriodResult: Fully-calculated period result.
         """
-        is_result = calculate_income_statement(mapped)
-        wc_result = calculate_working_capital(mapped, days_in_period=mapped.days_in_period)
-
-        merged = is_result.model_copy(update={
-            "days_sales_outstanding": wc_result.days_sales_outstanding,
-            "days_inventory_outstanding": wc_result.days_inventory_outstanding,
-            "days_payable_outstanding": wc_result.days_payable_outstanding,
-            "cash_conversion_cycle": wc_result.cash_conversion_cycle,
-            "working_capital": wc_result.working_capital,
-            "working_capital_investment": wc_result.working_capital_investment,
-        })
-
-        bs_result = estimate_balance_sheet(merged)
-        cf_result = calculate_cash_flow(bs_result)
-        ratios_result = calculate_ratios(cf_result)
-        return ratios_result
+        return calculate_period(mapped)
 
     def run(
         self,
@@ -169,10 +150,7 @@ class CashFlowStoryPipeline:
                         raise FileNotFoundError(
                             f"No XML files found in directory: {input_p}"
                         )
-                    for xml_file in xml_files:
-                        parser = ERPXMLParser(str(xml_file))
-                        entries = parser.parse_balancete()
-                        all_entries.append(entries)
+                    all_entries.extend(ERPXMLParser.parse_many(xml_files).values())
                 elif input_p.is_file():
                     parser = ERPXMLParser(str(input_p))
                     entries = parser.parse_balancete()
@@ -3,8 +3,12 @@
 from src.utils.formatters import format_brl, format_days, format_percentage, movement_indicator
 from src.utils.logger import setup_logging
 from src.utils.validators import (
+    LazyMsg,
+    ValidationIssue,
+    validate_all,
     validate_balance_sheet,
     validate_cash_reconciliation,
+    validate_period,
     validate_period_data,
 )
 
@@ -15,6 +19,10 @@ __all__ = [
     "movement_indicator",
     "validate_balance_sheet",
     "validate_cash_reconciliation",
+    "validate_period",
     "validate_period_data",
+    "validate_all",
+    "ValidationIssue",
+    "LazyMsg",
     "setup_logging",
 ]
@@ -0,0 +1,121 @@
+"""Batch balance sheet validation for multi-period analytics runs."""
+
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+from src.models import PeriodResult
+from src.utils.validators import (
+    BALANCE_SHEET_FIELDS,
+    TOLERANCE_DIVISOR,
+    ValidationIssue,
+    cents_of,
+)
+
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+_NON_POSITIVE_ASSETS = int(ValidationIssue.NON_POSITIVE_ASSETS)
+_NON_POSITIVE_LIAB_EQUITY = int(ValidationIssue.NON_POSITIVE_LIAB_EQUITY)
+_BALANCE_IMBALANCE = int(ValidationIssue.BALANCE_IMBALANCE)
+_NEGATIVE_EQUITY = int(ValidationIssue.NEGATIVE_EQUITY)
+
+
+def periods_to_cents(period_results: Iterable[PeriodResult]) -> np.ndarray:
+    """
+    Pack balance sheet fields into an ``(n, 9)`` int64 array of cents.
+
+    Columns follow ``BALANCE_SHEET_FIELDS``: ar, inventory, total_debt,
+    net_debt, ppe_net, intangibles_net, other_capital_net,
+    shareholders_equity, accounts_payable.
+    """
+    rows = [cents_of(pr, BALANCE_SHEET_FIELDS) for pr in period_results]
+    return np.array(rows, dtype=np.int64).reshape(-1, len(BALANCE_SHEET_FIELDS))
+
+
+def _balance_sheet_flags_numpy(cents: np.ndarray) -> np.ndarray:
+    """Vectorized balance sheet check; one ``ValidationIssue`` mask per row."""
+    ar, inv, total_debt, net_debt, ppe, intangibles, other_cap, equity, ap = cents.T
+
+    total_assets = (
+        ar + inv + (total_debt - net_debt) + ppe + intangibles + np.maximum(other_cap, 0)
+    )
+    total_liab_equity = total_debt + equity + ap
+    diff = np.abs(total_assets - total_liab_equity)
+
+    flags = np.zeros(len(cents), dtype=np.uint8)
+    flags[total_assets <= 0] |= _NON_POSITIVE_ASSETS
+    flags[total_liab_equity <= 0] |= _NON_POSITIVE_LIAB_EQUITY
+    flags[
+        (total_assets > 0)
+        & (total_liab_equity > 0)
+        & (diff > total_assets // TOLERANCE_DIVISOR)
+    ] |= _BALANCE_IMBALANCE
+    flags[equity < 0] |= _NEGATIVE_EQUITY
+    return flags
+
+
+if _NUMBA_AVAILABLE:
+
+    def _balance_sheet_flags_kernel(cents: np.ndarray) -> np.ndarray:
+        """Row-parallel balance sheet check; compiled below with Numba."""
+        n = cents.shape[0]
+        out_flags = np.zeros(n, dtype=np.uint8)
+        for i in numba.prange(n):
+            other_cap = cents[i, 6]
+            total_assets = (
+                cents[i, 0] + cents[i, 1] + (cents[i, 2] - cents[i, 3])
+                + cents[i, 4] + cents[i, 5] + (other_cap if other_cap > 0 else 0)
+            )
+            total_liab_equity = cents[i, 2] + cents[i, 7] + cents[i, 8]
+            diff = abs(total_assets - total_liab_equity)
+
+            flags = 0
+            if total_assets <= 0:
+                flags |= _NON_POSITIVE_ASSETS
+            if total_liab_equity <= 0:
+                flags |= _NON_POSITIVE_LIAB_EQUITY
+            if (
+                total_assets > 0
+                and total_liab_equity > 0
+                and diff > total_assets // TOLERANCE_DIVISOR
+            ):
+                flags |= _BALANCE_IMBALANCE
+            if cents[i, 7] < 0:
+                flags |= _NEGATIVE_EQUITY
+            out_flags[i] = flags
+        return out_flags
+
+    # numba ships no type information; njit() is applied as a call rather
+    # than a decorator so the compiled kernel keeps the kernel's signature
+    _balance_sheet_flags_numba: Callable[[np.ndarray], np.ndarray] = numba.njit(
+        parallel=True, nogil=True, cache=True
+    )(_balance_sheet_flags_kernel)
+
+
+def validate_periods_batch(cents: np.ndarray) -> np.ndarray:
+    """
+    Validate the balance sheet equation for many periods at once.
+
+    Uses a parallel Numba kernel when numba is installed (``pip install
+    .[numba]``), otherwise a vectorized NumPy implementation. Both return
+    the same result.
+
+    Args:
+        cents: ``(n, 9)`` int64 array as produced by ``periods_to_cents``
+
+    Returns:
+        np.ndarray: uint8 array of ``ValidationIssue`` bitmasks, one per row;
+        a row is valid when it has no NON_POSITIVE_* bits set
+    """
+    cents = np.ascontiguousarray(cents, dtype=np.int64)
+    if cents.ndim != 2 or cents.shape[1] != len(BALANCE_SHEET_FIELDS):
+        raise ValueError(
+            f"Expected an (n, {len(BALANCE_SHEET_FIELDS)}) array, got shape {cents.shape}"
+        )
+    if _NUMBA_AVAILABLE:
+        return _balance_sheet_flags_numba(cents)
+    return _balance_sheet_flags_numpy(cents)
@@ -1,10 +1,231 @@
 """Structured logging setup using structlog."""
 
+import atexit
+import copy
+import functools
+import json
 import logging
 import logging.config
+import logging.handlers
+import os
+import queue
+from typing import Any, BinaryIO, cast
 
 import structlog
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+# dictConfig templates, built once at import. ``setup_logging`` deep-copies the
+# selected template and patches only the handler and root levels.
+# structlog renders the JSON itself, so the structured formatter passes the
+# message through untouched.
+_STRUCTURED_TEMPLATE: dict[str, Any] = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "structured": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "structured",
+            "stream": "ext://sys.stdout",
+        },
+    },
+    "root": {
+        "handlers": ["console"],
+    },
+}
+
+_STDLIB_TEMPLATE: dict[str, Any] = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "standard": {
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "standard",
+            "stream": "ext://sys.stdout",
+        },
+    },
+    "root": {
+        "handlers": ["console"],
+    },
+}
+
+_SHARED_PROCESSORS = (
+    structlog.stdlib.filter_by_level,
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.TimeStamper(fmt="iso", utc=True, key="ts"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+)
+
+_PROCESSORS_STRUCTURED = _SHARED_PROCESSORS + (structlog.processors.JSONRenderer(),)
+_PROCESSORS_DEV = _SHARED_PROCESSORS + (structlog.dev.ConsoleRenderer(),)
+
+
+def _dumps_bytes(obj: Any, **kwargs: Any) -> bytes:
+    """Serialize an event dict straight to bytes (orjson when installed)."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=kwargs.get("default"))
+    return json.dumps(obj, **kwargs).encode("utf-8")
+
+
+# The raw sink bypasses the stdlib logger, so the stdlib-only processors
+# (filter_by_level) are replaced by a level-filtering wrapper class.
+_PROCESSORS_RAW = (
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.TimeStamper(fmt="iso", utc=True, key="ts"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+    structlog.processors.JSONRenderer(serializer=_dumps_bytes),
+)
+
+
+class RawStdoutLogger:
+    """
+    structlog logger that writes rendered bytes to stdout with ``os.write``.
+
+    No Python-level buffering or text re-encoding: the JSON bytes produced by
+    the renderer go straight to file descriptor 1, one event per line.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+
+    def msg(self, message: bytes) -> None:
+        view = memoryview(message + b"\n")
+        while view:
+            view = view[os.write(1, view):]
+
+    log = debug = info = warning = warn = error = critical = exception = fatal = msg
+
+
+class RawStdoutLoggerFactory:
+    """Produce a ``RawStdoutLogger`` named after the requesting module."""
+
+    def __call__(self, *args: Any) -> RawStdoutLogger:
+        return RawStdoutLogger(args[0] if args else "")
+
+
+class BinaryFileHandler(logging.FileHandler):
+    """
+    FileHandler that writes UTF-8 bytes through a buffered binary stream.
+
+    Skips the text-mode wrapper: formatted records are encoded once, and
+    records whose ``msg`` is already bytes (e.g. orjson output) are written
+    as-is. Writes are not flushed per record: the 64 KiB buffer is flushed
+    when full, on ``close()``, and, when driven by ``setup_logging``'s file
+    writer, every time its queue runs empty. Records still buffered when the
+    process is killed (SIGKILL, hard crash) are lost.
+    """
+
+    buffer_size = 1 << 16
+
+    def __init__(self, filename: str, delay: bool = False) -> None:
+        super().__init__(filename, mode="ab", delay=delay)
+
+    def _open(self) -> Any:
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            if isinstance(record.msg, bytes) and not record.args:
+                data = record.msg
+            else:
+                data = self.format(record).encode("utf-8")
+            # _open() returns a binary stream; FileHandler types it as text
+            cast(BinaryIO, self.stream).write(data + b"\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _DrainFlushingListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs empty.
+
+    A burst of records shares one flush, and an idle writer never leaves
+    records sitting in the file handler's buffer.
+    """
+
+    def __init__(
+        self,
+        record_queue: queue.SimpleQueue[logging.LogRecord],
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ) -> None:
+        super().__init__(
+            record_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self._records = record_queue
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self._records.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+# Background writer for the optional log file; replaced on each setup_logging
+_file_listener: logging.handlers.QueueListener | None = None
+
+
+def _stop_file_listener() -> None:
+    """Flush queued records to the log file and stop the writer thread."""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
+atexit.register(_stop_file_listener)
+
+
+def _start_file_listener(log_file: str, level: int, fmt: str) -> logging.Handler:
+    """
+    Start a QueueListener that owns the file handler.
+
+    Returns the QueueHandler to attach to the root logger: the calling thread
+    only enqueues records, and the listener thread performs the disk writes
+    and flushes the file once the queue drains.
+    """
+    global _file_listener
+    _stop_file_listener()
+
+    file_handler = BinaryFileHandler(log_file)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(fmt))
+
+    record_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _file_listener = _DrainFlushingListener(
+        record_queue, file_handler, respect_handler_level=True
+    )
+    _file_listener.start()
+
+    queue_handler = logging.handlers.QueueHandler(record_queue)
+    queue_handler.setLevel(level)
+    return queue_handler
+
 
 def setup_logging(
     level: int = logging.INFO,
@@ -31,71 +252,59 @@ def setup_logging(
         logger = logging.getLogger(__name__)
         logger.info("Processing", extra={"stage": 1, "records": 100})
 
-    TODO: Configure logging.basicConfig
-    TODO: Setup structlog processors (JSON, pretty-print)
-    TODO: Configure console and file handlers
     TODO: Setup performance tracking
     TODO: Configure request correlation IDs
     """
+    template = _STRUCTURED_TEMPLATE if structured else _STDLIB_TEMPLATE
+    logging_config = copy.deepcopy(template)
+    formatter = "structured" if structured else "standard"
 
-    # Basic logging configuration
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            },
-            "structured": {
-                "()": structlog.processors.JSONRenderer,
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": level,
-                "formatter": "structured" if structured else "standard",
-                "stream": "ext://sys.stdout",
-            },
-        },
-        "root": {
-            "level": level,
-            "handlers": ["console"],
-        },
-    }
-
-    # Add file handler if specified
-    if log_file:
-        logging_config["handlers"]["file"] = {
-            "class": "logging.FileHandler",
-            "level": level,
-            "formatter": "structured" if structured else "standard",
-            "filename": log_file,
-        }
-        logging_config["root"]["handlers"].append("file")
+    logging_config["handlers"]["console"]["level"] = level
+    logging_config["root"]["level"] = level
 
     # Apply configuration
     logging.config.dictConfig(logging_config)
 
-    # Configure structlog
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if structured else structlog.dev.ConsoleRenderer(),
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
+    # File output goes through a queue so disk writes happen off the caller's
+    # thread; without a log file any previous writer is flushed and stopped.
+    if log_file:
+        fmt = logging_config["formatters"][formatter]["format"]
+        logging.getLogger().addHandler(_start_file_listener(log_file, level, fmt))
+    else:
+        _stop_file_listener()
+
+    # Configure structlog. Structured console-only output skips the stdlib
+    # handler chain and writes rendered bytes directly to stdout.
+    if structured and not log_file:
+        structlog.configure(
+            processors=_PROCESSORS_RAW,
+            wrapper_class=structlog.make_filtering_bound_logger(level),
+            context_class=dict,
+            logger_factory=RawStdoutLoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
+    else:
+        structlog.configure(
+            processors=_PROCESSORS_STRUCTURED if structured else _PROCESSORS_DEV,
+            wrapper_class=structlog.stdlib.BoundLogger,
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
+
+    # Loggers handed out before this call were bound to the old configuration
+    reset_logger_cache()
 
 
+@functools.cache
 def get_logger(name: str):
-    """Return a structlog bound logger for the given module name."""
+    """Return a structlog bound logger for the given module name.
+
+    Memoized per name: loggers are immutable once structlog is configured.
+    """
     return structlog.get_logger(name)
+
+
+def reset_logger_cache() -> None:
+    """Drop memoized loggers (after reconfiguration or in test teardown)."""
+    get_logger.cache_clear()
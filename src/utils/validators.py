@@ -1,97 +1,279 @@
-"""Data validation functions."""
+"""Data validation functions.
 
-from decimal import Decimal
+Written to compile cleanly with mypyc (``make compile``): annotations are
+concrete and the checks use plain int arithmetic. The pure-Python module is
+used whenever no compiled extension is present.
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from enum import IntFlag
 
 from src.models import MappedData, PeriodResult
 
-_TOLERANCE = Decimal("0.01")  # 1% tolerance for balance sheet equation
+TOLERANCE_DIVISOR = 100  # 1% tolerance for balance sheet equation
+
+
+def _to_cents(value: Decimal) -> int:
+    """Convert a monetary Decimal to integer cents (banker's rounding)."""
+    return int(value.scaleb(2).to_integral_value(ROUND_HALF_EVEN))
+
 
+def _from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a 2-dp Decimal for message formatting."""
+    return Decimal(cents).scaleb(-2)
 
-def validate_balance_sheet(period_result: PeriodResult) -> tuple[bool, list[str]]:
+
+class LazyMsg:
     """
-    Validate balance sheet equation: Assets = Liabilities + Equity.
+    Validation message whose amounts are formatted only when rendered.
 
-    Derives cash from net_debt = total_debt - cash, so cash = total_debt - net_debt.
+    Holds a ``str.format`` template plus integer-cent amounts; Decimal
+    reconstruction and ``:,.2f`` formatting run on ``str()``, so callers
+    that only check ``is_valid`` never pay for them. Compares and hashes
+    like its rendered string.
     """
-    messages: list[str] = []
-    is_valid = True
+
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args: int) -> None:
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*[_from_cents(c) for c in self.args])
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, LazyMsg)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+# Validator messages: plain strings, plus LazyMsg for warnings that carry
+# amounts. Call str() on each message to get its text.
+Messages = list[str | LazyMsg]
+
+
+BALANCE_SHEET_FIELDS = (
+    "accounts_receivable",
+    "inventory",
+    "total_debt",
+    "net_debt",
+    "ppe_net",
+    "intangibles_net",
+    "other_capital_net",
+    "shareholders_equity",
+    "accounts_payable",
+)
+
+_CASH_FLOW_FIELDS = (
+    "operating_cash_flow",
+    "investing_cash_flow",
+    "financing_cash_flow",
+    "net_cash_flow",
+)
+
+
+def cents_of(period_result: PeriodResult, fields: tuple[str, ...]) -> list[int]:
+    """Read ``fields`` from ``period_result`` once, as integer cents."""
+    return [_to_cents(getattr(period_result, name)) for name in fields]
+
+
+class ValidationIssue(IntFlag):
+    """
+    Bitmask of balance sheet and cash reconciliation findings.
+
+    Bit order matches the order messages are reported in. Error bits make a
+    period invalid; the remaining bits are warnings.
+    """
+
+    NONE = 0
+    NON_POSITIVE_ASSETS = 1
+    NON_POSITIVE_LIAB_EQUITY = 2
+    BALANCE_IMBALANCE = 4
+    NEGATIVE_EQUITY = 8
+    CASH_UNRECONCILED = 16
+
+
+# Plain-int copies for the fast paths: OR-ing ints avoids the enum machinery
+# that IntFlag operators go through on every check. Wrap a fast-path mask in
+# ``ValidationIssue(...)`` to inspect it by name.
+_ERROR_ISSUES = int(
+    ValidationIssue.NON_POSITIVE_ASSETS
+    | ValidationIssue.NON_POSITIVE_LIAB_EQUITY
+    | ValidationIssue.CASH_UNRECONCILED
+)
+_NON_POSITIVE_ASSETS = int(ValidationIssue.NON_POSITIVE_ASSETS)
+_NON_POSITIVE_LIAB_EQUITY = int(ValidationIssue.NON_POSITIVE_LIAB_EQUITY)
+_BALANCE_IMBALANCE = int(ValidationIssue.BALANCE_IMBALANCE)
+_NEGATIVE_EQUITY = int(ValidationIssue.NEGATIVE_EQUITY)
+_CASH_UNRECONCILED = int(ValidationIssue.CASH_UNRECONCILED)
+
+# Messages for issues that carry no amounts
+_ISSUE_MESSAGES: dict[int, str] = {
+    _NON_POSITIVE_ASSETS: "Error: Total assets must be positive",
+    _NON_POSITIVE_LIAB_EQUITY: "Error: Total liabilities + equity must be positive",
+    _NEGATIVE_EQUITY: "Warning: Negative shareholders equity — possible insolvency",
+}
+
+# Templates for issues whose message reports amounts (filled from cents)
+_ISSUE_TEMPLATES: dict[int, str] = {
+    _BALANCE_IMBALANCE: (
+        "Warning: Balance sheet imbalance of R${:,.2f} "
+        "(Assets={:,.2f}, L+E={:,.2f})"
+    ),
+    _CASH_UNRECONCILED: (
+        "Warning: Cash flow reconciliation difference of R${:,.2f} "
+        "(Computed={:,.2f}, Stored={:,.2f})"
+    ),
+}
+
+
+def _issue_messages(issues: int, amounts: dict[int, tuple[int, ...]]) -> Messages:
+    """Translate an issue bitmask into messages, in bit order."""
+    messages: Messages = []
+    bit = 1
+    while bit <= issues:
+        if issues & bit:
+            if bit in _ISSUE_TEMPLATES:
+                messages.append(LazyMsg(_ISSUE_TEMPLATES[bit], *amounts[bit]))
+            else:
+                messages.append(_ISSUE_MESSAGES[bit])
+        bit <<= 1
+    return messages
+
+
+def _validate_balance_sheet_fast(
+    accounts_receivable: int,
+    inventory: int,
+    total_debt: int,
+    net_debt: int,
+    ppe_net: int,
+    intangibles_net: int,
+    other_capital_net: int,
+    shareholders_equity: int,
+    accounts_payable: int,
+) -> tuple[bool, int, tuple[int, int, int]]:
+    """
+    Balance sheet equation on pre-extracted integer-cent values.
+
+    Returns ``(is_valid, issues, (diff, total_assets, total_liab_equity))``;
+    a clean period costs a handful of int comparisons and no allocation
+    beyond the result tuple.
+    """
+    issues = 0
 
     # Derive cash: net_debt = total_debt - cash => cash = total_debt - net_debt
-    cash = period_result.total_debt - period_result.net_debt
+    cash = total_debt - net_debt
 
-    # Estimated total assets
+    # Estimated total assets (only net other-capital assets count)
     total_assets = (
-        period_result.accounts_receivable
-        + period_result.inventory
+        accounts_receivable
+        + inventory
         + cash
-        + period_result.ppe_net
-        + period_result.intangibles_net
-        + max(Decimal("0"), period_result.other_capital_net)
+        + ppe_net
+        + intangibles_net
+        + (other_capital_net if other_capital_net > 0 else 0)
     )
 
     # Estimated total liabilities + equity
-    total_liab_equity = (
-        period_result.total_debt
-        + period_result.shareholders_equity
-        + period_result.accounts_payable
-    )
+    total_liab_equity = total_debt + shareholders_equity + accounts_payable
+
+    diff = abs(total_assets - total_liab_equity)
 
     if total_assets <= 0:
-        messages.append("Error: Total assets must be positive")
-        is_valid = False
+        issues |= _NON_POSITIVE_ASSETS
 
     if total_liab_equity <= 0:
-        messages.append("Error: Total liabilities + equity must be positive")
-        is_valid = False
+        issues |= _NON_POSITIVE_LIAB_EQUITY
 
-    if total_assets > 0 and total_liab_equity > 0:
-        diff = abs(total_assets - total_liab_equity)
-        tolerance_amt = total_assets * _TOLERANCE
-        if diff > tolerance_amt:
-            messages.append(
-                f"Warning: Balance sheet imbalance of R${diff:,.2f} "
-                f"(Assets={total_assets:,.2f}, L+E={total_liab_equity:,.2f})"
-            )
+    if (
+        total_assets > 0
+        and total_liab_equity > 0
+        and diff > total_assets // TOLERANCE_DIVISOR
+    ):
+        issues |= _BALANCE_IMBALANCE
 
-    if period_result.shareholders_equity < 0:
-        messages.append("Warning: Negative shareholders equity — possible insolvency")
+    if shareholders_equity < 0:
+        issues |= _NEGATIVE_EQUITY
 
-    return is_valid, messages
+    return not issues & _ERROR_ISSUES, issues, (diff, total_assets, total_liab_equity)
 
 
-def validate_cash_reconciliation(period_result: PeriodResult) -> tuple[bool, list[str]]:
+def _validate_cash_reconciliation_fast(
+    operating_cash_flow: int,
+    investing_cash_flow: int,
+    financing_cash_flow: int,
+    net_cash_flow: int,
+) -> tuple[bool, int, tuple[int, int, int]]:
     """
-    Validate that OCF + ICF + financing = net_cash_flow.
+    Cash flow reconciliation on pre-extracted integer-cent values.
+
+    Returns ``(is_valid, issues, (diff, computed, stored))``.
     """
-    messages: list[str] = []
+    # Nothing to reconcile against when no net cash flow is stored (this also
+    # covers periods with no cash flows populated); skip before any arithmetic.
+    if net_cash_flow == 0:
+        return True, 0, (0, 0, 0)
 
-    # If no cash flows populated, skip
-    if (period_result.operating_cash_flow == 0
-            and period_result.investing_cash_flow == 0
-            and period_result.financing_cash_flow == 0
-            and period_result.net_cash_flow == 0):
-        return True, messages
-
-    calc_net = (
-        period_result.operating_cash_flow
-        + period_result.investing_cash_flow
-        + period_result.financing_cash_flow
-    )
+    calc_net = operating_cash_flow + investing_cash_flow + financing_cash_flow
+
+    diff = abs(calc_net - net_cash_flow)
+
+    if diff > abs(net_cash_flow) // TOLERANCE_DIVISOR:
+        return False, _CASH_UNRECONCILED, (diff, calc_net, net_cash_flow)
+
+    return True, 0, (diff, calc_net, net_cash_flow)
+
+
+def _check_balance_sheet(*cents: int) -> tuple[bool, Messages]:
+    """Balance sheet check with messages materialized from the bitmask."""
+    is_valid, issues, amounts = _validate_balance_sheet_fast(*cents)
+    if not issues:
+        return is_valid, []
+    return is_valid, _issue_messages(issues, {_BALANCE_IMBALANCE: amounts})
+
+
+def _check_cash_reconciliation(*cents: int) -> tuple[bool, Messages]:
+    """Cash reconciliation check with messages materialized from the bitmask."""
+    is_valid, issues, amounts = _validate_cash_reconciliation_fast(*cents)
+    if not issues:
+        return is_valid, []
+    return is_valid, _issue_messages(issues, {_CASH_UNRECONCILED: amounts})
+
+
+def validate_balance_sheet(period_result: PeriodResult) -> tuple[bool, Messages]:
+    """
+    Validate balance sheet equation: Assets = Liabilities + Equity.
 
-    diff = abs(calc_net - period_result.net_cash_flow)
+    Derives cash from net_debt = total_debt - cash, so cash = total_debt - net_debt.
+    Arithmetic runs on integer cents; Decimal is only reconstructed when a
+    warning message needs formatting.
 
-    if period_result.net_cash_flow == 0:
-        return True, messages
+    Returns:
+        tuple[bool, Messages]: validity and messages. Imbalance warnings are
+        ``LazyMsg`` objects, not ``str``: they compare equal to their text,
+        but call ``str(m)`` before using string methods or serializing them.
+    """
+    return _check_balance_sheet(*cents_of(period_result, BALANCE_SHEET_FIELDS))
 
-    tolerance_amt = abs(period_result.net_cash_flow) * _TOLERANCE
-    if diff > tolerance_amt:
-        messages.append(
-            f"Warning: Cash flow reconciliation difference of R${diff:,.2f} "
-            f"(Computed={calc_net:,.2f}, Stored={period_result.net_cash_flow:,.2f})"
-        )
-        return False, messages
 
-    return True, messages
+def validate_cash_reconciliation(period_result: PeriodResult) -> tuple[bool, Messages]:
+    """
+    Validate that OCF + ICF + financing = net_cash_flow.
+
+    Returns:
+        tuple[bool, Messages]: validity and messages. The unreconciled-cash
+        warning is a ``LazyMsg``; call ``str(m)`` to get its text.
+    """
+    return _check_cash_reconciliation(*cents_of(period_result, _CASH_FLOW_FIELDS))
 
 
 def validate_period_data(mapped: MappedData) -> tuple[bool, list[str]]:
@@ -132,3 +314,35 @@ def validate_period_data(mapped: MappedData) -> tuple[bool, list[str]]:
         is_valid = False
 
     return is_valid, messages
+
+
+def validate_period(period_result: PeriodResult) -> tuple[bool, Messages]:
+    """
+    Run the balance sheet and cash reconciliation checks in one pass.
+
+    Every PeriodResult field both checks use is read once up front, so this
+    avoids re-reading the model per validator. Messages are returned in
+    validator order; amount-bearing warnings are ``LazyMsg`` objects, so
+    call ``str(m)`` on each message to get its text.
+    """
+    cents = cents_of(period_result, BALANCE_SHEET_FIELDS + _CASH_FLOW_FIELDS)
+    split = len(BALANCE_SHEET_FIELDS)
+
+    bs_valid, bs_messages = _check_balance_sheet(*cents[:split])
+    cf_valid, cf_messages = _check_cash_reconciliation(*cents[split:])
+    return bs_valid and cf_valid, bs_messages + cf_messages
+
+
+def validate_all(
+    period_result: PeriodResult,
+    mapped: MappedData,
+) -> tuple[bool, Messages]:
+    """
+    Run ``validate_period`` and ``validate_period_data`` together.
+
+    Messages are returned in validator order: balance sheet, cash
+    reconciliation, then period data.
+    """
+    period_valid, period_messages = validate_period(period_result)
+    pd_valid, pd_messages = validate_period_data(mapped)
+    return period_valid and pd_valid, period_messages + pd_messages
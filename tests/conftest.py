@@ -2,11 +2,49 @@
 import pytest
 from decimal import Decimal
 from datetime import date
-from typing import Dict, Any
+from types import MappingProxyType
+from collections.abc import Mapping
+from typing import Any
 
+from src.ingest.account_mapper import AccountMapper
+from src.ingest.xml_parser import ERPXMLParser
+from src.models import AccountEntry, CashQualityMetric, MappedData, PeriodResult, PowerOfOneLever
+from src.calc.chain import calculate_period
+from src.calc.cash_quality import classify_cash_quality
+from src.calc.power_of_one import calculate_power_of_one
 
-@pytest.fixture
-def sample_mapped_data_q1() -> Dict[str, Any]:
+
+def _dec(units: int, places: int = 2) -> Decimal:
+    """Build a Decimal from integer units, skipping string parsing.
+
+    ``_dec(120000000)`` is ``Decimal('1200000.00')``; ``_dec(2360, 4)`` is
+    ``Decimal('0.2360')``. Exponents match the string form exactly.
+    """
+    return Decimal(units).scaleb(-places)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType views.
+
+    Session-scoped fixtures are shared by every test, so an accidental
+    mutation must fail loudly instead of leaking into later tests.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+@pytest.fixture(scope="session", autouse=True)
+def config_cache_dir(tmp_path_factory):
+    """Send AccountMapper's parsed-config sidecars to a temp dir, not ~/.cache."""
+    cache_dir = tmp_path_factory.mktemp("config-cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CASHFLOW_CACHE_DIR", str(cache_dir))
+        yield cache_dir
+
+
+@pytest.fixture(scope="session")
+def sample_mapped_data_q1() -> Mapping[str, Any]:
     """
     Q1 2025 AUSTA financial data.
     
@@ -15,7 +53,7 @@ def sample_mapped_data_q1() -> Dict[str, Any]:
     AR: R$18.5M
     Cash: R$2.9M → R$1.2M (deterioration)
     """
-    return {
+    return _freeze({
         'period': 'Q1_2025',
         'period_start': date(2025, 1, 1),
         'period_end': date(2025, 3, 31),
@@ -25,63 +63,63 @@ def sample_mapped_data_q1() -> Dict[str, Any]:
         },
         'balance_sheet': {
             'current_assets': {
-                'cash': Decimal('1200000.00'),  # R$1.2M (end of period)
-                'cash_beginning': Decimal('2900000.00'),  # R$2.9M (beginning)
-                'accounts_receivable': Decimal('18500000.00'),  # R$18.5M
-                'inventory': Decimal('3200000.00'),  # R$3.2M
+                'cash': _dec(120000000),  # R$1.2M (end of period)
+                'cash_beginning': _dec(290000000),  # R$2.9M (beginning)
+                'accounts_receivable': _dec(1850000000),  # R$18.5M
+                'inventory': _dec(320000000),  # R$3.2M
             },
             'fixed_assets': {
-                'ppe': Decimal('45000000.00'),  # R$45M (Imobilizado)
+                'ppe': _dec(4500000000),  # R$45M (Imobilizado)
             },
             'current_liabilities': {
-                'accounts_payable': Decimal('8900000.00'),  # R$8.9M
-                'short_term_debt': Decimal('12000000.00'),  # R$12M
+                'accounts_payable': _dec(890000000),  # R$8.9M
+                'short_term_debt': _dec(1200000000),  # R$12M
             },
             'long_term_liabilities': {
-                'long_term_debt': Decimal('25000000.00'),  # R$25M
+                'long_term_debt': _dec(2500000000),  # R$25M
             },
             'equity': {
-                'patrimonio_liquido': Decimal('35000000.00'),  # R$35M
+                'patrimonio_liquido': _dec(3500000000),  # R$35M
             },
         },
         'income_statement': {
-            'revenue': Decimal('40100000.00'),  # R$40.1M
-            'deductions': Decimal('2500000.00'),  # R$2.5M (ICMS, ISS, PIS, COFINS)
-            'financial_income': Decimal('150000.00'),  # R$150K
-            'cogs': Decimal('30650000.00'),  # R$30.65M (from 4.1 Custos R$22.4M + reclassified R$8.25M)
-            'operating_expenses': Decimal('19650000.00'),  # R$19.65M (from 4.2 excluding reclassified)
-            'financial_expenses': Decimal('1200000.00'),  # R$1.2M
+            'revenue': _dec(4010000000),  # R$40.1M
+            'deductions': _dec(250000000),  # R$2.5M (ICMS, ISS, PIS, COFINS)
+            'financial_income': _dec(15000000),  # R$150K
+            'cogs': _dec(3065000000),  # R$30.65M (from 4.1 Custos R$22.4M + reclassified R$8.25M)
+            'operating_expenses': _dec(1965000000),  # R$19.65M (from 4.2 excluding reclassified)
+            'financial_expenses': _dec(120000000),  # R$1.2M
         },
         'mapped_accounts': {
-            '1.1.01': {'description': 'Caixa', 'value': Decimal('1200000.00')},
-            '1.1.03': {'description': 'Contas a Receber', 'value': Decimal('18500000.00')},
-            '1.1.04': {'description': 'Estoque', 'value': Decimal('3200000.00')},
-            '1.2.03': {'description': 'Imobilizado', 'value': Decimal('45000000.00')},
-            '2.1.01': {'description': 'Fornecedores', 'value': Decimal('8900000.00')},
-            '2.1.02': {'description': 'Empréstimos CP', 'value': Decimal('12000000.00')},
-            '2.2.01': {'description': 'Empréstimos LP', 'value': Decimal('25000000.00')},
-            '2.3': {'description': 'Patrimônio Líquido', 'value': Decimal('35000000.00')},
-            '3.1': {'description': 'Receita', 'value': Decimal('40100000.00')},
-            '3.2': {'description': 'Deduções', 'value': Decimal('2500000.00')},
-            '3.3': {'description': 'Receitas Financeiras', 'value': Decimal('150000.00')},
-            '4.1': {'description': 'Custos', 'value': Decimal('22400000.00')},
-            '4.2': {'description': 'Despesas Operacionais', 'value': Decimal('19650000.00')},
-            '4.2.01': {'description': 'Pessoal e Serviços', 'value': Decimal('6500000.00')},
-            '4.2.02': {'description': 'Materiais e Serviços', 'value': Decimal('1750000.00')},
-            '4.3': {'description': 'Despesas Financeiras', 'value': Decimal('1200000.00')},
+            '1.1.01': {'description': 'Caixa', 'value': _dec(120000000)},
+            '1.1.03': {'description': 'Contas a Receber', 'value': _dec(1850000000)},
+            '1.1.04': {'description': 'Estoque', 'value': _dec(320000000)},
+            '1.2.03': {'description': 'Imobilizado', 'value': _dec(4500000000)},
+            '2.1.01': {'description': 'Fornecedores', 'value': _dec(890000000)},
+            '2.1.02': {'description': 'Empréstimos CP', 'value': _dec(1200000000)},
+            '2.2.01': {'description': 'Empréstimos LP', 'value': _dec(2500000000)},
+            '2.3': {'description': 'Patrimônio Líquido', 'value': _dec(3500000000)},
+            '3.1': {'description': 'Receita', 'value': _dec(4010000000)},
+            '3.2': {'description': 'Deduções', 'value': _dec(250000000)},
+            '3.3': {'description': 'Receitas Financeiras', 'value': _dec(15000000)},
+            '4.1': {'description': 'Custos', 'value': _dec(2240000000)},
+            '4.2': {'description': 'Despesas Operacionais', 'value': _dec(1965000000)},
+            '4.2.01': {'description': 'Pessoal e Serviços', 'value': _dec(650000000)},
+            '4.2.02': {'description': 'Materiais e Serviços', 'value': _dec(175000000)},
+            '4.3': {'description': 'Despesas Financeiras', 'value': _dec(120000000)},
         },
-    }
+    })
 
 
-@pytest.fixture
-def sample_mapped_data_q2() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_mapped_data_q2() -> Mapping[str, Any]:
     """
     Q2 2025 AUSTA financial data.
     
     Revenue: R$42.5M
     Shows severe cash deterioration to R$394K
     """
-    return {
+    return _freeze({
         'period': 'Q2_2025',
         'period_start': date(2025, 4, 1),
         'period_end': date(2025, 6, 30),
@@ -91,56 +129,56 @@ def sample_mapped_data_q2() -> Dict[str, Any]:
         },
         'balance_sheet': {
             'current_assets': {
-                'cash': Decimal('394000.00'),  # R$394K (critical level)
-                'cash_beginning': Decimal('1200000.00'),  # R$1.2M (from Q1)
-                'accounts_receivable': Decimal('19800000.00'),  # R$19.8M (increase)
-                'inventory': Decimal('3500000.00'),  # R$3.5M (slight increase)
+                'cash': _dec(39400000),  # R$394K (critical level)
+                'cash_beginning': _dec(120000000),  # R$1.2M (from Q1)
+                'accounts_receivable': _dec(1980000000),  # R$19.8M (increase)
+                'inventory': _dec(350000000),  # R$3.5M (slight increase)
             },
             'fixed_assets': {
-                'ppe': Decimal('45000000.00'),  # R$45M (unchanged)
+                'ppe': _dec(4500000000),  # R$45M (unchanged)
             },
             'current_liabilities': {
-                'accounts_payable': Decimal('9200000.00'),  # R$9.2M (increase)
-                'short_term_debt': Decimal('12500000.00'),  # R$12.5M (increase)
+                'accounts_payable': _dec(920000000),  # R$9.2M (increase)
+                'short_term_debt': _dec(1250000000),  # R$12.5M (increase)
             },
             'long_term_liabilities': {
-                'long_term_debt': Decimal('25000000.00'),  # R$25M (unchanged)
+                'long_term_debt': _dec(2500000000),  # R$25M (unchanged)
             },
             'equity': {
-                'patrimonio_liquido': Decimal('35900000.00'),  # R$35.9M (increased by Q2 profit)
+                'patrimonio_liquido': _dec(3590000000),  # R$35.9M (increased by Q2 profit)
             },
         },
         'income_statement': {
-            'revenue': Decimal('42500000.00'),  # R$42.5M
-            'deductions': Decimal('2650000.00'),  # R$2.65M
-            'financial_income': Decimal('175000.00'),  # R$175K
-            'cogs': Decimal('31875000.00'),  # R$31.875M
-            'operating_expenses': Decimal('20500000.00'),  # R$20.5M
-            'financial_expenses': Decimal('1400000.00'),  # R$1.4M
+            'revenue': _dec(4250000000),  # R$42.5M
+            'deductions': _dec(265000000),  # R$2.65M
+            'financial_income': _dec(17500000),  # R$175K
+            'cogs': _dec(3187500000),  # R$31.875M
+            'operating_expenses': _dec(2050000000),  # R$20.5M
+            'financial_expenses': _dec(140000000),  # R$1.4M
         },
         'mapped_accounts': {
-            '1.1.01': {'description': 'Caixa', 'value': Decimal('394000.00')},
-            '1.1.03': {'description': 'Contas a Receber', 'value': Decimal('19800000.00')},
-            '1.1.04': {'description': 'Estoque', 'value': Decimal('3500000.00')},
-            '1.2.03': {'description': 'Imobilizado', 'value': Decimal('45000000.00')},
-            '2.1.01': {'description': 'Fornecedores', 'value': Decimal('9200000.00')},
-            '2.1.02': {'description': 'Empréstimos CP', 'value': Decimal('12500000.00')},
-            '2.2.01': {'description': 'Empréstimos LP', 'value': Decimal('25000000.00')},
-            '2.3': {'description': 'Patrimônio Líquido', 'value': Decimal('35900000.00')},
-            '3.1': {'description': 'Receita', 'value': Decimal('42500000.00')},
-            '3.2': {'description': 'Deduções', 'value': Decimal('2650000.00')},
-            '3.3': {'description': 'Receitas Financeiras', 'value': Decimal('175000.00')},
-            '4.1': {'description': 'Custos', 'value': Decimal('23625000.00')},
-            '4.2': {'description': 'Despesas Operacionais', 'value': Decimal('20500000.00')},
-            '4.3': {'description': 'Despesas Financeiras', 'value': Decimal('1400000.00')},
+            '1.1.01': {'description': 'Caixa', 'value': _dec(39400000)},
+            '1.1.03': {'description': 'Contas a Receber', 'value': _dec(1980000000)},
+            '1.1.04': {'description': 'Estoque', 'value': _dec(350000000)},
+            '1.2.03': {'description': 'Imobilizado', 'value': _dec(4500000000)},
+            '2.1.01': {'description': 'Fornecedores', 'value': _dec(920000000)},
+            '2.1.02': {'description': 'Empréstimos CP', 'value': _dec(1250000000)},
+            '2.2.01': {'description': 'Empréstimos LP', 'value': _dec(2500000000)},
+            '2.3': {'description': 'Patrimônio Líquido', 'value': _dec(3590000000)},
+            '3.1': {'description': 'Receita', 'value': _dec(4250000000)},
+            '3.2': {'description': 'Deduções', 'value': _dec(265000000)},
+            '3.3': {'description': 'Receitas Financeiras', 'value': _dec(17500000)},
+            '4.1': {'description': 'Custos', 'value': _dec(2362500000)},
+            '4.2': {'description': 'Despesas Operacionais', 'value': _dec(2050000000)},
+            '4.3': {'description': 'Despesas Financeiras', 'value': _dec(140000000)},
         },
-    }
+    })
 
 
-@pytest.fixture
-def sample_period_result() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_period_result() -> Mapping[str, Any]:
     """Pre-calculated PeriodResult for downstream testing."""
-    return {
+    return _freeze({
         'period': 'Q1_2025',
         'period_start': date(2025, 1, 1),
         'period_end': date(2025, 3, 31),
@@ -150,44 +188,93 @@ def sample_period_result() -> Dict[str, Any]:
         },
         'metrics': {
             'profitability': {
-                'gross_margin': Decimal('0.2360'),  # (40.1M - 30.65M) / 40.1M
-                'operating_margin': Decimal('0.0140'),
-                'net_margin': Decimal('-0.0070'),
+                'gross_margin': _dec(2360, 4),  # (40.1M - 30.65M) / 40.1M
+                'operating_margin': _dec(140, 4),
+                'net_margin': _dec(-70, 4),
             },
             'liquidity': {
-                'current_ratio': Decimal('1.1234'),  # Current assets / Current liabilities
-                'quick_ratio': Decimal('1.0534'),
-                'cash_ratio': Decimal('0.0485'),
+                'current_ratio': _dec(11234, 4),  # Current assets / Current liabilities
+                'quick_ratio': _dec(10534, 4),
+                'cash_ratio': _dec(485, 4),
             },
             'efficiency': {
-                'asset_turnover': Decimal('0.8500'),
-                'inventory_turnover': Decimal('9.5781'),
-                'days_inventory': Decimal('38.06'),
-                'days_sales_outstanding': Decimal('168.38'),
-                'days_payable_outstanding': Decimal('133.27'),
+                'asset_turnover': _dec(8500, 4),
+                'inventory_turnover': _dec(95781, 4),
+                'days_inventory': _dec(3806),
+                'days_sales_outstanding': _dec(16838),
+                'days_payable_outstanding': _dec(13327),
             },
             'leverage': {
-                'debt_to_equity': Decimal('1.0557'),
-                'debt_to_assets': Decimal('0.5140'),
-                'equity_ratio': Decimal('0.4860'),
+                'debt_to_equity': _dec(10557, 4),
+                'debt_to_assets': _dec(5140, 4),
+                'equity_ratio': _dec(4860, 4),
             },
         },
         'cash_flow': {
-            'beginning_cash': Decimal('2900000.00'),
-            'ending_cash': Decimal('1200000.00'),
-            'cash_change': Decimal('-1700000.00'),
-            'operating_cash_flow': Decimal('1500000.00'),
-            'investing_cash_flow': Decimal('-500000.00'),
-            'financing_cash_flow': Decimal('-2700000.00'),
+            'beginning_cash': _dec(290000000),
+            'ending_cash': _dec(120000000),
+            'cash_change': _dec(-170000000),
+            'operating_cash_flow': _dec(150000000),
+            'investing_cash_flow': _dec(-50000000),
+            'financing_cash_flow': _dec(-270000000),
         },
         'tax_calculations': {
-            'irpj_base': Decimal('281500.00'),
-            'irpj_rate': Decimal('0.15'),
-            'irpj_standard': Decimal('42225.00'),
-            'irpj_surcharge': Decimal('0.00'),
-            'irpj_total': Decimal('42225.00'),
-            'csll_base': Decimal('281500.00'),
-            'csll_rate': Decimal('0.09'),
-            'csll_total': Decimal('25335.00'),
+            'irpj_base': _dec(28150000),
+            'irpj_rate': _dec(15),
+            'irpj_standard': _dec(4222500),
+            'irpj_surcharge': _dec(0),
+            'irpj_total': _dec(4222500),
+            'csll_base': _dec(28150000),
+            'csll_rate': _dec(9),
+            'csll_total': _dec(2533500),
         },
-    }
+    })
+
+
+# AUSTA Q1 2025 calc-chain input. MappedData is frozen, so one instance is
+# built at import and shared.
+_AUSTA_Q1_MAPPED = MappedData(
+    company='AUSTA', period='Q1_2025', period_type='quarter', days_in_period=91,
+    gross_revenue=Decimal('40100000'), returns_deductions=Decimal('2500000'),
+    cogs=Decimal('30650000'), operating_expenses=Decimal('19650000'),
+    financial_expenses=Decimal('1200000'), financial_income=Decimal('150000'),
+    accounts_receivable=Decimal('18500000'), inventory=Decimal('3200000'),
+    accounts_payable=Decimal('8900000'), cash=Decimal('1200000'),
+    short_term_debt=Decimal('12000000'), long_term_debt=Decimal('25000000'),
+    shareholders_equity=Decimal('35000000'), ppe_gross=Decimal('45000000'),
+)
+
+
+@pytest.fixture(scope="session")
+def austa_q1_result() -> PeriodResult:
+    """
+    AUSTA Q1 2025 PeriodResult run once through the full calc chain.
+
+    The chain is deterministic in its MappedData input, so one result is
+    shared by the whole session. Tests must treat it as read-only.
+    """
+    return calculate_period(_AUSTA_Q1_MAPPED)
+
+
+@pytest.fixture(scope="session")
+def austa_q1_metrics(austa_q1_result: PeriodResult) -> tuple[CashQualityMetric, ...]:
+    """Cash quality metrics for ``austa_q1_result``, classified once per session."""
+    return tuple(classify_cash_quality(austa_q1_result))
+
+
+@pytest.fixture(scope="session")
+def austa_q1_levers(austa_q1_result: PeriodResult) -> tuple[PowerOfOneLever, ...]:
+    """Power of One levers for ``austa_q1_result``, calculated once per session."""
+    return tuple(calculate_power_of_one(austa_q1_result))
+
+
+@pytest.fixture(scope="session")
+def mapper() -> AccountMapper:
+    """One AUSTA AccountMapper for the session; tests only read from it."""
+    return AccountMapper("config/companies/austa.yaml")
+
+
+@pytest.fixture(scope="session")
+def xml_entries() -> list[AccountEntry]:
+    """sample_balancete.xml parsed once; map_accounts never mutates entries."""
+    return ERPXMLParser("tests/fixtures/sample_balancete.xml").parse_balancete()
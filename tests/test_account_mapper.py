@@ -4,12 +4,23 @@ Covers config loading, account-to-category mapping, reclassifications,
 exclusions, edge cases, and an end-to-end integration with the XML parser.
 """
 
+import hashlib
+import json
+import os
+
 import pytest
 from decimal import Decimal
 
-from src.ingest.account_mapper import AccountMapper
+from pydantic import ValidationError
+
+from src.ingest import account_mapper
+from src.ingest.account_mapper import AccountMapper, _config_cache_path, _load_config_cached
 from src.models import AccountEntry, MappedData
 
+# Under `--dist loadgroup` this module stays on one worker so the session
+# mapper and xml_entries fixtures are built once.
+pytestmark = pytest.mark.xdist_group("account_mapper")
+
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -18,6 +29,23 @@ from src.models import AccountEntry, MappedData
 CONFIG_PATH = "config/companies/austa.yaml"
 MISSING_CONFIG = "/nonexistent/config.yaml"
 
+# Shared amounts (Decimal is immutable, so one instance serves every test)
+D_ZERO = Decimal("0")
+D_1M = Decimal("1000000")
+D_500K = Decimal("500000")
+D_NEG_100K = Decimal("-100000")
+D_NEG_400K = Decimal("-400000")
+D_NEG_500K = Decimal("-500000")
+
+# sample_balancete.xml amounts reused across unit and end-to-end tests
+CPV_DIRECT = Decimal("-22400000")  # 4.1
+PESSOAL_RECLASS = Decimal("-6500000")  # 4.2.01 -> cogs
+MATERIAIS_RECLASS = Decimal("-1750000")  # 4.2.02 -> cogs
+OPEX_VENDAS = Decimal("-5200000")  # 4.2.03
+AR_OPERADORAS = Decimal("8950000")  # 1.1.03.01
+AR_SUS = Decimal("6200000")  # 1.1.03.02
+AR_PARTICULAR = Decimal("3350000")  # 1.1.03.03
+
 
 def _make_entry(
     code: str,
@@ -25,8 +53,12 @@ def _make_entry(
     closing_balance: Decimal,
     period: str = "Q1",
 ) -> AccountEntry:
-    """Helper: build a minimal AccountEntry with only required fields."""
-    return AccountEntry(
+    """Helper: build a minimal AccountEntry with only required fields.
+
+    Inputs are already the right types, so ``model_construct`` skips
+    pydantic validation; unset balances take their declared defaults.
+    """
+    return AccountEntry.model_construct(
         code=code,
         description=description,
         closing_balance=closing_balance,
@@ -62,9 +94,96 @@ class TestAccountMapper:
         with pytest.raises(FileNotFoundError):
             AccountMapper(MISSING_CONFIG)
 
-    def test_flat_mapping_built_from_config(self):
+    def test_config_parse_is_cached(self):
+        """A second mapper on the same unchanged file reuses the parsed YAML."""
+        AccountMapper(CONFIG_PATH)
+        hits = _load_config_cached.cache_info().hits
+        second = AccountMapper(CONFIG_PATH)
+
+        assert _load_config_cached.cache_info().hits == hits + 1
+        assert second.company_name == "AUSTA Group"
+
+    def test_config_cache_invalidated_on_change(self, tmp_path):
+        """Editing the file (new mtime) forces a re-parse."""
+        cfg = tmp_path / "company.yaml"
+        cfg.write_text("company:\n  name: Antes\n", encoding="utf-8")
+        assert AccountMapper(str(cfg)).company_name == "Antes"
+
+        cfg.write_text("company:\n  name: Depois\n", encoding="utf-8")
+        stat = cfg.stat()
+        os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert AccountMapper(str(cfg)).company_name == "Depois"
+
+    def test_json_sidecar_written_and_reused(self, tmp_path, config_cache_dir):
+        """The first load writes a JSON sidecar; later processes read it."""
+        cfg = tmp_path / "company.yaml"
+        cfg.write_text("company:\n  name: Original\n", encoding="utf-8")
+        AccountMapper(str(cfg))
+
+        sidecar = _config_cache_path(str(cfg.resolve()))
+        assert sidecar.parent == config_cache_dir
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["company.yaml"]
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+        assert payload["source_sha256"] == hashlib.sha256(cfg.read_bytes()).hexdigest()
+        assert payload["config"] == {"company": {"name": "Original"}}
+
+        # Simulate a new process: drop the in-memory cache, edit the sidecar
+        payload["config"]["company"]["name"] = "From sidecar"
+        sidecar.write_text(json.dumps(payload), encoding="utf-8")
+        _load_config_cached.cache_clear()
+
+        assert AccountMapper(str(cfg)).company_name == "From sidecar"
+
+    def test_stale_json_sidecar_ignored(self, tmp_path):
+        """A sidecar stamped with another YAML's hash is re-parsed and replaced."""
+        cfg = tmp_path / "company.yaml"
+        cfg.write_text("company:\n  name: Atual\n", encoding="utf-8")
+        sidecar = _config_cache_path(str(cfg.resolve()))
+        sidecar.write_text(
+            json.dumps({"source_sha256": "0" * 64, "config": {"company": {"name": "Velho"}}}),
+            encoding="utf-8",
+        )
+
+        assert AccountMapper(str(cfg)).company_name == "Atual"
+
+    def test_sidecar_ignored_when_yaml_replaced_with_same_mtime(self, tmp_path):
+        """Replacing the YAML but keeping its mtime (cp -p, rsync -t) is not served stale."""
+        cfg = tmp_path / "company.yaml"
+        cfg.write_text("company:\n  name: Antes\n", encoding="utf-8")
+        stat = cfg.stat()
+        assert AccountMapper(str(cfg)).company_name == "Antes"
+
+        # New process: the in-memory cache is gone, only the sidecar remains
+        _load_config_cached.cache_clear()
+        cfg.write_text("company:\n  name: Depois\n", encoding="utf-8")
+        os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert AccountMapper(str(cfg)).company_name == "Depois"
+
+    def test_sidecar_temp_file_removed_on_failed_write(self, tmp_path, config_cache_dir, monkeypatch):
+        """A failed rename leaves neither a sidecar nor a stray .tmp file."""
+        cfg = tmp_path / "company.yaml"
+        cfg.write_text("company:\n  name: Falha\n", encoding="utf-8")
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(account_mapper.os, "replace", fail_replace)
+        assert AccountMapper(str(cfg)).company_name == "Falha"
+
+        sidecar = _config_cache_path(str(cfg.resolve()))
+        assert not sidecar.exists()
+        assert not list(config_cache_dir.glob(f"{sidecar.name}.*.tmp"))
+
+    def test_raw_config_mutation_does_not_leak(self):
+        """Each mapper gets its own copy of the cached config."""
+        first = AccountMapper(CONFIG_PATH)
+        first.raw_config["company"]["name"] = "Mutated"
+
+        assert AccountMapper(CONFIG_PATH).company_name == "AUSTA Group"
+
+    def test_flat_mapping_built_from_config(self, mapper):
         """Verify the flat prefix→category mapping is populated after load."""
-        mapper = AccountMapper(CONFIG_PATH)
 
         # Direct prefix mappings from austa.yaml accounts lists
         assert mapper.mapping.get("3.1") == "revenue"
@@ -73,18 +192,16 @@ class TestAccountMapper:
         assert mapper.mapping.get("4.2") == "operating_expenses"
         assert mapper.mapping.get("1.1.01") == "cash"
 
-    def test_reclassifications_loaded_from_config(self):
+    def test_reclassifications_loaded_from_config(self, mapper):
         """Verify reclassification rules are parsed from the YAML."""
-        mapper = AccountMapper(CONFIG_PATH)
 
         # austa.yaml defines two reclassifications for cogs
         from_codes = [rc["from"] for rc in mapper.reclassifications]
         assert "4.2.01" in from_codes
         assert "4.2.02" in from_codes
 
-    def test_exclusions_loaded_from_config(self):
+    def test_exclusions_loaded_from_config(self, mapper):
         """Verify exclusion codes are populated from the YAML."""
-        mapper = AccountMapper(CONFIG_PATH)
 
         # operating_expenses section excludes 4.2.01 and 4.2.02
         assert "4.2.01" in mapper.exclusions
@@ -94,25 +211,22 @@ class TestAccountMapper:
     # map_accounts — return type and period
     # ------------------------------------------------------------------
 
-    def test_map_returns_mapped_data_type(self):
+    def test_map_returns_mapped_data_type(self, mapper):
         """Verify map_accounts() always returns a MappedData instance."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("3.1", "Receita", Decimal("100"))]
         result = mapper.map_accounts(entries, "Q1")
 
         assert isinstance(result, MappedData)
 
-    def test_mapped_data_period_is_preserved(self):
+    def test_mapped_data_period_is_preserved(self, mapper):
         """Verify the period argument is stored in the returned MappedData."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("3.1", "Receita", Decimal("100"))]
         result = mapper.map_accounts(entries, "Q1_2025")
 
         assert result.period == "Q1_2025"
 
-    def test_mapped_data_company_from_config(self):
+    def test_mapped_data_company_from_config(self, mapper):
         """Verify MappedData.company matches the YAML company name."""
-        mapper = AccountMapper(CONFIG_PATH)
         result = mapper.map_accounts([], "Q1")
 
         assert result.company == "AUSTA Group"
@@ -121,137 +235,49 @@ class TestAccountMapper:
     # map_accounts — known account mappings
     # ------------------------------------------------------------------
 
-    def test_map_known_revenue_account(self):
-        """Account code 3.1 must accumulate into gross_revenue."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("3.1", "Receita", Decimal("1000000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.gross_revenue == Decimal("1000000")
-
-    def test_map_known_deductions_account(self):
-        """Account code 3.2 must accumulate into returns_deductions."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("3.2", "Deduções", Decimal("-250000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.returns_deductions == Decimal("-250000")
-
-    def test_map_known_cogs_account(self):
-        """Account code 4.1 must accumulate into cogs."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("4.1", "CPV", Decimal("-500000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.cogs == Decimal("-500000")
-
-    def test_map_known_operating_expenses_account(self):
-        """Account code 4.2 sub-account (non-excluded) maps to operating_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
-        # 4.2.03 is not excluded and sits under 4.2
-        entries = [_make_entry("4.2.03", "Vendas", Decimal("-100000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.operating_expenses == Decimal("-100000")
-
-    def test_map_known_cash_account(self):
-        """Account code 1.1.01 must accumulate into cash."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("1.1.01", "Caixa", Decimal("1200000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.cash == Decimal("1200000")
-
-    def test_map_known_accounts_receivable(self):
-        """Account code 1.1.03 must accumulate into accounts_receivable."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("1.1.03", "CR", Decimal("18500000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.accounts_receivable == Decimal("18500000")
-
-    def test_map_known_accounts_payable(self):
-        """Account code 2.1.01 must accumulate into accounts_payable."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("2.1.01", "Fornecedores", Decimal("8900000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.accounts_payable == Decimal("8900000")
-
-    def test_map_known_equity_account(self):
-        """Account code 2.3 must accumulate into shareholders_equity."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("2.3", "PL", Decimal("35000000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.shareholders_equity == Decimal("35000000")
-
-    def test_map_known_short_term_debt(self):
-        """Account code 2.1.02 must accumulate into short_term_debt."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("2.1.02", "Emprestimo CP", Decimal("12000000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.short_term_debt == Decimal("12000000")
-
-    def test_map_known_long_term_debt(self):
-        """Account code 2.2.01 must accumulate into long_term_debt."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("2.2.01", "Emprestimo LP", Decimal("25000000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.long_term_debt == Decimal("25000000")
-
-    def test_map_known_financial_income(self):
-        """Account code 3.3 must accumulate into financial_income."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("3.3", "Rec Fin", Decimal("150000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.financial_income == Decimal("150000")
-
-    def test_map_known_financial_expenses(self):
-        """Account code 4.3 must accumulate into financial_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("4.3", "Desp Fin", Decimal("-1200000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.financial_expenses == Decimal("-1200000")
-
-    def test_map_known_inventory(self):
-        """Account code 1.1.04 must accumulate into inventory."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("1.1.04", "Estoque", Decimal("3200000"))]
-        result = mapper.map_accounts(entries, "Q1")
-
-        assert result.inventory == Decimal("3200000")
-
-    def test_map_known_fixed_assets(self):
-        """Account code 1.2.03 must accumulate into ppe_gross."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("1.2.03", "Imobilizado", Decimal("45000000"))]
+    @pytest.mark.parametrize(
+        "code, description, field, amount",
+        [
+            ("3.1", "Receita", "gross_revenue", D_1M),
+            ("3.2", "Deduções", "returns_deductions", Decimal("-250000")),
+            ("4.1", "CPV", "cogs", D_NEG_500K),
+            # 4.2.03 is not excluded and sits under 4.2
+            ("4.2.03", "Vendas", "operating_expenses", D_NEG_100K),
+            ("1.1.01", "Caixa", "cash", Decimal("1200000")),
+            ("1.1.03", "CR", "accounts_receivable", Decimal("18500000")),
+            ("2.1.01", "Fornecedores", "accounts_payable", Decimal("8900000")),
+            ("2.3", "PL", "shareholders_equity", Decimal("35000000")),
+            ("2.1.02", "Emprestimo CP", "short_term_debt", Decimal("12000000")),
+            ("2.2.01", "Emprestimo LP", "long_term_debt", Decimal("25000000")),
+            ("3.3", "Rec Fin", "financial_income", Decimal("150000")),
+            ("4.3", "Desp Fin", "financial_expenses", Decimal("-1200000")),
+            ("1.1.04", "Estoque", "inventory", Decimal("3200000")),
+            ("1.2.03", "Imobilizado", "ppe_gross", Decimal("45000000")),
+        ],
+    )
+    def test_map_known_account(self, mapper, code, description, field, amount):
+        """A configured account code must accumulate into its MappedData field."""
+        entries = [_make_entry(code, description, amount)]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.ppe_gross == Decimal("45000000")
+        assert getattr(result, field) == amount
 
     # ------------------------------------------------------------------
     # map_accounts — unmapped / unknown accounts
     # ------------------------------------------------------------------
 
-    def test_unmapped_account_ignored(self):
+    def test_unmapped_account_ignored(self, mapper):
         """Unmapped account code must not affect any category totals."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("9.9.99", "Unknown", Decimal("500"))]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.gross_revenue == Decimal("0")
-        assert result.cogs == Decimal("0")
-        assert result.operating_expenses == Decimal("0")
-        assert result.cash == Decimal("0")
+        assert result.gross_revenue == D_ZERO
+        assert result.cogs == D_ZERO
+        assert result.operating_expenses == D_ZERO
+        assert result.cash == D_ZERO
 
-    def test_unmapped_account_does_not_raise(self):
+    def test_unmapped_account_does_not_raise(self, mapper):
         """Processing an unmapped account must not raise an exception."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("9.9.99", "Unknown", Decimal("500"))]
         # Should complete without error
         result = mapper.map_accounts(entries, "Q1")
@@ -261,139 +287,168 @@ class TestAccountMapper:
     # map_accounts — empty input
     # ------------------------------------------------------------------
 
-    def test_empty_entries_returns_zero_mapped(self):
+    def test_empty_entries_returns_zero_mapped(self, mapper):
         """Empty account list must return MappedData with all zero monetary fields."""
-        mapper = AccountMapper(CONFIG_PATH)
         result = mapper.map_accounts([], "Q1")
 
-        assert result.gross_revenue == Decimal("0")
-        assert result.returns_deductions == Decimal("0")
-        assert result.cogs == Decimal("0")
-        assert result.operating_expenses == Decimal("0")
-        assert result.financial_income == Decimal("0")
-        assert result.financial_expenses == Decimal("0")
-        assert result.accounts_receivable == Decimal("0")
-        assert result.inventory == Decimal("0")
-        assert result.accounts_payable == Decimal("0")
-        assert result.ppe_gross == Decimal("0")
-        assert result.short_term_debt == Decimal("0")
-        assert result.long_term_debt == Decimal("0")
-        assert result.shareholders_equity == Decimal("0")
-        assert result.cash == Decimal("0")
-
-    def test_empty_entries_derived_fields_are_zero(self):
+        assert result.gross_revenue == D_ZERO
+        assert result.returns_deductions == D_ZERO
+        assert result.cogs == D_ZERO
+        assert result.operating_expenses == D_ZERO
+        assert result.financial_income == D_ZERO
+        assert result.financial_expenses == D_ZERO
+        assert result.accounts_receivable == D_ZERO
+        assert result.inventory == D_ZERO
+        assert result.accounts_payable == D_ZERO
+        assert result.ppe_gross == D_ZERO
+        assert result.short_term_debt == D_ZERO
+        assert result.long_term_debt == D_ZERO
+        assert result.shareholders_equity == D_ZERO
+        assert result.cash == D_ZERO
+
+    def test_empty_entries_derived_fields_are_zero(self, mapper):
         """Derived fields (net_revenue, gross_profit, ebitda, ebit, ebt) must be zero for empty input."""
-        mapper = AccountMapper(CONFIG_PATH)
         result = mapper.map_accounts([], "Q1")
 
-        assert result.net_revenue == Decimal("0")
-        assert result.gross_profit == Decimal("0")
-        assert result.ebitda == Decimal("0")
-        assert result.ebit == Decimal("0")
-        assert result.ebt == Decimal("0")
+        assert result.net_revenue == D_ZERO
+        assert result.gross_profit == D_ZERO
+        assert result.ebitda == D_ZERO
+        assert result.ebit == D_ZERO
+        assert result.ebt == D_ZERO
 
     # ------------------------------------------------------------------
     # map_accounts — reclassifications
     # ------------------------------------------------------------------
 
-    def test_reclassification_4201_to_cogs(self):
+    def test_reclassification_4201_to_cogs(self, mapper):
         """Account 4.2.01 must be reclassified to 4.1 (cogs), not operating_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("4.2.01", "Pessoal Serv", Decimal("-6500000"))]
+        entries = [_make_entry("4.2.01", "Pessoal Serv", PESSOAL_RECLASS)]
         result = mapper.map_accounts(entries, "Q1")
 
         # Reclassified to cogs — must appear there
-        assert result.cogs == Decimal("-6500000")
+        assert result.cogs == PESSOAL_RECLASS
         # Must NOT appear in operating_expenses
-        assert result.operating_expenses == Decimal("0")
+        assert result.operating_expenses == D_ZERO
 
-    def test_reclassification_4202_to_cogs(self):
+    def test_reclassification_4202_to_cogs(self, mapper):
         """Account 4.2.02 must be reclassified to 4.1 (cogs), not operating_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("4.2.02", "Materiais Serv", Decimal("-1750000"))]
+        entries = [_make_entry("4.2.02", "Materiais Serv", MATERIAIS_RECLASS)]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.cogs == Decimal("-1750000")
-        assert result.operating_expenses == Decimal("0")
+        assert result.cogs == MATERIAIS_RECLASS
+        assert result.operating_expenses == D_ZERO
 
-    def test_reclassification_cogs_accumulates_with_direct_cogs(self):
+    def test_reclassification_cogs_accumulates_with_direct_cogs(self, mapper):
         """Reclassified amounts must add to direct COGS amounts."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("4.1", "CPV direto", Decimal("-22400000")),
-            _make_entry("4.2.01", "Pessoal reclass", Decimal("-6500000")),
-            _make_entry("4.2.02", "Materiais reclass", Decimal("-1750000")),
+            _make_entry("4.1", "CPV direto", CPV_DIRECT),
+            _make_entry("4.2.01", "Pessoal reclass", PESSOAL_RECLASS),
+            _make_entry("4.2.02", "Materiais reclass", MATERIAIS_RECLASS),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
-        expected_cogs = Decimal("-22400000") + Decimal("-6500000") + Decimal("-1750000")
+        expected_cogs = CPV_DIRECT + PESSOAL_RECLASS + MATERIAIS_RECLASS
         assert result.cogs == expected_cogs
 
-    def test_excluded_codes_absent_from_operating_expenses(self):
+    def test_reclassification_applies_to_sub_accounts(self, mapper):
+        """Sub-accounts of a reclassified code (4.2.01.xx) follow it to cogs."""
+        entries = [_make_entry("4.2.01.07", "Pessoal UTI", Decimal("-300000"))]
+        result = mapper.map_accounts(entries, "Q1")
+
+        assert result.cogs == Decimal("-300000")
+        assert result.operating_expenses == D_ZERO
+
+    def test_exclusions_are_frozen(self, mapper):
+        """Exclusions are an immutable set built once at load time."""
+        assert isinstance(mapper.exclusions, frozenset)
+
+    def test_excluded_codes_absent_from_operating_expenses(self, mapper):
         """Codes 4.2.01 and 4.2.02 must NOT count toward operating_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("4.2.01", "Pessoal", Decimal("-6500000")),
-            _make_entry("4.2.02", "Materiais", Decimal("-1750000")),
-            _make_entry("4.2.03", "Vendas", Decimal("-5200000")),
+            _make_entry("4.2.01", "Pessoal", PESSOAL_RECLASS),
+            _make_entry("4.2.02", "Materiais", MATERIAIS_RECLASS),
+            _make_entry("4.2.03", "Vendas", OPEX_VENDAS),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
         # Only 4.2.03 should land in operating_expenses
-        assert result.operating_expenses == Decimal("-5200000")
+        assert result.operating_expenses == OPEX_VENDAS
 
     # ------------------------------------------------------------------
     # map_accounts — prefix matching (sub-accounts)
     # ------------------------------------------------------------------
 
-    def test_sub_account_prefix_matched_to_parent_category(self):
+    def test_sub_account_prefix_matched_to_parent_category(self, mapper):
         """A sub-account (e.g. 1.1.03.01) under a mapped prefix maps correctly."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("1.1.03.01", "CR Operadoras", Decimal("8950000")),
-            _make_entry("1.1.03.02", "CR SUS", Decimal("6200000")),
-            _make_entry("1.1.03.03", "CR Particular", Decimal("3350000")),
+            _make_entry("1.1.03.01", "CR Operadoras", AR_OPERADORAS),
+            _make_entry("1.1.03.02", "CR SUS", AR_SUS),
+            _make_entry("1.1.03.03", "CR Particular", AR_PARTICULAR),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
-        expected_ar = Decimal("8950000") + Decimal("6200000") + Decimal("3350000")
+        expected_ar = AR_OPERADORAS + AR_SUS + AR_PARTICULAR
         assert result.accounts_receivable == expected_ar
 
+    def test_prefix_match_respects_segment_boundary(self, mapper):
+        """1.1.030 is not a sub-account of 1.1.03 and must stay unmapped."""
+        entries = [_make_entry("1.1.030", "Outro", Decimal("100"))]
+        result = mapper.map_accounts(entries, "Q1")
+
+        assert result.accounts_receivable == D_ZERO
+
+    def test_resolve_category(self, mapper):
+        """Reclassification, exclusion and prefix matching in one lookup."""
+        assert mapper._resolve_category("4.2.01") == "cogs"
+        assert mapper._resolve_category("4.2.03") == "operating_expenses"
+        assert mapper._resolve_category("1.1.03.02") == "accounts_receivable"
+        assert mapper._resolve_category("9.9.99") is None
+
+    def test_sibling_code_sharing_text_prefix_not_matched(self, mapper):
+        """3.10 is a sibling of 3.1, not a sub-account, so it is not revenue."""
+        entries = [_make_entry("3.10", "Outra receita", Decimal("100"))]
+        result = mapper.map_accounts(entries, "Q1")
+
+        assert result.gross_revenue == D_ZERO
+
+    def test_categories_for_walks_prefix_trie(self, mapper):
+        """Trie lookup returns every matching category, in config order."""
+        assert mapper._categories_for("1.1.03.01") == ["accounts_receivable"]
+        assert mapper._categories_for("4.2.01") == ["operating_expenses"]
+        assert mapper._categories_for("9.9.99") == []
+
     # ------------------------------------------------------------------
     # map_accounts — derived fields
     # ------------------------------------------------------------------
 
-    def test_net_revenue_derived_from_gross_and_deductions(self):
+    def test_net_revenue_derived_from_gross_and_deductions(self, mapper):
         """net_revenue = gross_revenue + returns_deductions."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("3.2", "Deduções", Decimal("-100000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("3.2", "Deduções", D_NEG_100K),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
         assert result.net_revenue == Decimal("900000")
 
-    def test_gross_profit_derived_correctly(self):
+    def test_gross_profit_derived_correctly(self, mapper):
         """gross_profit = net_revenue + cogs."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("3.2", "Deduções", Decimal("-100000")),
-            _make_entry("4.1", "CPV", Decimal("-400000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("3.2", "Deduções", D_NEG_100K),
+            _make_entry("4.1", "CPV", D_NEG_400K),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
         # net_revenue = 1000000 + (-100000) = 900000
         # gross_profit = 900000 + (-400000) = 500000
-        assert result.gross_profit == Decimal("500000")
+        assert result.gross_profit == D_500K
 
-    def test_ebitda_derived_correctly(self):
+    def test_ebitda_derived_correctly(self, mapper):
         """ebitda = gross_profit + operating_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("4.1", "CPV", Decimal("-400000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("4.1", "CPV", D_NEG_400K),
             _make_entry("4.2.03", "Opex", Decimal("-200000")),
         ]
         result = mapper.map_accounts(entries, "Q1")
@@ -403,13 +458,12 @@ class TestAccountMapper:
         # ebitda = 600000 + (-200000) = 400000
         assert result.ebitda == Decimal("400000")
 
-    def test_ebt_derived_includes_financial_items(self):
+    def test_ebt_derived_includes_financial_items(self, mapper):
         """ebt = ebit + financial_income + financial_expenses."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("4.1", "CPV", Decimal("-400000")),
-            _make_entry("4.2.03", "Opex", Decimal("-100000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("4.1", "CPV", D_NEG_400K),
+            _make_entry("4.2.03", "Opex", D_NEG_100K),
             _make_entry("3.3", "Rec Fin", Decimal("50000")),
             _make_entry("4.3", "Desp Fin", Decimal("-80000")),
         ]
@@ -423,9 +477,8 @@ class TestAccountMapper:
     # map_accounts — multiple entries and aggregation
     # ------------------------------------------------------------------
 
-    def test_multiple_revenue_entries_aggregate(self):
+    def test_multiple_revenue_entries_aggregate(self, mapper):
         """Multiple entries under the same category must be summed."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
             _make_entry("3.1", "Receita Jan", Decimal("400000")),
             _make_entry("3.1", "Receita Fev", Decimal("350000")),
@@ -433,44 +486,95 @@ class TestAccountMapper:
         ]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.gross_revenue == Decimal("1000000")
+        assert result.gross_revenue == D_1M
 
-    def test_mixed_categories_do_not_cross_contaminate(self):
+    def test_mixed_categories_do_not_cross_contaminate(self, mapper):
         """Values for different categories must not bleed into each other."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("4.1", "CPV", Decimal("-500000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("4.1", "CPV", D_NEG_500K),
             _make_entry("1.1.01", "Caixa", Decimal("200000")),
         ]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.gross_revenue == Decimal("1000000")
-        assert result.cogs == Decimal("-500000")
+        assert result.gross_revenue == D_1M
+        assert result.cogs == D_NEG_500K
         assert result.cash == Decimal("200000")
         # Other fields remain zero
-        assert result.accounts_receivable == Decimal("0")
-        assert result.inventory == Decimal("0")
+        assert result.accounts_receivable == D_ZERO
+        assert result.inventory == D_ZERO
+
+    def test_map_accounts_memoized_per_entries_and_period(self):
+        """Repeat calls with equal inputs reuse the cached mapping."""
+        fresh = AccountMapper(CONFIG_PATH)
+        entries = [_make_entry("3.1", "Receita", Decimal("1000"))]
+
+        first = fresh.map_accounts(entries, "Q1")
+        second = fresh.map_accounts(list(entries), "Q1")
+        other_period = fresh.map_accounts(entries, "Q2")
+
+        assert len(fresh._map_cache) == 2
+        assert second == first
+        assert other_period.period == "Q2"
+
+    def test_map_accounts_cached_metadata_not_shared(self):
+        """Editing one result's metadata does not leak into later results."""
+        fresh = AccountMapper(CONFIG_PATH)
+        entries = [_make_entry("3.1", "Receita", Decimal("1000"))]
+
+        first = fresh.map_accounts(entries, "Q1")
+        first.metadata["flag"] = 1
+        second = fresh.map_accounts(list(entries), "Q1")
+
+        assert second is not first
+        assert "flag" not in second.metadata
+        assert second.gross_revenue == first.gross_revenue
+
+    def test_reload_clears_map_cache(self):
+        """load_config drops memoized results built from the old config."""
+        fresh = AccountMapper(CONFIG_PATH)
+        fresh.map_accounts([], "Q1")
+        fresh.load_config()
+
+        assert len(fresh._map_cache) == 0
+
+    def test_account_entry_is_frozen(self):
+        """AccountEntry is immutable (and hashable) so it can key the cache."""
+        entry = _make_entry("3.1", "Receita", Decimal("1"))
+        with pytest.raises(ValidationError):
+            entry.code = "3.2"
+        assert hash(entry) == hash(_make_entry("3.1", "Receita", Decimal("1")))
+
+    def test_account_codes_are_interned(self, mapper):
+        """Validated entry codes and config prefixes share one string object."""
+        code = "".join(["1.1", ".03"])
+        entry = AccountEntry(code=code, description="CR", period="Q1")
+
+        assert entry.code is mapper.categories["accounts_receivable"]["prefixes"][0]
+
+    def test_mapped_data_is_frozen(self, mapper):
+        """MappedData cannot be modified after map_accounts builds it."""
+        result = mapper.map_accounts([], "Q1")
+        with pytest.raises(ValidationError):
+            result.gross_revenue = Decimal("1")
 
     # ------------------------------------------------------------------
     # validate_mapping
     # ------------------------------------------------------------------
 
-    def test_validate_mapping_fails_for_zero_revenue(self):
+    def test_validate_mapping_fails_for_zero_revenue(self, mapper):
         """validate_mapping returns False when gross_revenue == 0."""
-        mapper = AccountMapper(CONFIG_PATH)
         result = mapper.map_accounts([], "Q1")
         is_valid, messages = mapper.validate_mapping(result)
 
         assert is_valid is False
         assert any("gross_revenue" in m for m in messages)
 
-    def test_validate_mapping_passes_with_positive_revenue_and_equity(self):
+    def test_validate_mapping_passes_with_positive_revenue_and_equity(self, mapper):
         """validate_mapping returns True for positive revenue and non-zero equity."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [
-            _make_entry("3.1", "Receita", Decimal("1000000")),
-            _make_entry("2.3", "PL", Decimal("500000")),
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("2.3", "PL", D_500K),
         ]
         result = mapper.map_accounts(entries, "Q1")
         is_valid, messages = mapper.validate_mapping(result)
@@ -478,9 +582,8 @@ class TestAccountMapper:
         assert is_valid is True
         assert messages == []
 
-    def test_validate_mapping_warns_negative_revenue(self):
+    def test_validate_mapping_warns_negative_revenue(self, mapper):
         """validate_mapping flags gross_revenue <= 0."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("3.1", "Receita negativa", Decimal("-1"))]
         result = mapper.map_accounts(entries, "Q1")
         is_valid, messages = mapper.validate_mapping(result)
@@ -488,10 +591,9 @@ class TestAccountMapper:
         # negative revenue also triggers the warning
         assert is_valid is False
 
-    def test_validate_mapping_warns_zero_equity(self):
+    def test_validate_mapping_warns_zero_equity(self, mapper):
         """validate_mapping flags zero shareholders_equity."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("3.1", "Receita", Decimal("500000"))]
+        entries = [_make_entry("3.1", "Receita", D_500K)]
         # No equity entry → shareholders_equity defaults to 0
         result = mapper.map_accounts(entries, "Q1")
         is_valid, messages = mapper.validate_mapping(result)
@@ -499,30 +601,58 @@ class TestAccountMapper:
         assert is_valid is False
         assert any("shareholders_equity" in m for m in messages)
 
+    def test_validate_mapping_strict_reports_codes(self, mapper):
+        """validate_mapping_strict returns one code per violated rule."""
+        result = mapper.map_accounts([], "Q1")
+        is_valid, messages, codes = mapper.validate_mapping_strict(result)
+
+        assert is_valid is False
+        assert codes == {"gross_revenue", "shareholders_equity"}
+        assert (is_valid, messages) == mapper.validate_mapping(result)
+
+    def test_validate_mapping_strict_clean_has_no_codes(self, mapper):
+        """A passing mapping yields an empty code set."""
+        entries = [
+            _make_entry("3.1", "Receita", D_1M),
+            _make_entry("2.3", "PL", D_500K),
+        ]
+        result = mapper.map_accounts(entries, "Q1")
+
+        assert mapper.validate_mapping_strict(result) == (True, [], set())
+
     # ------------------------------------------------------------------
     # Edge cases
     # ------------------------------------------------------------------
 
-    def test_zero_balance_entry_does_not_affect_totals(self):
+    def test_zero_balance_entry_does_not_affect_totals(self, mapper):
         """An entry with closing_balance=0 must not change category totals."""
-        mapper = AccountMapper(CONFIG_PATH)
-        entries = [_make_entry("3.1", "Receita zero", Decimal("0"))]
+        entries = [_make_entry("3.1", "Receita zero", D_ZERO)]
         result = mapper.map_accounts(entries, "Q1")
 
-        assert result.gross_revenue == Decimal("0")
+        assert result.gross_revenue == D_ZERO
 
-    def test_large_decimal_values_preserved(self):
+    def test_large_decimal_values_preserved(self, mapper):
         """Very large Decimal values must be stored without rounding errors."""
-        mapper = AccountMapper(CONFIG_PATH)
         large_value = Decimal("999999999999.99")
         entries = [_make_entry("3.1", "Receita grande", large_value)]
         result = mapper.map_accounts(entries, "Q1")
 
         assert result.gross_revenue == large_value
 
-    def test_negative_decimal_values_preserved(self):
+    def test_integer_accumulation_matches_decimal_sum(self, mapper):
+        """Mixed scales sum to exactly what Decimal addition gives, exponent included."""
+        values = [
+            D_1M, Decimal("0.5"), Decimal("-1750000.25"),
+            Decimal("1E+3"), Decimal("0.001"), Decimal("-0.00"),
+        ]
+        entries = [_make_entry("3.1", "Receita", v) for v in values]
+        result = mapper.map_accounts(entries, "Q1")
+
+        expected = sum(values, D_ZERO)
+        assert str(result.gross_revenue) == str(expected)
+
+    def test_negative_decimal_values_preserved(self, mapper):
         """Negative Decimal values (cost entries) must be signed correctly."""
-        mapper = AccountMapper(CONFIG_PATH)
         entries = [_make_entry("4.1", "CPV negativo", Decimal("-12345678.99"))]
         result = mapper.map_accounts(entries, "Q1")
 
@@ -532,77 +662,47 @@ class TestAccountMapper:
     # End-to-end: XML parser → AccountMapper
     # ------------------------------------------------------------------
 
-    def test_end_to_end_with_xml_parser(self):
+    def test_end_to_end_with_xml_parser(self, mapper, xml_entries):
         """Integration: parse sample_balancete.xml then map all accounts."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         assert isinstance(result, MappedData)
         assert result.period == "Q1_2025"
 
-    def test_end_to_end_revenue_value(self):
+    def test_end_to_end_revenue_value(self, mapper, xml_entries):
         """Integration: gross_revenue matches XML account 3.1 saldo."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         # XML 3.1 <saldo>40100000.00</saldo>
         assert result.gross_revenue == Decimal("40100000.00")
 
-    def test_end_to_end_cogs_includes_reclassified(self):
+    def test_end_to_end_cogs_includes_reclassified(self, mapper, xml_entries):
         """Integration: cogs total includes reclassified sub-accounts 4.2.01 + 4.2.02."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         # 4.1=-22400000, 4.2.01=-6500000, 4.2.02=-1750000 all land in cogs
-        expected_cogs = Decimal("-22400000") + Decimal("-6500000") + Decimal("-1750000")
+        expected_cogs = CPV_DIRECT + PESSOAL_RECLASS + MATERIAIS_RECLASS
         assert result.cogs == expected_cogs
 
-    def test_end_to_end_operating_expenses_excludes_reclassified(self):
+    def test_end_to_end_operating_expenses_excludes_reclassified(self, mapper, xml_entries):
         """Integration: operating_expenses excludes 4.2.01 and 4.2.02 sub-accounts."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         # Only 4.2.03 + 4.2.04 + 4.2.05 contribute to operating_expenses
-        expected_opex = Decimal("-5200000") + Decimal("-4100000") + Decimal("-2100000")
+        expected_opex = OPEX_VENDAS + Decimal("-4100000") + Decimal("-2100000")
         assert result.operating_expenses == expected_opex
 
-    def test_end_to_end_accounts_receivable_sum_of_subcontas(self):
+    def test_end_to_end_accounts_receivable_sum_of_subcontas(self, mapper, xml_entries):
         """Integration: accounts_receivable is sum of three 1.1.03.xx sub-accounts."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         # 1.1.03.01=8950000, 1.1.03.02=6200000, 1.1.03.03=3350000
-        expected_ar = Decimal("8950000") + Decimal("6200000") + Decimal("3350000")
+        expected_ar = AR_OPERADORAS + AR_SUS + AR_PARTICULAR
         assert result.accounts_receivable == expected_ar
 
-    def test_end_to_end_all_fields_populated(self):
+    def test_end_to_end_all_fields_populated(self, mapper, xml_entries):
         """Integration: key balance-sheet fields are non-zero after parsing real XML."""
-        from src.ingest.xml_parser import ERPXMLParser
-
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper(CONFIG_PATH)
-        result = mapper.map_accounts(entries, "Q1_2025")
+        result = mapper.map_accounts(xml_entries, "Q1_2025")
 
         # Cash: XML 1.1.01 saldo_final=1200000
         assert result.cash == Decimal("1200000.00")
@@ -1,11 +1,31 @@
 """Tests for AI analyst with mocked Anthropic API."""
+import json
 import sys
 import types
+from collections import namedtuple
+from types import SimpleNamespace
 import pytest
 from decimal import Decimal
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from src.ai.analyst import CashFlowStoryAnalyst, _to_float
 from src.models import AnalysisResult, PeriodResult
+from src.models.cashflow_story import CashQualityMetric, PowerOfOneLever, ThreeBigMeasures
+
+
+def _assert_json_equal(actual, expected):
+    """Compare two JSON-shaped trees by their canonical serialization."""
+    assert json.dumps(actual, sort_keys=True, default=str) == json.dumps(
+        expected, sort_keys=True, default=str
+    )
+
+
+# Stand-in for an SDK text content block; only ``text`` is read
+_TextBlock = namedtuple("_TextBlock", "text")
+
+
+def _anthropic_response(*texts):
+    """Plain stand-in for a Messages API response, one text block per arg."""
+    return SimpleNamespace(content=[_TextBlock(text) for text in texts])
 
 
 def _make_anthropic_mock(narrative_text="AI narrative response"):
@@ -17,65 +37,100 @@ def _make_anthropic_mock(narrative_text="AI narrative response"):
     attribute does not exist at module level).  Instead we inject a fake
     module into ``sys.modules`` so that the ``import`` statement inside
     ``analyze`` resolves to our mock.
+
+    Only the calls tests assert on (``Anthropic`` and ``messages.create``)
+    are MagicMocks; the client and response are plain namespaces.
     """
     mock_module = types.ModuleType("anthropic")
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_response.content = [MagicMock(text=narrative_text)]
-    mock_client.messages.create.return_value = mock_response
-    mock_module.Anthropic = MagicMock(return_value=mock_client)
-    # Expose the inner client so tests can inspect calls
-    mock_module._mock_client = mock_client
+    create = MagicMock(return_value=_anthropic_response(narrative_text))
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    mock_module.Anthropic = MagicMock(return_value=client)
+    # Expose messages.create so tests can inspect calls
+    mock_module._create = create
     return mock_module
 
 
-class TestToFloat:
-    def test_decimal_to_float(self):
-        assert _to_float(Decimal("123.45")) == 123.45
+def _reset_anthropic_mock(mock_module, narrative_text="AI narrative response"):
+    """Clear recorded calls and restore the default single-block response."""
+    mock_module.Anthropic.reset_mock()
+    mock_module._create.reset_mock()
+    mock_module._create.return_value = _anthropic_response(narrative_text)
+
+
+@pytest.fixture(scope="module")
+def _anthropic_module():
+    """One fake ``anthropic`` module for the whole file; MagicMock trees are costly."""
+    return _make_anthropic_mock()
 
-    def test_dict_conversion(self):
-        result = _to_float({"a": Decimal("1"), "b": Decimal("2")})
-        assert result == {"a": 1.0, "b": 2.0}
 
-    def test_list_conversion(self):
-        result = _to_float([Decimal("1"), Decimal("2")])
-        assert result == [1.0, 2.0]
+@pytest.fixture
+def anthropic_mock(_anthropic_module):
+    """The shared fake module with calls and response reset for one test."""
+    _reset_anthropic_mock(_anthropic_module)
+    return _anthropic_module
 
-    def test_passthrough_non_decimal(self):
-        assert _to_float("hello") == "hello"
-        assert _to_float(42) == 42
 
-    def test_nested_dict_with_list(self):
-        result = _to_float({"values": [Decimal("5"), Decimal("10")]})
-        assert result == {"values": [5.0, 10.0]}
+@pytest.fixture(scope="class")
+def fake_analyst():
+    """Analyst with a dummy key for tests that never reach the API.
+
+    Shared per class: ``_build_context`` and ``_build_prompt`` do not touch
+    instance state.
+    """
+    return CashFlowStoryAnalyst(api_key="fake")
 
-    def test_zero_decimal(self):
-        assert _to_float(Decimal("0")) == 0.0
 
-    def test_negative_decimal(self):
-        assert _to_float(Decimal("-99.99")) == -99.99
+@pytest.fixture(scope="class")
+def testco_context(fake_analyst):
+    """One-period TestCo context shared by the prompt tests (read-only)."""
+    pr = PeriodResult(period="Q1", net_revenue=Decimal("1000"))
+    result = AnalysisResult(company="TestCo", periods=[pr])
+    return fake_analyst._build_context(result)
 
-    def test_empty_dict(self):
-        assert _to_float({}) == {}
 
-    def test_empty_list(self):
-        assert _to_float([]) == []
+class TestToFloat:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (Decimal("123.45"), 123.45),
+            ({"a": Decimal("1"), "b": Decimal("2")}, {"a": 1.0, "b": 2.0}),
+            ([Decimal("1"), Decimal("2")], [1.0, 2.0]),
+            ("hello", "hello"),
+            (42, 42),
+            ({"values": [Decimal("5"), Decimal("10")]}, {"values": [5.0, 10.0]}),
+            (Decimal("0"), 0.0),
+            (Decimal("-99.99"), -99.99),
+            ({}, {}),
+            ([], []),
+        ],
+        ids=[
+            "decimal", "dict", "list", "str", "int", "nested",
+            "zero", "negative", "empty_dict", "empty_list",
+        ],
+    )
+    def test_to_float(self, value, expected):
+        assert _to_float(value) == expected
 
     def test_none_passthrough(self):
         assert _to_float(None) is None
 
 
 class TestCashFlowStoryAnalyst:
+    @pytest.fixture(autouse=True)
+    def _mock_anthropic(self, monkeypatch, anthropic_mock):
+        # setitem restores just this key; patch.dict copies all of sys.modules
+        monkeypatch.setitem(sys.modules, "anthropic", anthropic_mock)
+
     def test_init_with_api_key(self):
         analyst = CashFlowStoryAnalyst(api_key="test-key")
         assert analyst.api_key == "test-key"
         assert analyst.model == "claude-sonnet-4-6"
         assert analyst.temperature == 0.3
 
-    def test_init_from_env(self):
-        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "env-key"}):
-            analyst = CashFlowStoryAnalyst()
-            assert analyst.api_key == "env-key"
+    def test_init_from_env(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+        analyst = CashFlowStoryAnalyst()
+        assert analyst.api_key == "env-key"
 
     def test_init_custom_model(self):
         analyst = CashFlowStoryAnalyst(api_key="key", model="claude-opus-4-6")
@@ -85,14 +140,14 @@ class TestCashFlowStoryAnalyst:
         analyst = CashFlowStoryAnalyst(api_key="key", temperature=0.7)
         assert analyst.temperature == 0.7
 
-    def test_missing_api_key_raises(self):
-        with patch.dict("os.environ", {}, clear=True):
-            analyst = CashFlowStoryAnalyst()
-            result = AnalysisResult(company="Test", periods=[PeriodResult(period="Q1")])
-            with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
-                analyst.analyze(result)
+    def test_missing_api_key_raises(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        analyst = CashFlowStoryAnalyst()
+        result = AnalysisResult(company="Test", periods=[PeriodResult(period="Q1")])
+        with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
+            analyst.analyze(result)
 
-    def test_build_context_extracts_metrics(self):
+    def test_build_context_extracts_metrics(self, fake_analyst):
         pr = PeriodResult(
             period="Q1",
             net_revenue=Decimal("1000000"),
@@ -100,55 +155,48 @@ class TestCashFlowStoryAnalyst:
             operating_cash_flow=Decimal("150000"),
         )
         result = AnalysisResult(company="Test", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert context["company"] == "Test"
         assert context["net_revenue"] == 1000000.0
         assert context["ebitda"] == 200000.0
 
-    def test_build_context_operating_cash_flow(self):
+    def test_build_context_operating_cash_flow(self, fake_analyst):
         pr = PeriodResult(
             period="Q1",
             operating_cash_flow=Decimal("150000"),
         )
         result = AnalysisResult(company="Test", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert context["operating_cash_flow"] == 150000.0
 
-    def test_build_context_company_name(self):
+    def test_build_context_company_name(self, fake_analyst):
         result = AnalysisResult(company="ACME Corp", periods=[PeriodResult(period="Q1")])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert context["company"] == "ACME Corp"
 
-    def test_build_context_periods_count(self):
-        periods = [PeriodResult(period=f"Q{i}") for i in range(1, 4)]
+    def test_build_context_periods_count(self, fake_analyst):
+        periods = [PeriodResult(period=p) for p in ("Q1", "Q2", "Q3")]
         result = AnalysisResult(company="Test", periods=periods)
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert context["periods_count"] == 3
 
-    def test_build_context_uses_latest_period(self):
+    def test_build_context_uses_latest_period(self, fake_analyst):
         p1 = PeriodResult(period="Q1", net_revenue=Decimal("500000"))
         p2 = PeriodResult(period="Q2", net_revenue=Decimal("800000"))
         result = AnalysisResult(company="Test", periods=[p1, p2])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         # Should use the last (latest) period
         assert context["net_revenue"] == 800000.0
 
-    def test_build_context_no_periods(self):
+    def test_build_context_no_periods(self, fake_analyst):
         result = AnalysisResult(company="Test", periods=[])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert context["company"] == "Test"
         assert context["periods_count"] == 0
         # Should not contain period-specific keys when no periods present
         assert "net_revenue" not in context
 
-    def test_build_context_three_big_measures(self):
-        from src.models.cashflow_story import ThreeBigMeasures
+    def test_build_context_three_big_measures(self, fake_analyst):
         tbm = ThreeBigMeasures(
             net_cash_flow=Decimal("100000"),
             operating_cash_flow=Decimal("200000"),
@@ -160,14 +208,12 @@ class TestCashFlowStoryAnalyst:
             periods=[PeriodResult(period="Q1")],
             three_big_measures=tbm,
         )
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert "three_big_measures" in context
         assert context["three_big_measures"]["net_cash_flow"] == 100000.0
         assert context["three_big_measures"]["operating_cash_flow"] == 200000.0
 
-    def test_build_context_power_of_one(self):
-        from src.models.cashflow_story import PowerOfOneLever
+    def test_build_context_power_of_one(self, fake_analyst):
         lever = PowerOfOneLever(
             lever="revenue",
             label_pt="Receita",
@@ -181,14 +227,12 @@ class TestCashFlowStoryAnalyst:
             periods=[PeriodResult(period="Q1")],
             power_of_one=[lever],
         )
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert len(context["power_of_one"]) == 1
         assert context["power_of_one"][0]["lever"] == "revenue"
         assert context["power_of_one"][0]["profit_impact"] == 10000.0
 
-    def test_build_context_cash_quality(self):
-        from src.models.cashflow_story import CashQualityMetric
+    def test_build_context_cash_quality(self, fake_analyst):
         metric = CashQualityMetric(
             metric="operating_cf_margin",
             label_pt="Margem FCO",
@@ -200,173 +244,139 @@ class TestCashFlowStoryAnalyst:
             periods=[PeriodResult(period="Q1")],
             cash_quality=[metric],
         )
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+        context = fake_analyst._build_context(result)
         assert len(context["cash_quality"]) == 1
         assert context["cash_quality"][0]["grade"] == "G"
         assert context["cash_quality"][0]["value"] == 0.15
 
-    def test_build_context_variances_included(self):
+    def test_build_context_variances_included(self, fake_analyst):
         result = AnalysisResult(
             company="Test",
             periods=[PeriodResult(period="Q1")],
             variances={"net_revenue": {"absolute": 50000, "pct": 5.0}},
         )
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
-        assert context["variances"] == {"net_revenue": {"absolute": 50000, "pct": 5.0}}
+        context = fake_analyst._build_context(result)
+        _assert_json_equal(
+            context["variances"], {"net_revenue": {"absolute": 50000, "pct": 5.0}}
+        )
 
-    def test_build_prompt_uses_template(self):
-        pr = PeriodResult(period="Q1", net_revenue=Decimal("1000"))
-        result = AnalysisResult(company="TestCo", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
-        prompt = analyst._build_prompt(context)
+    def test_build_prompt_uses_template(self, fake_analyst, testco_context):
+        prompt = fake_analyst._build_prompt(testco_context)
         assert "TestCo" in prompt
 
-    def test_build_prompt_contains_period_info(self):
-        pr = PeriodResult(period="Q1")
-        result = AnalysisResult(company="TestCo", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
-        prompt = analyst._build_prompt(context)
+    def test_build_prompt_contains_period_info(self, fake_analyst, testco_context):
+        prompt = fake_analyst._build_prompt(testco_context)
         # Prompt should reference how many periods were analyzed
         assert "1" in prompt
 
-    def test_build_prompt_default_section_is_narrative(self):
-        pr = PeriodResult(period="Q1")
-        result = AnalysisResult(company="TestCo", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
+    def test_build_prompt_default_section_is_narrative(self, fake_analyst, testco_context):
         # Default section should render cashflow_story_narrative template
-        prompt = analyst._build_prompt(context)
+        prompt = fake_analyst._build_prompt(testco_context)
         assert "TestCo" in prompt
         # Template marker from prompts.py
         assert "board" in prompt.lower() or "cash" in prompt.lower()
 
-    def test_build_prompt_executive_summary_section(self):
-        pr = PeriodResult(period="Q1")
-        result = AnalysisResult(company="TestCo", periods=[pr])
-        analyst = CashFlowStoryAnalyst(api_key="fake")
-        context = analyst._build_context(result)
-        prompt = analyst._build_prompt(context, section="executive_summary")
+    def test_build_prompt_executive_summary_section(self, fake_analyst, testco_context):
+        prompt = fake_analyst._build_prompt(testco_context, section="executive_summary")
         assert "executive summary" in prompt.lower() or "Context" in prompt
 
-    def test_analyze_calls_api(self):
-        mock_module = _make_anthropic_mock("AI narrative response")
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1", net_revenue=Decimal("1000"))
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            narrative = analyst.analyze(result)
+    def test_analyze_calls_api(self, anthropic_mock):
+        pr = PeriodResult(period="Q1", net_revenue=Decimal("1000"))
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        narrative = analyst.analyze(result)
 
         assert narrative == "AI narrative response"
-        mock_module._mock_client.messages.create.assert_called_once()
+        anthropic_mock._create.assert_called_once()
 
-    def test_analyze_returns_text_from_first_content_block(self):
-        mock_module = _make_anthropic_mock()
+    def test_analyze_returns_text_from_first_content_block(self, anthropic_mock):
         # Override content to have two blocks
-        block1 = MagicMock(text="First block content")
-        block2 = MagicMock(text="Second block content")
-        mock_module._mock_client.messages.create.return_value.content = [block1, block2]
+        anthropic_mock._create.return_value = _anthropic_response(
+            "First block content", "Second block content"
+        )
 
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            narrative = analyst.analyze(result)
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        narrative = analyst.analyze(result)
 
         # Should return only the first content block
         assert narrative == "First block content"
 
-    def test_analyze_creates_client_with_api_key(self):
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="my-secret-key")
-            analyst.analyze(result)
+    def test_analyze_creates_client_with_api_key(self, anthropic_mock):
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="my-secret-key")
+        analyst.analyze(result)
 
-        mock_module.Anthropic.assert_called_once_with(api_key="my-secret-key")
+        anthropic_mock.Anthropic.assert_called_once_with(api_key="my-secret-key")
 
-    def test_analyze_uses_configured_model(self):
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key", model="claude-opus-4-6")
-            analyst.analyze(result)
+    def test_analyze_uses_configured_model(self, anthropic_mock):
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key", model="claude-opus-4-6")
+        analyst.analyze(result)
 
-        call_kwargs = mock_module._mock_client.messages.create.call_args[1]
+        call_kwargs = anthropic_mock._create.call_args[1]
         assert call_kwargs["model"] == "claude-opus-4-6"
 
-    def test_analyze_uses_configured_temperature(self):
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key", temperature=0.5)
-            analyst.analyze(result)
+    def test_analyze_uses_configured_temperature(self, anthropic_mock):
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key", temperature=0.5)
+        analyst.analyze(result)
 
-        call_kwargs = mock_module._mock_client.messages.create.call_args[1]
+        call_kwargs = anthropic_mock._create.call_args[1]
         assert call_kwargs["temperature"] == 0.5
 
-    def test_analyze_sends_system_prompt(self):
+    def test_analyze_sends_system_prompt(self, anthropic_mock):
         from src.ai.prompts import SYSTEM_PROMPT
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            analyst.analyze(result)
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        analyst.analyze(result)
 
-        call_kwargs = mock_module._mock_client.messages.create.call_args[1]
+        call_kwargs = anthropic_mock._create.call_args[1]
         assert call_kwargs["system"] == SYSTEM_PROMPT
 
-    def test_analyze_sends_user_message(self):
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="MyCompany", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            analyst.analyze(result)
+    def test_analyze_sends_user_message(self, anthropic_mock):
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="MyCompany", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        analyst.analyze(result)
 
-        call_kwargs = mock_module._mock_client.messages.create.call_args[1]
+        call_kwargs = anthropic_mock._create.call_args[1]
         messages = call_kwargs["messages"]
         assert len(messages) == 1
         assert messages[0]["role"] == "user"
         assert "MyCompany" in messages[0]["content"]
 
-    def test_analyze_sets_max_tokens(self):
-        mock_module = _make_anthropic_mock()
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            analyst.analyze(result)
+    def test_analyze_sets_max_tokens(self, anthropic_mock):
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        analyst.analyze(result)
 
-        call_kwargs = mock_module._mock_client.messages.create.call_args[1]
+        call_kwargs = anthropic_mock._create.call_args[1]
         assert call_kwargs["max_tokens"] == 4000
 
-    def test_analyze_no_real_api_calls(self):
+    def test_analyze_no_real_api_calls(self, anthropic_mock):
         """Verify test isolation: the real anthropic module is never called."""
-        mock_module = _make_anthropic_mock("mocked")
-        with patch.dict(sys.modules, {"anthropic": mock_module}):
-            pr = PeriodResult(period="Q1")
-            result = AnalysisResult(company="Test", periods=[pr])
-            analyst = CashFlowStoryAnalyst(api_key="test-key")
-            analyst.analyze(result)
+        pr = PeriodResult(period="Q1")
+        result = AnalysisResult(company="Test", periods=[pr])
+        analyst = CashFlowStoryAnalyst(api_key="test-key")
+        analyst.analyze(result)
 
         # Confirm mock was used, not real client
-        assert mock_module.Anthropic.called
-        assert mock_module._mock_client.messages.create.called
-
-    def test_api_key_none_when_env_missing(self):
-        with patch.dict("os.environ", {}, clear=True):
-            analyst = CashFlowStoryAnalyst()
-            assert analyst.api_key is None
-
-    def test_explicit_api_key_overrides_env(self):
-        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "env-key"}):
-            analyst = CashFlowStoryAnalyst(api_key="explicit-key")
-            assert analyst.api_key == "explicit-key"
+        assert anthropic_mock.Anthropic.called
+        assert anthropic_mock._create.called
+
+    def test_api_key_none_when_env_missing(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        analyst = CashFlowStoryAnalyst()
+        assert analyst.api_key is None
+
+    def test_explicit_api_key_overrides_env(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+        analyst = CashFlowStoryAnalyst(api_key="explicit-key")
+        assert analyst.api_key == "explicit-key"
@@ -0,0 +1,81 @@
+"""Tests for batch balance sheet validation."""
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from src.models import PeriodResult
+from src.utils.batch_validators import (
+    _balance_sheet_flags_numpy,
+    periods_to_cents,
+    validate_periods_batch,
+)
+from src.utils.validators import (
+    BALANCE_SHEET_FIELDS,
+    ValidationIssue,
+    _validate_balance_sheet_fast,
+    cents_of,
+)
+
+
+def _periods() -> list[PeriodResult]:
+    base = {
+        'accounts_receivable': Decimal('18500000.00'),
+        'inventory': Decimal('3200000.00'),
+        'ppe_net': Decimal('45000000.00'),
+        'total_debt': Decimal('37000000.00'),
+        'net_debt': Decimal('35800000.00'),
+        'accounts_payable': Decimal('8900000.00'),
+        'shareholders_equity': Decimal('22000000.00'),
+    }
+    return [
+        PeriodResult(period='Q1_2025', **base),
+        PeriodResult(period='Q2_2025', **{**base, 'shareholders_equity': Decimal('30000000.00')}),
+        PeriodResult(period='Q3_2025', **{**base, 'shareholders_equity': Decimal('-1.00')}),
+        PeriodResult(period='Q4_2025', **{**base, 'other_capital_net': Decimal('-5000000.00')}),
+        PeriodResult(period='Q1_2026'),
+    ]
+
+
+class TestPeriodsToCents:
+    def test_shape_and_values(self):
+        cents = periods_to_cents(_periods())
+        assert cents.shape == (5, len(BALANCE_SHEET_FIELDS))
+        assert cents.dtype == np.int64
+        assert cents[0, 0] == 1850000000
+
+    def test_empty_input(self):
+        assert periods_to_cents([]).shape == (0, len(BALANCE_SHEET_FIELDS))
+
+
+class TestValidatePeriodsBatch:
+    def test_matches_scalar_fast_path(self):
+        periods = _periods()
+        flags = validate_periods_batch(periods_to_cents(periods))
+        expected = [
+            _validate_balance_sheet_fast(*cents_of(pr, BALANCE_SHEET_FIELDS))[1]
+            for pr in periods
+        ]
+        assert flags.tolist() == expected
+
+    def test_numpy_fallback_matches(self):
+        cents = periods_to_cents(_periods())
+        assert np.array_equal(_balance_sheet_flags_numpy(cents), validate_periods_batch(cents))
+
+    def test_empty_period_flags_errors(self):
+        flags = validate_periods_batch(periods_to_cents([PeriodResult(period='Q1')]))
+        assert ValidationIssue(int(flags[0])) == (
+            ValidationIssue.NON_POSITIVE_ASSETS | ValidationIssue.NON_POSITIVE_LIAB_EQUITY
+        )
+
+    def test_rejects_wrong_shape(self):
+        with pytest.raises(ValueError, match="Expected an"):
+            validate_periods_batch(np.zeros((3, 4), dtype=np.int64))
+
+    def test_numba_kernel_matches_numpy_fallback(self):
+        pytest.importorskip("numba")
+        from src.utils.batch_validators import _balance_sheet_flags_numba
+
+        cents = periods_to_cents(_periods())
+        assert np.array_equal(
+            _balance_sheet_flags_numba(cents), _balance_sheet_flags_numpy(cents)
+        )
@@ -2,42 +2,10 @@
 import pytest
 from decimal import Decimal
 
-from src.models import MappedData, PeriodResult
-from src.calc.income_statement import calculate_income_statement
-from src.calc.working_capital import calculate_working_capital
-from src.calc.balance_sheet import estimate_balance_sheet
-from src.calc.cash_flow import calculate_cash_flow
-from src.calc.ratios import calculate_ratios
+from src.models import PeriodResult
 from src.calc.cash_quality import classify_cash_quality
 
 
-def _build_period_result_q1() -> PeriodResult:
-    """Build a full PeriodResult from AUSTA Q1 data through the calc chain."""
-    mapped = MappedData(
-        company='AUSTA', period='Q1_2025', period_type='quarter', days_in_period=91,
-        gross_revenue=Decimal('40100000'), returns_deductions=Decimal('2500000'),
-        cogs=Decimal('30650000'), operating_expenses=Decimal('19650000'),
-        financial_expenses=Decimal('1200000'), financial_income=Decimal('150000'),
-        accounts_receivable=Decimal('18500000'), inventory=Decimal('3200000'),
-        accounts_payable=Decimal('8900000'), cash=Decimal('1200000'),
-        short_term_debt=Decimal('12000000'), long_term_debt=Decimal('25000000'),
-        shareholders_equity=Decimal('35000000'), ppe_gross=Decimal('45000000'),
-    )
-    is_result = calculate_income_statement(mapped)
-    wc_result = calculate_working_capital(mapped, days_in_period=mapped.days_in_period)
-    merged = is_result.model_copy(update={
-        'days_sales_outstanding': wc_result.days_sales_outstanding,
-        'days_inventory_outstanding': wc_result.days_inventory_outstanding,
-        'days_payable_outstanding': wc_result.days_payable_outstanding,
-        'cash_conversion_cycle': wc_result.cash_conversion_cycle,
-        'working_capital': wc_result.working_capital,
-        'working_capital_investment': wc_result.working_capital_investment,
-    })
-    bs_result = estimate_balance_sheet(merged)
-    cf_result = calculate_cash_flow(bs_result)
-    return calculate_ratios(cf_result)
-
-
 def _make_pr(**kwargs) -> PeriodResult:
     """Create a PeriodResult with specified fields for targeted grading tests."""
     defaults = {'period': 'TEST'}
@@ -45,6 +13,11 @@ def _make_pr(**kwargs) -> PeriodResult:
     return PeriodResult(**defaults)
 
 
+def _metrics_by_id(pr: PeriodResult) -> dict:
+    """Classify ``pr`` and index the resulting metrics by metric id."""
+    return {m.metric: m for m in classify_cash_quality(pr)}
+
+
 class TestCashQuality:
     """Test suite for cash quality assessment."""
 
@@ -54,8 +27,8 @@ class TestCashQuality:
             operating_cash_flow=Decimal('30000'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ocf = next(m for m in metrics if m.metric == "ocf_margin")
+        by_metric = _metrics_by_id(pr)
+        ocf = by_metric["ocf_margin"]
         assert ocf.grade == "G"
         assert ocf.value == Decimal('30')
         assert ocf.direction == "higher"
@@ -67,8 +40,8 @@ class TestCashQuality:
             operating_cash_flow=Decimal('15000'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ocf = next(m for m in metrics if m.metric == "ocf_margin")
+        by_metric = _metrics_by_id(pr)
+        ocf = by_metric["ocf_margin"]
         assert ocf.grade == "A"
         assert ocf.value == Decimal('15')
 
@@ -78,8 +51,8 @@ class TestCashQuality:
             operating_cash_flow=Decimal('5000'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ocf = next(m for m in metrics if m.metric == "ocf_margin")
+        by_metric = _metrics_by_id(pr)
+        ocf = by_metric["ocf_margin"]
         assert ocf.grade == "B"
         assert ocf.value == Decimal('5')
 
@@ -89,8 +62,8 @@ class TestCashQuality:
             cash_conversion_cycle=Decimal('25'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ccc = next(m for m in metrics if m.metric == "ccc_days")
+        by_metric = _metrics_by_id(pr)
+        ccc = by_metric["ccc_days"]
         assert ccc.grade == "G"
         assert ccc.value == Decimal('25')
         assert ccc.direction == "lower"
@@ -101,8 +74,8 @@ class TestCashQuality:
             cash_conversion_cycle=Decimal('90'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ccc = next(m for m in metrics if m.metric == "ccc_days")
+        by_metric = _metrics_by_id(pr)
+        ccc = by_metric["ccc_days"]
         assert ccc.grade == "B"
         assert ccc.value == Decimal('90')
 
@@ -112,8 +85,8 @@ class TestCashQuality:
             working_capital=Decimal('8000'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        wc = next(m for m in metrics if m.metric == "wc_revenue")
+        by_metric = _metrics_by_id(pr)
+        wc = by_metric["wc_revenue"]
         assert wc.grade == "G"
         assert wc.value == Decimal('8')
         assert wc.label_pt == "Capital de Giro / Receita %"
@@ -127,18 +100,16 @@ class TestCashQuality:
             ebitda=Decimal('60000'),
             net_revenue=Decimal('100000'),
         )
-        metrics = classify_cash_quality(pr)
-        ic = next(m for m in metrics if m.metric == "interest_coverage")
+        by_metric = _metrics_by_id(pr)
+        ic = by_metric["interest_coverage"]
         assert ic.grade == "G"
         assert ic.value == Decimal('10')
-        nd = next(m for m in metrics if m.metric == "net_debt_ebitda")
+        nd = by_metric["net_debt_ebitda"]
         assert nd.grade == "G"
 
-    def test_blue_consulting_grades(self):
+    def test_blue_consulting_grades(self, austa_q1_metrics):
         """Test Blue Consulting case study cash quality grades."""
-        pr = _build_period_result_q1()
-        metrics = classify_cash_quality(pr)
-        by_metric = {m.metric: m for m in metrics}
+        by_metric = {m.metric: m for m in austa_q1_metrics}
         # OCF margin: deeply negative → B
         assert by_metric["ocf_margin"].grade == "B"
         # FCF: deeply negative → B
@@ -150,13 +121,12 @@ class TestCashQuality:
         # Interest coverage: ebit negative / fin_expenses → B
         assert by_metric["interest_coverage"].grade == "B"
         # All values are Decimal
-        for m in metrics:
+        for m in by_metric.values():
             assert isinstance(m.value, Decimal)
 
-    def test_all_metrics_returned(self):
+    def test_all_metrics_returned(self, austa_q1_metrics):
         """Test all metrics are returned in results."""
-        pr = _build_period_result_q1()
-        metrics = classify_cash_quality(pr)
+        metrics = austa_q1_metrics
         assert len(metrics) == 6
         metric_ids = {m.metric for m in metrics}
         expected = {"ocf_margin", "free_cash_flow", "wc_revenue", "ccc_days", "net_debt_ebitda", "interest_coverage"}
@@ -0,0 +1,175 @@
+"""Tests for structured logging setup."""
+import logging
+
+import pytest
+import structlog
+
+from src.utils.logger import (
+    _stop_file_listener,
+    get_logger,
+    reset_logger_cache,
+    setup_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def _restore_root_logger():
+    """Undo dictConfig side effects so other test modules see a clean root."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    _stop_file_listener()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    structlog.reset_defaults()
+    reset_logger_cache()
+
+
+class TestGetLogger:
+    def test_same_name_returns_cached_logger(self):
+        assert get_logger("src.pipeline") is get_logger("src.pipeline")
+
+    def test_different_names_return_distinct_loggers(self):
+        assert get_logger("src.pipeline") is not get_logger("src.calc")
+
+    def test_reset_logger_cache(self):
+        first = get_logger("src.pipeline")
+        reset_logger_cache()
+        assert get_logger("src.pipeline") is not first
+
+    def test_setup_logging_resets_cache(self):
+        first = get_logger("src.pipeline")
+        setup_logging()
+        assert get_logger("src.pipeline") is not first
+
+
+class TestSetupLogging:
+    def test_templates_not_mutated(self, tmp_path):
+        from src.utils import logger as logger_mod
+
+        before = repr(logger_mod._STRUCTURED_TEMPLATE)
+        setup_logging(level=logging.DEBUG, log_file=str(tmp_path / "app.log"))
+        assert repr(logger_mod._STRUCTURED_TEMPLATE) == before
+
+    def test_root_level_applied(self):
+        setup_logging(level=logging.WARNING, structured=False)
+        assert logging.getLogger().level == logging.WARNING
+
+    def test_structured_event_is_json(self, capfd):
+        import json
+
+        setup_logging()
+        get_logger("src.test").info("evt", records=3)
+        line = capfd.readouterr().out.strip().splitlines()[-1]
+        event = json.loads(line)
+        assert event["records"] == 3
+        assert event["ts"].endswith("Z")
+        assert "timestamp" not in event
+
+    def test_stdlib_record_passes_through(self, capsys):
+        setup_logging()
+        logging.getLogger("src.test").info("Ingest complete: %d entries", 20)
+        assert "Ingest complete: 20 entries" in capsys.readouterr().out
+
+
+class TestRawStdoutSink:
+    def test_console_only_uses_raw_sink(self):
+        from src.utils.logger import RawStdoutLoggerFactory
+
+        setup_logging()
+        factory = structlog.get_config()["logger_factory"]
+        assert isinstance(factory, RawStdoutLoggerFactory)
+
+    def test_file_logging_keeps_stdlib_chain(self, tmp_path):
+        setup_logging(log_file=str(tmp_path / "app.log"))
+        factory = structlog.get_config()["logger_factory"]
+        assert isinstance(factory, structlog.stdlib.LoggerFactory)
+
+    def test_level_filtering(self, capfd):
+        setup_logging(level=logging.WARNING)
+        get_logger("src.test").info("dropped")
+        get_logger("src.test").warning("kept")
+        out = capfd.readouterr().out
+        assert "dropped" not in out
+        assert '"kept"' in out
+
+    def test_event_includes_logger_name(self, capfd):
+        import json
+
+        setup_logging()
+        get_logger("src.pipeline").info("evt")
+        event = json.loads(capfd.readouterr().out.strip().splitlines()[-1])
+        assert event["logger"] == "src.pipeline"
+        assert event["level"] == "info"
+
+
+class TestFileLogging:
+    def test_root_gets_queue_handler(self, tmp_path):
+        import logging.handlers
+
+        setup_logging(log_file=str(tmp_path / "app.log"))
+        handler_types = {type(h) for h in logging.getLogger().handlers}
+        assert logging.handlers.QueueHandler in handler_types
+        assert logging.FileHandler not in handler_types
+
+    def test_records_reach_file_after_flush(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        setup_logging(log_file=str(log_file), structured=False)
+        logging.getLogger("src.test").info("Map complete: %d period(s)", 2)
+        _stop_file_listener()
+        assert "Map complete: 2 period(s)" in log_file.read_text(encoding="utf-8")
+
+    def test_file_flushed_when_queue_drains(self, tmp_path):
+        """Records reach disk without stopping the writer once the queue is empty."""
+        import time
+
+        log_file = tmp_path / "app.log"
+        setup_logging(log_file=str(log_file), structured=False)
+        logging.getLogger("src.test").info("Ingest complete")
+
+        deadline = time.monotonic() + 5
+        while "Ingest complete" not in log_file.read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline, "record not flushed while listener runs"
+            time.sleep(0.01)
+
+    def test_structured_events_reach_file(self, tmp_path):
+        import json
+
+        log_file = tmp_path / "app.log"
+        setup_logging(log_file=str(log_file))
+        get_logger("src.test").info("evt", records=3)
+        _stop_file_listener()
+        event = json.loads(log_file.read_text(encoding="utf-8").splitlines()[-1])
+        assert event["records"] == 3
+
+
+class TestBinaryFileHandler:
+    def test_writes_formatted_text_as_utf8(self, tmp_path):
+        from src.utils.logger import BinaryFileHandler
+
+        path = tmp_path / "bin.log"
+        handler = BinaryFileHandler(str(path))
+        record = logging.LogRecord("src", logging.INFO, __file__, 1, "Período %s", ("Q1",), None)
+        handler.emit(record)
+        handler.close()
+        assert path.read_bytes() == "Período Q1\n".encode("utf-8")
+
+    def test_writes_bytes_message_verbatim(self, tmp_path):
+        from src.utils.logger import BinaryFileHandler
+
+        path = tmp_path / "bin.log"
+        handler = BinaryFileHandler(str(path))
+        record = logging.LogRecord("src", logging.INFO, __file__, 1, b'{"event":"x"}', None, None)
+        handler.emit(record)
+        handler.close()
+        assert path.read_bytes() == b'{"event":"x"}\n'
+
+    def test_appends_to_existing_file(self, tmp_path):
+        from src.utils.logger import BinaryFileHandler
+
+        path = tmp_path / "bin.log"
+        path.write_bytes(b"first\n")
+        handler = BinaryFileHandler(str(path))
+        handler.emit(logging.LogRecord("src", logging.INFO, __file__, 1, "second", None, None))
+        handler.close()
+        assert path.read_bytes() == b"first\nsecond\n"
@@ -6,11 +6,7 @@ from unittest.mock import patch, MagicMock
 
 from src.models import MappedData, PeriodResult, AnalysisResult, AccountEntry
 from src.calc import (
-    calculate_income_statement,
-    calculate_working_capital,
-    estimate_balance_sheet,
-    calculate_cash_flow,
-    calculate_ratios,
+    calculate_period,
     calculate_power_of_one,
     classify_cash_quality,
     calculate_marginal_cash_flow,
@@ -19,7 +15,6 @@ from src.ai.analyst import CashFlowStoryAnalyst
 from src.output.excel_report import ExcelReportGenerator
 from src.output.html_dashboard import HTMLDashboardGenerator
 from src.output.json_export import JSONExporter
-from src.ingest.xml_parser import ERPXMLParser
 from src.ingest.account_mapper import AccountMapper
 
 
@@ -47,95 +42,86 @@ def _build_mapped(data: dict) -> MappedData:
     )
 
 
-def _run_calc_chain(mapped: MappedData) -> PeriodResult:
-    """Run the full calculation chain on a single MappedData."""
-    is_result = calculate_income_statement(mapped)
-    wc_result = calculate_working_capital(mapped, days_in_period=mapped.days_in_period)
-    merged = is_result.model_copy(update={
-        'days_sales_outstanding': wc_result.days_sales_outstanding,
-        'days_inventory_outstanding': wc_result.days_inventory_outstanding,
-        'days_payable_outstanding': wc_result.days_payable_outstanding,
-        'cash_conversion_cycle': wc_result.cash_conversion_cycle,
-        'working_capital': wc_result.working_capital,
-        'working_capital_investment': wc_result.working_capital_investment,
-    })
-    bs_result = estimate_balance_sheet(merged)
-    cf_result = calculate_cash_flow(bs_result)
-    return calculate_ratios(cf_result)
+@pytest.fixture(scope="module")
+def mapped_q1(sample_mapped_data_q1) -> MappedData:
+    """Q1 MappedData built once for the module."""
+    return _build_mapped(sample_mapped_data_q1)
+
+
+@pytest.fixture(scope="module")
+def q1_result(mapped_q1) -> PeriodResult:
+    """Q1 run through the calc chain once; tests must treat it as read-only."""
+    return calculate_period(mapped_q1)
+
+
+@pytest.fixture(scope="module")
+def q2_result(sample_mapped_data_q2) -> PeriodResult:
+    """Q2 run through the calc chain once; tests must treat it as read-only."""
+    return calculate_period(_build_mapped(sample_mapped_data_q2))
+
+
+@pytest.fixture(scope="module")
+def q1_analysis(mapped_q1, q1_result) -> AnalysisResult:
+    """Single-period AnalysisResult for Q1 with Power of One and cash quality."""
+    return AnalysisResult(
+        company=mapped_q1.company,
+        periods=[q1_result],
+        power_of_one=calculate_power_of_one(q1_result),
+        cash_quality=classify_cash_quality(q1_result),
+    )
+
+
+@pytest.fixture(scope="module")
+def render_dir(tmp_path_factory) -> Path:
+    """Output directory shared by the render tests; each test uses its own filenames."""
+    return tmp_path_factory.mktemp("renders")
 
 
 class TestPipelineEndToEnd:
     """End-to-end pipeline integration tests."""
 
-    def test_runs_with_sample_data(self, sample_mapped_data_q1):
+    def test_runs_with_sample_data(self, q1_result):
         """Test pipeline runs successfully with sample data."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
+        pr = q1_result
         assert pr.net_revenue > Decimal("0")
         assert pr.ebitda is not None
         assert pr.operating_cash_flow is not None
 
-    def test_produces_all_formats(self, sample_mapped_data_q1, tmp_path):
+    @pytest.mark.parametrize(
+        "filename,generator_cls,method",
+        [
+            pytest.param("report.xlsx", ExcelReportGenerator, "generate", id="xlsx"),
+            pytest.param("dashboard.html", HTMLDashboardGenerator, "generate", id="html"),
+            pytest.param("export.json", JSONExporter, "export", id="json"),
+        ],
+    )
+    def test_produces_all_formats(self, q1_analysis, render_dir, filename, generator_cls, method):
         """Test pipeline produces all output formats (JSON, Excel, HTML)."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
-        levers = calculate_power_of_one(pr)
-        cq = classify_cash_quality(pr)
-        result = AnalysisResult(
-            company=mapped.company,
-            periods=[pr],
-            power_of_one=levers,
-            cash_quality=cq,
-        )
-
-        excel_path = tmp_path / "report.xlsx"
-        html_path = tmp_path / "dashboard.html"
-        json_path = tmp_path / "export.json"
-
-        ExcelReportGenerator(str(excel_path)).generate(result)
-        HTMLDashboardGenerator(str(html_path)).generate(result)
-        JSONExporter(str(json_path)).export(result)
+        path = render_dir / filename
+        getattr(generator_cls(str(path)), method)(q1_analysis)
+        assert path.exists() and path.stat().st_size > 0
 
-        assert excel_path.exists() and excel_path.stat().st_size > 0
-        assert html_path.exists() and html_path.stat().st_size > 0
-        assert json_path.exists() and json_path.stat().st_size > 0
-
-    def test_works_without_ai(self, sample_mapped_data_q1):
+    def test_works_without_ai(self, mapped_q1, q1_result):
         """Test pipeline works without AI analysis components."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
-        result = AnalysisResult(company=mapped.company, periods=[pr])
+        result = AnalysisResult(company=mapped_q1.company, periods=[q1_result])
         assert result.ai_insights is None
         assert len(result.periods) == 1
         assert result.periods[0].net_revenue > Decimal("0")
 
-    def test_single_period_analysis(self, sample_mapped_data_q1):
+    def test_single_period_analysis(self, q1_analysis):
         """Test pipeline analysis on single period."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
-        levers = calculate_power_of_one(pr)
-        cq = classify_cash_quality(pr)
-        result = AnalysisResult(
-            company=mapped.company,
-            periods=[pr],
-            power_of_one=levers,
-            cash_quality=cq,
-        )
+        result = q1_analysis
         assert len(result.periods) == 1
         assert len(result.power_of_one) == 7
         assert len(result.cash_quality) == 6
 
-    def test_multi_period_analysis(self, sample_mapped_data_q1, sample_mapped_data_q2):
+    def test_multi_period_analysis(self, mapped_q1, q1_result, q2_result):
         """Test pipeline with multiple periods for trend comparison."""
-        m1 = _build_mapped(sample_mapped_data_q1)
-        m2 = _build_mapped(sample_mapped_data_q2)
-        pr1 = _run_calc_chain(m1)
-        pr2 = _run_calc_chain(m2)
-        mcf = calculate_marginal_cash_flow(pr2)
+        mcf = calculate_marginal_cash_flow(q2_result)
         assert 'mcf_percent' in mcf
         result = AnalysisResult(
-            company=m1.company,
-            periods=[pr1, pr2],
+            company=mapped_q1.company,
+            periods=[q1_result, q2_result],
             marginal_cash_flow=mcf,
         )
         assert len(result.periods) == 2
@@ -157,11 +143,10 @@ class TestPipelineEndToEnd:
         assert "started_at" in pipeline.audit_trail
         assert "stages" in pipeline.audit_trail
 
-    def test_idempotent_processing(self, sample_mapped_data_q1):
+    def test_idempotent_processing(self, mapped_q1, q1_result):
         """Test pipeline processing is idempotent."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr1 = _run_calc_chain(mapped)
-        pr2 = _run_calc_chain(mapped)
+        pr1 = q1_result
+        pr2 = calculate_period(mapped_q1)
         assert pr1.net_revenue == pr2.net_revenue
         assert pr1.ebitda == pr2.ebitda
         assert pr1.operating_cash_flow == pr2.operating_cash_flow
@@ -171,9 +156,8 @@ class TestPipelineEndToEnd:
         with pytest.raises(FileNotFoundError):
             AccountMapper("/nonexistent/config.yaml")
 
-    def test_unmapped_accounts_warning(self, sample_mapped_data_q1):
+    def test_unmapped_accounts_warning(self, mapper):
         """Test pipeline warns on unmapped accounts."""
-        mapper = AccountMapper("config/companies/austa.yaml")
         entries = [
             AccountEntry(
                 code="9.9.99",
@@ -189,54 +173,36 @@ class TestPipelineEndToEnd:
 class TestPipelineStages:
     """Test individual pipeline stages."""
 
-    def test_ingest_stage(self):
+    def test_ingest_stage(self, xml_entries):
         """Test data ingestion stage."""
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
+        entries = xml_entries
         assert len(entries) >= 5
         assert all(hasattr(e, 'code') for e in entries)
 
-    def test_map_stage(self, sample_mapped_data_q1):
+    def test_map_stage(self, mapper, xml_entries):
         """Test account mapping stage."""
-        parser = ERPXMLParser("tests/fixtures/sample_balancete.xml")
-        entries = parser.parse_balancete()
-        mapper = AccountMapper("config/companies/austa.yaml")
-        mapped = mapper.map_accounts(entries, "Q1_2025")
+        mapped = mapper.map_accounts(xml_entries, "Q1_2025")
         # The XML has revenue code 3.1 with saldo 40100000.00
         assert isinstance(mapped, MappedData)
         assert mapped.gross_revenue != Decimal("0") or mapped.gross_revenue == Decimal("0")
 
-    def test_calculate_stage(self, sample_mapped_data_q1):
+    def test_calculate_stage(self, q1_result):
         """Test metrics calculation stage."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
+        pr = q1_result
         assert pr.ebitda != Decimal("0")
         assert pr.operating_cash_flow is not None
         assert pr.current_ratio != Decimal("0")
 
-    def test_compare_stage(self, sample_mapped_data_q1, sample_mapped_data_q2):
+    def test_compare_stage(self, q2_result):
         """Test period comparison stage."""
-        m1 = _build_mapped(sample_mapped_data_q1)
-        m2 = _build_mapped(sample_mapped_data_q2)
-        pr1 = _run_calc_chain(m1)
-        pr2 = _run_calc_chain(m2)
-        mcf = calculate_marginal_cash_flow(pr2)
+        mcf = calculate_marginal_cash_flow(q2_result)
         assert isinstance(mcf, dict)
         assert 'mcf_percent' in mcf
         assert 'cash_per_1pct_growth' in mcf
 
-    def test_analyze_stage_mocked(self, sample_mapped_data_q1):
+    def test_analyze_stage_mocked(self, q1_analysis):
         """Test analysis stage with mocked AI components."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
-        levers = calculate_power_of_one(pr)
-        cq = classify_cash_quality(pr)
-        result = AnalysisResult(
-            company=mapped.company,
-            periods=[pr],
-            power_of_one=levers,
-            cash_quality=cq,
-        )
+        result = q1_analysis
         with patch.object(CashFlowStoryAnalyst, 'analyze') as mock_analyze:
             mock_analyze.return_value = "Mocked AI insights"
             analyst = CashFlowStoryAnalyst(api_key="fake-key")
@@ -244,17 +210,10 @@ class TestPipelineStages:
             mock_analyze.assert_called_once_with(result)
             assert insights == "Mocked AI insights"
 
-    def test_render_stage(self, sample_mapped_data_q1, tmp_path):
+    def test_render_stage(self, q1_analysis, render_dir):
         """Test output rendering stage."""
-        mapped = _build_mapped(sample_mapped_data_q1)
-        pr = _run_calc_chain(mapped)
-        result = AnalysisResult(
-            company="Test",
-            periods=[pr],
-            power_of_one=calculate_power_of_one(pr),
-            cash_quality=classify_cash_quality(pr),
-        )
-        JSONExporter(str(tmp_path / "test.json")).export(result)
-        HTMLDashboardGenerator(str(tmp_path / "test.html")).generate(result)
-        assert (tmp_path / "test.json").exists()
-        assert (tmp_path / "test.html").exists()
+        result = q1_analysis
+        JSONExporter(str(render_dir / "stage.json")).export(result)
+        HTMLDashboardGenerator(str(render_dir / "stage.html")).generate(result)
+        assert (render_dir / "stage.json").exists()
+        assert (render_dir / "stage.html").exists()
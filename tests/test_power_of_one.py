@@ -1,135 +1,108 @@
 """Test Power of One sensitivity analysis for margin improvement levers."""
 import pytest
 from decimal import Decimal
+from types import MappingProxyType
 
-from src.models import MappedData, PeriodResult
-from src.calc.income_statement import calculate_income_statement
-from src.calc.working_capital import calculate_working_capital
-from src.calc.balance_sheet import estimate_balance_sheet
-from src.calc.cash_flow import calculate_cash_flow
-from src.calc.ratios import calculate_ratios
+from src.models import PeriodResult
 from src.calc.power_of_one import calculate_power_of_one
 
+# Expected-value constants, built once rather than parsed in every test
+_ZERO = Decimal('0')
+_ONE = Decimal('1')
+_ONE_PCT = Decimal('0.01')
+_HUNDRED = Decimal('100')
+_DAYS_IN_YEAR = Decimal('365')
+_VALUATION_MULTIPLE = Decimal('6.0')
 
-def _build_period_result_q1() -> PeriodResult:
-    """Build a full PeriodResult from AUSTA Q1 data through the calc chain."""
-    mapped = MappedData(
-        company='AUSTA', period='Q1_2025', period_type='quarter', days_in_period=91,
-        gross_revenue=Decimal('40100000'), returns_deductions=Decimal('2500000'),
-        cogs=Decimal('30650000'), operating_expenses=Decimal('19650000'),
-        financial_expenses=Decimal('1200000'), financial_income=Decimal('150000'),
-        accounts_receivable=Decimal('18500000'), inventory=Decimal('3200000'),
-        accounts_payable=Decimal('8900000'), cash=Decimal('1200000'),
-        short_term_debt=Decimal('12000000'), long_term_debt=Decimal('25000000'),
-        shareholders_equity=Decimal('35000000'), ppe_gross=Decimal('45000000'),
-    )
-    is_result = calculate_income_statement(mapped)
-    wc_result = calculate_working_capital(mapped, days_in_period=mapped.days_in_period)
-    merged = is_result.model_copy(update={
-        'days_sales_outstanding': wc_result.days_sales_outstanding,
-        'days_inventory_outstanding': wc_result.days_inventory_outstanding,
-        'days_payable_outstanding': wc_result.days_payable_outstanding,
-        'cash_conversion_cycle': wc_result.cash_conversion_cycle,
-        'working_capital': wc_result.working_capital,
-        'working_capital_investment': wc_result.working_capital_investment,
-    })
-    bs_result = estimate_balance_sheet(merged)
-    cf_result = calculate_cash_flow(bs_result)
-    return calculate_ratios(cf_result)
+
+@pytest.fixture(scope="module")
+def levers_by_id(austa_q1_levers):
+    """``austa_q1_levers`` indexed by lever id, built once for the module."""
+    return MappingProxyType({lv.lever: lv for lv in austa_q1_levers})
 
 
 class TestPowerOfOne:
     """Test suite for Power of One sensitivity analysis."""
 
-    def test_price_lever(self):
+    def test_price_lever(self, austa_q1_result, levers_by_id):
         """Test 1% price increase impact on profitability."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        revenue_lever = next(lv for lv in levers if lv.lever == "revenue")
-        expected_change = pr.net_revenue * Decimal('0.01')
+        pr = austa_q1_result
+        revenue_lever = levers_by_id["revenue"]
+        expected_change = pr.net_revenue * _ONE_PCT
         assert revenue_lever.change_amount == expected_change
         assert revenue_lever.label_pt == "Receita"
         assert revenue_lever.current_value == pr.net_revenue
         assert isinstance(revenue_lever.profit_impact, Decimal)
 
-    def test_volume_lever(self):
+    def test_volume_lever(self, austa_q1_result, levers_by_id):
         """Test 1% volume increase impact (net of variable costs)."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        revenue_lever = next(lv for lv in levers if lv.lever == "revenue")
-        ebit_margin = pr.ebit_margin_pct / Decimal('100')
+        pr = austa_q1_result
+        revenue_lever = levers_by_id["revenue"]
+        ebit_margin = pr.ebit_margin_pct / _HUNDRED
         expected_profit = revenue_lever.change_amount * ebit_margin
         assert revenue_lever.profit_impact == expected_profit
         assert revenue_lever.cash_impact == revenue_lever.profit_impact
 
-    def test_cogs_lever(self):
+    def test_cogs_lever(self, austa_q1_result, levers_by_id):
         """Test 1% COGS reduction impact on profitability."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        cogs_lever = next(lv for lv in levers if lv.lever == "cogs")
-        expected_change = pr.cogs * Decimal('0.01')
+        pr = austa_q1_result
+        cogs_lever = levers_by_id["cogs"]
+        expected_change = pr.cogs * _ONE_PCT
         assert cogs_lever.change_amount == expected_change
         assert cogs_lever.profit_impact == expected_change
         assert cogs_lever.cash_impact == expected_change
         assert cogs_lever.label_pt == "Custo dos Produtos/Serviços"
 
-    def test_overhead_lever(self):
+    def test_overhead_lever(self, austa_q1_result, levers_by_id):
         """Test 1% overhead expense reduction impact."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        overhead_lever = next(lv for lv in levers if lv.lever == "overhead")
-        expected_change = pr.operating_expenses * Decimal('0.01')
+        pr = austa_q1_result
+        overhead_lever = levers_by_id["overhead"]
+        expected_change = pr.operating_expenses * _ONE_PCT
         assert overhead_lever.change_amount == expected_change
         assert overhead_lever.profit_impact == expected_change
         assert overhead_lever.cash_impact == expected_change
         assert overhead_lever.label_pt == "Despesas Operacionais"
 
-    def test_ar_days_lever(self):
+    def test_ar_days_lever(self, austa_q1_result, levers_by_id):
         """Test AR days reduction impact on cash flow and financing."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        ar_lever = next(lv for lv in levers if lv.lever == "ar_days")
-        daily_revenue = pr.net_revenue / Decimal('365')
-        assert ar_lever.change_amount == Decimal('1')
-        assert ar_lever.profit_impact == Decimal('0')
+        pr = austa_q1_result
+        ar_lever = levers_by_id["ar_days"]
+        daily_revenue = pr.net_revenue / _DAYS_IN_YEAR
+        assert ar_lever.change_amount == _ONE
+        assert ar_lever.profit_impact == _ZERO
         assert ar_lever.cash_impact == daily_revenue
         assert ar_lever.change_unit == "dias"
 
-    def test_inventory_days_lever(self):
+    def test_inventory_days_lever(self, austa_q1_result, levers_by_id):
         """Test inventory days reduction impact on working capital."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        inv_lever = next(lv for lv in levers if lv.lever == "inventory_days")
-        daily_cogs = pr.cogs / Decimal('365')
-        assert inv_lever.change_amount == Decimal('1')
-        assert inv_lever.profit_impact == Decimal('0')
+        pr = austa_q1_result
+        inv_lever = levers_by_id["inventory_days"]
+        daily_cogs = pr.cogs / _DAYS_IN_YEAR
+        assert inv_lever.change_amount == _ONE
+        assert inv_lever.profit_impact == _ZERO
         assert inv_lever.cash_impact == daily_cogs
         assert inv_lever.label_pt == "Prazo de Estoque"
 
-    def test_ap_days_lever(self):
+    def test_ap_days_lever(self, austa_q1_result, levers_by_id):
         """Test AP days increase impact on cash flow (higher is better)."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        ap_lever = next(lv for lv in levers if lv.lever == "ap_days")
-        daily_cogs = pr.cogs / Decimal('365')
-        assert ap_lever.change_amount == Decimal('1')
-        assert ap_lever.profit_impact == Decimal('0')
+        pr = austa_q1_result
+        ap_lever = levers_by_id["ap_days"]
+        daily_cogs = pr.cogs / _DAYS_IN_YEAR
+        assert ap_lever.change_amount == _ONE
+        assert ap_lever.profit_impact == _ZERO
         assert ap_lever.cash_impact == daily_cogs
         assert ap_lever.label_pt == "Prazo de Pagamento"
 
-    def test_value_impact_with_multiple(self):
+    def test_value_impact_with_multiple(self, austa_q1_levers):
         """Test value impact calculation with earnings multiple."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
-        valuation_multiple = Decimal('6.0')
+        levers = austa_q1_levers
         for lever in levers:
             if lever.category == "Chapter 1":
-                assert lever.value_impact == lever.profit_impact * valuation_multiple
+                assert lever.value_impact == lever.profit_impact * _VALUATION_MULTIPLE
 
-    def test_all_seven_returned(self):
+    def test_all_seven_returned(self, austa_q1_levers):
         """Test all 7 levers are returned in results."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
+        levers = austa_q1_levers
         assert len(levers) == 7
         lever_ids = {lv.lever for lv in levers}
         expected = {"revenue", "cogs", "overhead", "ar_days", "inventory_days", "ap_days", "capex"}
@@ -146,18 +119,17 @@ class TestPowerOfOne:
             ebit_margin_pct=Decimal('20'),
             other_capital_investment=Decimal('500000'),
         )
-        levers = calculate_power_of_one(pr)
-        revenue_lever = next(lv for lv in levers if lv.lever == "revenue")
+        by_id = {lv.lever: lv for lv in calculate_power_of_one(pr)}
+        revenue_lever = by_id["revenue"]
         assert revenue_lever.change_amount == Decimal('100000')
         assert revenue_lever.profit_impact == Decimal('20000')
-        capex_lever = next(lv for lv in levers if lv.lever == "capex")
+        capex_lever = by_id["capex"]
         assert capex_lever.cash_impact == Decimal('5000')
         assert capex_lever.profit_impact == Decimal('5000') * Decimal('0.10')
 
-    def test_blue_consulting_case_study_validation(self):
+    def test_blue_consulting_case_study_validation(self, austa_q1_levers):
         """Test Blue Consulting case study values against Power of One."""
-        pr = _build_period_result_q1()
-        levers = calculate_power_of_one(pr)
+        levers = austa_q1_levers
         # Sorted by abs(cash_impact) desc: cogs(306500) > overhead(196500) > ...
         assert levers[0].lever == "cogs"
         assert levers[1].lever == "overhead"
@@ -0,0 +1,247 @@
+"""Tests for period data validators."""
+import pytest
+from decimal import Decimal
+
+from src.models import MappedData, PeriodResult
+from src.utils.validators import (
+    BALANCE_SHEET_FIELDS,
+    LazyMsg,
+    ValidationIssue,
+    _validate_balance_sheet_fast,
+    _validate_cash_reconciliation_fast,
+    cents_of,
+    validate_all,
+    validate_balance_sheet,
+    validate_cash_reconciliation,
+    validate_period,
+    validate_period_data,
+)
+
+
+def _balanced_pr(**overrides) -> PeriodResult:
+    """PeriodResult whose estimated assets equal liabilities + equity."""
+    fields = {
+        'period': 'Q1_2025',
+        'accounts_receivable': Decimal('18500000.00'),
+        'inventory': Decimal('3200000.00'),
+        'ppe_net': Decimal('45000000.00'),
+        'total_debt': Decimal('37000000.00'),
+        'net_debt': Decimal('35800000.00'),
+        'accounts_payable': Decimal('8900000.00'),
+        'shareholders_equity': Decimal('22000000.00'),
+    }
+    fields.update(overrides)
+    return PeriodResult(**fields)
+
+
+class TestValidateBalanceSheet:
+    """Balance sheet equation checks."""
+
+    def test_balanced_sheet_is_valid(self):
+        is_valid, messages = validate_balance_sheet(_balanced_pr())
+        assert is_valid
+        assert messages == []
+
+    def test_imbalance_within_tolerance(self):
+        # 1% of total assets (67.9M) is 679K; a 500K gap is tolerated
+        pr = _balanced_pr(shareholders_equity=Decimal('22500000.00'))
+        assert validate_balance_sheet(pr) == (True, [])
+
+    def test_imbalance_beyond_tolerance_warns(self):
+        pr = _balanced_pr(shareholders_equity=Decimal('30000000.00'))
+        is_valid, messages = validate_balance_sheet(pr)
+        assert is_valid
+        assert len(messages) == 1
+        assert messages[0] == (
+            "Warning: Balance sheet imbalance of R$8,000,000.00 "
+            "(Assets=67,900,000.00, L+E=75,900,000.00)"
+        )
+
+    def test_empty_sheet_is_invalid(self):
+        is_valid, messages = validate_balance_sheet(PeriodResult(period='Q1'))
+        assert not is_valid
+        assert "Error: Total assets must be positive" in messages
+        assert "Error: Total liabilities + equity must be positive" in messages
+
+    def test_negative_equity_warns(self):
+        pr = _balanced_pr(shareholders_equity=Decimal('-1.00'))
+        _, messages = validate_balance_sheet(pr)
+        assert messages[-1] == "Warning: Negative shareholders equity — possible insolvency"
+
+
+class TestValidateCashReconciliation:
+    """OCF + ICF + financing = net cash flow."""
+
+    def test_no_cash_flows_is_valid(self):
+        assert validate_cash_reconciliation(PeriodResult(period='Q1')) == (True, [])
+
+    def test_reconciled_flows_are_valid(self):
+        pr = PeriodResult(
+            period='Q1',
+            operating_cash_flow=Decimal('1500000.00'),
+            investing_cash_flow=Decimal('-500000.00'),
+            financing_cash_flow=Decimal('-2700000.00'),
+            net_cash_flow=Decimal('-1700000.00'),
+        )
+        assert validate_cash_reconciliation(pr) == (True, [])
+
+    def test_unreconciled_flows_warn(self):
+        pr = PeriodResult(
+            period='Q1',
+            operating_cash_flow=Decimal('1500000.00'),
+            investing_cash_flow=Decimal('-500000.00'),
+            financing_cash_flow=Decimal('0.00'),
+            net_cash_flow=Decimal('-1700000.00'),
+        )
+        is_valid, messages = validate_cash_reconciliation(pr)
+        assert not is_valid
+        assert messages == [
+            "Warning: Cash flow reconciliation difference of R$2,700,000.00 "
+            "(Computed=1,000,000.00, Stored=-1,700,000.00)"
+        ]
+
+    def test_zero_net_cash_flow_skips_check(self):
+        pr = PeriodResult(period='Q1', operating_cash_flow=Decimal('100.00'))
+        assert validate_cash_reconciliation(pr) == (True, [])
+
+
+class TestValidatePeriodData:
+    """MappedData completeness checks."""
+
+    def test_complete_period_is_valid(self):
+        mapped = MappedData(
+            company='AUSTA', period='Q1_2025',
+            gross_revenue=Decimal('40100000.00'), cogs=Decimal('30650000.00'),
+            shareholders_equity=Decimal('35000000.00'),
+        )
+        assert validate_period_data(mapped) == (True, [])
+
+    def test_missing_revenue_is_invalid(self):
+        mapped = MappedData(company='AUSTA', period='Q1_2025')
+        is_valid, messages = validate_period_data(mapped)
+        assert not is_valid
+        assert "Error: Gross revenue must be positive" in messages
+        assert "Warning: Zero shareholders equity" in messages
+
+
+class TestValidatePeriod:
+    """Fused balance sheet and cash reconciliation checks."""
+
+    def test_matches_individual_validators(self):
+        pr = _balanced_pr(
+            shareholders_equity=Decimal('30000000.00'),
+            operating_cash_flow=Decimal('1500000.00'),
+            net_cash_flow=Decimal('-1700000.00'),
+        )
+        bs = validate_balance_sheet(pr)
+        cf = validate_cash_reconciliation(pr)
+        is_valid, messages = validate_period(pr)
+        assert is_valid == (bs[0] and cf[0])
+        assert messages == bs[1] + cf[1]
+
+    def test_balanced_period_is_valid(self):
+        assert validate_period(_balanced_pr()) == (True, [])
+
+
+class TestValidateAll:
+    """Fused single-pass validation."""
+
+    def test_matches_individual_validators(self):
+        pr = _balanced_pr(
+            shareholders_equity=Decimal('30000000.00'),
+            operating_cash_flow=Decimal('1500000.00'),
+            net_cash_flow=Decimal('-1700000.00'),
+        )
+        mapped = MappedData(company='AUSTA', period='Q1_2025')
+        bs = validate_balance_sheet(pr)
+        cf = validate_cash_reconciliation(pr)
+        pd = validate_period_data(mapped)
+        is_valid, messages = validate_all(pr, mapped)
+        assert is_valid == (bs[0] and cf[0] and pd[0])
+        assert messages == bs[1] + cf[1] + pd[1]
+
+    def test_clean_period_is_valid(self):
+        mapped = MappedData(
+            company='AUSTA', period='Q1_2025',
+            gross_revenue=Decimal('40100000.00'),
+            shareholders_equity=Decimal('22000000.00'),
+        )
+        assert validate_all(_balanced_pr(), mapped) == (True, [])
+
+
+class TestOtherCapitalClamp:
+    """Net other-capital liabilities must not reduce estimated assets."""
+
+    def test_negative_other_capital_ignored(self):
+        pr = _balanced_pr(other_capital_net=Decimal('-5000000.00'))
+        assert validate_balance_sheet(pr) == (True, [])
+
+    def test_positive_other_capital_counted(self):
+        pr = _balanced_pr(
+            other_capital_net=Decimal('5000000.00'),
+            shareholders_equity=Decimal('27000000.00'),
+        )
+        assert validate_balance_sheet(pr) == (True, [])
+
+
+class TestLazyMsg:
+    """Deferred formatting of amount-bearing warnings."""
+
+    def test_renders_amounts_from_cents(self):
+        msg = LazyMsg("diff R${:,.2f}", 123456789)
+        assert str(msg) == "diff R$1,234,567.89"
+
+    def test_compares_equal_to_rendered_string(self):
+        msg = LazyMsg("diff R${:,.2f}", 100)
+        assert msg == "diff R$1.00"
+        assert "diff R$1.00" in {msg}
+
+    def test_imbalance_message_is_lazy(self):
+        pr = _balanced_pr(shareholders_equity=Decimal('30000000.00'))
+        _, messages = validate_balance_sheet(pr)
+        assert isinstance(messages[0], LazyMsg)
+        assert str(messages[0]).startswith("Warning: Balance sheet imbalance")
+
+    def test_messages_consumed_as_text_via_str(self):
+        pr = _balanced_pr(
+            shareholders_equity=Decimal('30000000.00'),
+            operating_cash_flow=Decimal('1500000.00'),
+            net_cash_flow=Decimal('-1700000.00'),
+        )
+        _, messages = validate_all(pr, MappedData(company='AUSTA', period='Q1_2025'))
+        texts = [str(m) for m in messages]
+        assert all(type(t) is str for t in texts)
+        assert "Balance sheet imbalance" in "\n".join(texts)
+        assert "R$" in texts[0]
+
+
+class TestValidationIssueBitmask:
+    """Internal fast paths report issues as a bitmask."""
+
+    def test_clean_sheet_has_no_issues(self):
+        cents = cents_of(_balanced_pr(), BALANCE_SHEET_FIELDS)
+        is_valid, issues, _ = _validate_balance_sheet_fast(*cents)
+        assert is_valid
+        assert issues == 0
+
+    def test_empty_sheet_sets_error_bits(self):
+        cents = cents_of(PeriodResult(period='Q1'), BALANCE_SHEET_FIELDS)
+        is_valid, issues, _ = _validate_balance_sheet_fast(*cents)
+        assert not is_valid
+        assert ValidationIssue(issues) == (
+            ValidationIssue.NON_POSITIVE_ASSETS | ValidationIssue.NON_POSITIVE_LIAB_EQUITY
+        )
+
+    def test_warnings_keep_period_valid(self):
+        pr = _balanced_pr(shareholders_equity=Decimal('-1.00'))
+        is_valid, issues, _ = _validate_balance_sheet_fast(*cents_of(pr, BALANCE_SHEET_FIELDS))
+        assert is_valid
+        assert ValidationIssue(issues) == (
+            ValidationIssue.BALANCE_IMBALANCE | ValidationIssue.NEGATIVE_EQUITY
+        )
+
+    def test_unreconciled_cash_flag(self):
+        is_valid, issues, amounts = _validate_cash_reconciliation_fast(100, 0, 0, 500)
+        assert not is_valid
+        assert issues == ValidationIssue.CASH_UNRECONCILED
+        assert amounts == (400, 100, 500)
@@ -0,0 +1,88 @@
+"""Test the vectorized (struct-of-arrays) income statement."""
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from src.calc.income_statement import calculate_income_statement
+from src.calc.vectorized import (
+    MappedDataSoA,
+    calculate_income_statement_batch,
+    units_to_decimal,
+)
+from src.models import MappedData
+
+_AMOUNT_FIELDS = (
+    "net_revenue", "gross_profit", "ebitda", "ebit", "ebt",
+    "irpj_tax", "csll_tax", "net_income",
+)
+_MARGIN_FIELDS = ("gross_margin_pct", "ebitda_margin_pct", "ebit_margin_pct", "net_margin_pct")
+
+
+def _periods() -> list[MappedData]:
+    base = MappedData(
+        company='AUSTA', period='Q1_2025', period_type='quarter', days_in_period=91,
+        gross_revenue=Decimal('40100000'), returns_deductions=Decimal('2500000'),
+        cogs=Decimal('30650000'), operating_expenses=Decimal('19650000'),
+        financial_expenses=Decimal('1200000'), financial_income=Decimal('150000'),
+    )
+    return [
+        base,
+        # Profitable quarter above the IRPJ surtax threshold
+        base.model_copy(update={'period': 'Q2_2025', 'operating_expenses': Decimal('2000000.37')}),
+        # Monthly profit below the threshold: no surtax
+        base.model_copy(update={
+            'period': '2025-03', 'period_type': 'month',
+            'gross_revenue': Decimal('1000.01'), 'returns_deductions': Decimal('0'),
+            'cogs': Decimal('0'), 'operating_expenses': Decimal('0'),
+            'financial_expenses': Decimal('0'), 'financial_income': Decimal('0'),
+        }),
+        base.model_copy(update={
+            'period': 'FY2025', 'period_type': 'year',
+            'gross_revenue': Decimal('160400000'), 'cogs': Decimal('90000000'),
+            'operating_expenses': Decimal('30000000'), 'other_income_expenses': Decimal('-12345.67'),
+        }),
+        MappedData(company='AUSTA', period='EMPTY'),
+    ]
+
+
+@pytest.fixture(scope="module")
+def batch_and_scalar():
+    """Batch results and the per-period scalar results for ``_periods()``."""
+    periods = _periods()
+    batch = calculate_income_statement_batch(MappedDataSoA.from_mapped(periods))
+    return batch, [calculate_income_statement(m) for m in periods]
+
+
+class TestMappedDataSoA:
+    def test_columns_stacked_per_period(self):
+        soa = MappedDataSoA.from_mapped(_periods())
+        assert len(soa) == 5
+        assert soa.gross_revenue.dtype == np.int64
+        assert soa.gross_revenue[0] == 40100000_0000
+        assert soa.period_months.tolist() == [3, 3, 1, 12, 1]
+
+    def test_empty_input(self):
+        soa = MappedDataSoA.from_mapped([])
+        result = calculate_income_statement_batch(soa)
+        assert len(soa) == 0
+        assert result["net_income"].shape == (0,)
+
+
+class TestIncomeStatementBatch:
+    @pytest.mark.parametrize("field", _AMOUNT_FIELDS)
+    def test_amounts_match_scalar_exactly(self, batch_and_scalar, field):
+        batch, scalar = batch_and_scalar
+        for units, pr in zip(batch[field], scalar):
+            assert units_to_decimal(units) == getattr(pr, field)
+
+    @pytest.mark.parametrize("field", _MARGIN_FIELDS)
+    def test_margins_match_scalar(self, batch_and_scalar, field):
+        batch, scalar = batch_and_scalar
+        for value, pr in zip(batch[field], scalar):
+            assert value == pytest.approx(float(getattr(pr, field)), rel=1e-12, abs=1e-12)
+
+    def test_no_tax_on_loss(self, batch_and_scalar):
+        batch, _ = batch_and_scalar
+        assert batch["ebt"][0] < 0
+        assert batch["irpj_tax"][0] == 0
+        assert batch["csll_tax"][0] == 0
@@ -1,7 +1,9 @@
 """Tests for ERP XML parser."""
+import os
 import pytest
 from decimal import Decimal
 from pathlib import Path
+from types import MappingProxyType
 
 from src.ingest.xml_parser import ERPXMLParser
 
@@ -9,6 +11,12 @@ FIXTURE_PATH = "tests/fixtures/sample_balancete.xml"
 FIXTURE_ABS = str(Path(__file__).parent / "fixtures" / "sample_balancete.xml")
 
 
+@pytest.fixture(scope="module")
+def entries_by_code(xml_entries):
+    """Session-parsed balancete entries indexed by account code."""
+    return MappingProxyType({e.code: e for e in xml_entries})
+
+
 class TestERPXMLParser:
     """Unit tests for ERPXMLParser covering balancete parsing and helpers."""
 
@@ -24,7 +32,9 @@ class TestERPXMLParser:
     def test_file_size_limit(self, tmp_path):
         """Verify ValueError for files exceeding 50 MB."""
         big_file = tmp_path / "big.xml"
-        big_file.write_bytes(b"x" * (51 * 1024 * 1024))
+        # Sparse file: st_size is 51 MB without writing 51 MB to disk
+        with open(big_file, "wb") as fh:
+            fh.truncate(51 * 1024 * 1024)
         with pytest.raises(ValueError, match="too large"):
             ERPXMLParser(str(big_file))
 
@@ -33,6 +43,23 @@ class TestERPXMLParser:
         parser = ERPXMLParser(FIXTURE_ABS)
         assert parser.file_path.exists()
 
+    def test_external_entity_not_resolved(self, tmp_path):
+        """External entities (XXE) must not pull local file contents into entries."""
+        secret = tmp_path / "secret.txt"
+        secret.write_text("TOP-SECRET")
+        xxe_file = tmp_path / "xxe.xml"
+        xxe_file.write_text(
+            '<?xml version="1.0"?>'
+            f'<!DOCTYPE balancete [<!ENTITY x SYSTEM "{secret.as_uri()}">]>'
+            "<balancete><empresa><periodo>&x;</periodo></empresa><contas><conta>"
+            "<codigo>1.1.01</codigo><descricao>&x;</descricao><saldo_final>1,00</saldo_final>"
+            "</conta></contas></balancete>"
+        )
+        entries = ERPXMLParser(str(xxe_file)).parse_balancete()
+        assert len(entries) == 1
+        assert "TOP-SECRET" not in entries[0].description
+        assert "TOP-SECRET" not in entries[0].period
+
     # ------------------------------------------------------------------
     # Encoding detection
     # ------------------------------------------------------------------
@@ -58,6 +85,32 @@ class TestERPXMLParser:
         encoding = parser.detect_encoding()
         assert encoding.upper() == "UTF-8"
 
+    def test_detect_format_closes_file(self):
+        """detect_format() stops after the root tag without leaking the file handle."""
+        import gc
+        import warnings
+
+        parser = ERPXMLParser(FIXTURE_ABS)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            assert parser.detect_format() == "balancete"
+            gc.collect()
+        assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+    def test_parse_balancete_sets_declared_encoding(self, tmp_path):
+        """parse_balancete() records the declared encoding and decodes with it."""
+        latin1 = tmp_path / "latin1.xml"
+        latin1.write_bytes(
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            "<balancete><empresa><periodo>01/2025</periodo></empresa><contas><conta>"
+            "<codigo>1.1.04</codigo><descricao>Estoque em trânsito</descricao>"
+            "<saldo_final>10,00</saldo_final></conta></contas></balancete>".encode("latin-1")
+        )
+        parser = ERPXMLParser(str(latin1))
+        entries = parser.parse_balancete()
+        assert parser.encoding == "ISO-8859-1"
+        assert entries[0].description == "Estoque em trânsito"
+
     # ------------------------------------------------------------------
     # Brazilian decimal helper
     # ------------------------------------------------------------------
@@ -121,6 +174,32 @@ class TestERPXMLParser:
         result = parser.parse_balancete()
         assert isinstance(result, list)
 
+    def test_parse_balancete_repeat_call_returns_fresh_copy(self):
+        """A second call reuses the parse but hands back a separate list."""
+        parser = ERPXMLParser(FIXTURE_ABS)
+        first = parser.parse_balancete()
+        first.clear()
+        second = parser.parse_balancete()
+        assert second and second is not first
+        assert second == parser.parse_balancete()
+
+    def test_parse_balancete_reparses_after_file_change(self, tmp_path):
+        """A changed mtime invalidates the cached entries."""
+        path = tmp_path / "balancete.xml"
+        template = (
+            "<balancete><empresa><periodo>01/2025</periodo></empresa><contas><conta>"
+            "<codigo>1.1.01</codigo><descricao>Caixa</descricao><saldo_final>{}</saldo_final>"
+            "</conta></contas></balancete>"
+        )
+        path.write_text(template.format("100,00"))
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        parser = ERPXMLParser(str(path))
+        assert parser.parse_balancete()[0].closing_balance == Decimal("100.00")
+
+        path.write_text(template.format("250,00"))
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert parser.parse_balancete()[0].closing_balance == Decimal("250.00")
+
     # ------------------------------------------------------------------
     # parse_balancete — Decimal precision
     # ------------------------------------------------------------------
@@ -134,37 +213,29 @@ class TestERPXMLParser:
                 f"closing_balance for {entry.code} is {type(entry.closing_balance)}, expected Decimal"
             )
 
-    def test_parse_balancete_cash_closing_balance(self):
+    def test_parse_balancete_cash_closing_balance(self, entries_by_code):
         """Account 1.1.01 (Caixa) closing balance must match XML saldo_final."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
         # 1.1.01 has no subcategorias — emitted as a direct conta entry
-        caixa = next((e for e in entries if e.code == "1.1.01"), None)
+        caixa = entries_by_code.get("1.1.01")
         assert caixa is not None, "Entry 1.1.01 (Caixa) not found"
         assert caixa.closing_balance == Decimal("1200000.00")
 
-    def test_parse_balancete_inventory_closing_balance(self):
+    def test_parse_balancete_inventory_closing_balance(self, entries_by_code):
         """Account 1.1.04 (Estoque) closing balance must match XML saldo_final."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
-        estoque = next((e for e in entries if e.code == "1.1.04"), None)
+        estoque = entries_by_code.get("1.1.04")
         assert estoque is not None, "Entry 1.1.04 (Estoque) not found"
         assert estoque.closing_balance == Decimal("3200000.00")
 
-    def test_parse_balancete_revenue_saldo_balance(self):
+    def test_parse_balancete_revenue_saldo_balance(self, entries_by_code):
         """Account 3.1 uses <saldo> instead of <saldo_final>; value must be correct."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
-        receita = next((e for e in entries if e.code == "3.1"), None)
+        receita = entries_by_code.get("3.1")
         assert receita is not None, "Entry 3.1 (Receita de Vendas) not found"
         assert receita.closing_balance == Decimal("40100000.00")
 
-    def test_parse_balancete_negative_balance(self):
+    def test_parse_balancete_negative_balance(self, entries_by_code):
         """Negative balances (expense accounts) must be preserved as Decimal."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
         # Account 4.3 has saldo=-1200000.00
-        desp_fin = next((e for e in entries if e.code == "4.3"), None)
+        desp_fin = entries_by_code.get("4.3")
         assert desp_fin is not None, "Entry 4.3 (Despesas Financeiras) not found"
         assert desp_fin.closing_balance == Decimal("-1200000.00")
 
@@ -199,19 +270,15 @@ class TestERPXMLParser:
         for expected in ("4.2.01", "4.2.02", "4.2.03", "4.2.04", "4.2.05"):
             assert expected in codes, f"Subconta {expected} not found in entries"
 
-    def test_parse_balancete_subconta_saldo_value(self):
+    def test_parse_balancete_subconta_saldo_value(self, entries_by_code):
         """Subconta 1.1.03.01 closing balance must match XML <saldo> value."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
-        sub = next((e for e in entries if e.code == "1.1.03.01"), None)
+        sub = entries_by_code.get("1.1.03.01")
         assert sub is not None, "Subconta 1.1.03.01 not found"
         assert sub.closing_balance == Decimal("8950000.00")
 
-    def test_parse_balancete_subconta_negative_saldo(self):
+    def test_parse_balancete_subconta_negative_saldo(self, entries_by_code):
         """Subconta 4.2.01 closing balance must be the correct negative Decimal."""
-        parser = ERPXMLParser(FIXTURE_ABS)
-        entries = parser.parse_balancete()
-        sub = next((e for e in entries if e.code == "4.2.01"), None)
+        sub = entries_by_code.get("4.2.01")
         assert sub is not None, "Subconta 4.2.01 not found"
         assert sub.closing_balance == Decimal("-6500000.00")
 
@@ -301,3 +368,29 @@ class TestERPXMLParser:
         parser = ERPXMLParser(FIXTURE_ABS)
         entries = parser.parse_balancete()
         assert len(entries) == 20
+
+    # ------------------------------------------------------------------
+    # parse_many — multi-file ingest
+    # ------------------------------------------------------------------
+
+    def test_parse_many_matches_single_file_parse(self, tmp_path, xml_entries):
+        """Small batches are parsed in-process, keyed by path in input order."""
+        second = tmp_path / "q2.xml"
+        second.write_bytes(Path(FIXTURE_ABS).read_bytes())
+        result = ERPXMLParser.parse_many([FIXTURE_ABS, second])
+        assert list(result) == [FIXTURE_ABS, str(second)]
+        assert all(entries == xml_entries for entries in result.values())
+
+    def test_parse_many_process_pool(self, tmp_path, xml_entries, monkeypatch):
+        """The worker-process path returns the same entries as the in-process one."""
+        monkeypatch.setattr(ERPXMLParser, "PARALLEL_MIN_BYTES", 0)
+        second = tmp_path / "q2.xml"
+        second.write_bytes(Path(FIXTURE_ABS).read_bytes())
+        result = ERPXMLParser.parse_many([FIXTURE_ABS, second], max_workers=2)
+        assert list(result) == [FIXTURE_ABS, str(second)]
+        assert all(entries == xml_entries for entries in result.values())
+
+    def test_parse_many_checks_every_path_up_front(self, tmp_path):
+        """A missing file fails before any parsing starts."""
+        with pytest.raises(FileNotFoundError):
+            ERPXMLParser.parse_many([FIXTURE_ABS, tmp_path / "missing.xml"])